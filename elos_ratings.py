@@ -163,6 +163,39 @@ class ElosRatings:
         
         return p 
 
+    def predict_games(self, team_a_idx: np.ndarray, team_b_idx: np.ndarray) -> np.ndarray:
+        """
+        Vectorized predict_game for many matchups at once.
+        
+        Args:
+            team_a_idx: Indices into self.teams of each matchup's team_a
+            team_b_idx: Indices into self.teams of each matchup's team_b
+            
+        Returns:
+            Array of team_a win probabilities
+        """
+        team_to_idx = {team: i for i, team in enumerate(self.teams)}
+        n_teams = len(self.teams)
+        elos = np.array([self.ratings[team] for team in self.teams], dtype=np.float64)
+        
+        # Head-to-head win counts, wins[i, j] = wins of team i over team j
+        wins = np.zeros((n_teams, n_teams))
+        for (team_i, team_j), w in self.binary_ratings.items():
+            wins[team_to_idx[team_i], team_to_idx[team_j]] = w
+        
+        p_elos = 1 / (1 + 10**((elos[team_b_idx] - elos[team_a_idx])/400))
+        
+        wins_ab = wins[team_a_idx, team_b_idx]
+        total = wins_ab + wins[team_b_idx, team_a_idx]
+        p_binary = np.divide(wins_ab, total, out=np.full(total.shape, 0.5), where=total > 0)
+        
+        # Every meeting adds one win to the pair, so the win counts double as
+        # games played (a team's games against itself land in one cell)
+        games_played = np.where(team_a_idx == team_b_idx, wins_ab, total)
+        binary_weight = np.minimum(games_played / 5, 0.5)
+        
+        return (1 - binary_weight) * p_elos + binary_weight * p_binary
+
     def calculate_transition_matrix(self) -> np.ndarray:
         """
         Calculate the Markov chain transition matrix Q.
@@ -319,20 +352,25 @@ class ElosRatings:
             'convergence_rate': convergence_rate
         }
     
-    def calculate_rating_confidence(self) -> Dict[str, Dict[str, float]]:
+    def calculate_rating_confidence(self,
+                                    ratings: Optional[Dict[str, float]] = None) -> Dict[str, Dict[str, float]]:
         """
         Calculate confidence intervals for ratings based on:
         1. Number of games played
         2. Consistency of performance
         3. Quality of opponents
         
+        Args:
+            ratings: Precomputed ratings (calculated if not given)
+        
         Returns:
             Dict mapping team to:
             - rating: Point estimate
             - std_error: Standard error
             - conf_interval: (lower, upper) 95% confidence bounds
         """
-        ratings = self.calculate_ratings()
+        if ratings is None:
+            ratings = self.calculate_ratings()
         n_teams = len(self.teams)
         
         confidence = {}
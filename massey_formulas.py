@@ -5,8 +5,25 @@ Implements formulas as described in the documentation.
 
 import numpy as np
 from scipy.stats import norm
-from typing import Tuple, Dict, List, Optional
+from typing import Tuple, Dict, List, Optional, Union
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+SECONDS_PER_DAY = 86400
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+
+def to_epoch_seconds(value: Union[datetime, float]) -> int:
+    """
+    Convert a datetime or float timestamp to integer seconds since the epoch.
+    Naive datetimes are converted with calendar arithmetic (no local-time
+    or DST shifts) so day differences match datetime subtraction.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return (value - _EPOCH) // _ONE_SECOND
+        return int(np.floor(value.timestamp()))
+    return int(np.floor(value))
 
 @dataclass
 class GameResult:
@@ -2,23 +2,63 @@
 Preseason ratings and time-based adjustments for the Massey Rating system.
 """
 
+import math
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
+from massey_formulas import SECONDS_PER_DAY, to_epoch_seconds
+
+# Shared generator for rating noise; PCG64 is faster than the legacy global RNG
+_RNG = np.random.default_rng()
 
 class PreseasonRatings:
     def __init__(self, 
-                 historical_ratings: Dict[str, Dict[str, float]],
+                 historical_ratings: Union[Dict[int, Dict[str, float]],
+                                           Tuple[List[int], List[str], np.ndarray]],
                  decay_factor: float = 0.5):
         """
         Initialize with historical ratings.
         
         Args:
-            historical_ratings: Dict mapping years to team ratings
+            historical_ratings: Dict mapping years to team ratings, or a
+                (years, teams, matrix) tuple where matrix[i, j] is the rating
+                of teams[j] in years[i] (NaN where the team has no rating)
             decay_factor: Weight decay for older seasons
         """
-        self.historical = historical_ratings
+        if isinstance(historical_ratings, dict):
+            years = sorted(historical_ratings)
+            teams = sorted({team for season in historical_ratings.values() for team in season})
+            team_col = {team: j for j, team in enumerate(teams)}
+            matrix = np.full((len(years), len(teams)), np.nan, dtype=np.float64)
+            for i, year in enumerate(years):
+                for team, rating in historical_ratings[year].items():
+                    matrix[i, team_col[team]] = rating
+        else:
+            years, teams, matrix = historical_ratings
+            matrix = np.asarray(matrix, dtype=np.float64)
+        
+        # Ratings stored as a years x teams matrix with small lookup dicts;
+        # a trailing all-NaN column serves teams with no history
+        self._R = np.hstack([matrix.reshape(len(years), len(teams)),
+                             np.full((len(years), 1), np.nan)])
+        self._years = list(years)
+        self._teams = list(teams)
+        self._year_row = {year: i for i, year in enumerate(self._years)}
+        self._team_col = {team: j for j, team in enumerate(self._teams)}
+        self._historical: Optional[Dict[int, Dict[str, float]]] = None
         self.decay = decay_factor
+    
+    @property
+    def historical(self) -> Dict[int, Dict[str, float]]:
+        """Historical ratings as a dict of dicts (built on first access)."""
+        if self._historical is None:
+            self._historical = {
+                year: {team: float(rating)
+                       for team, rating in zip(self._teams, self._R[i, :-1])
+                       if not np.isnan(rating)}
+                for i, year in enumerate(self._years)
+            }
+        return self._historical
         
     def calculate_preseason_ratings(self, 
                                   teams: List[str],
@@ -35,29 +75,25 @@ class PreseasonRatings:
         Returns:
             Dict mapping teams to preseason ratings
         """
-        preseason = {}
-        
-        for team in teams:
-            ratings = []
-            weights = []
-            
-            # Collect historical ratings with exponential decay
-            for year in range(current_year - lookback_years, current_year):
-                if year in self.historical and team in self.historical[year]:
-                    rating = self.historical[year][team]
-                    weight = self.decay ** (current_year - year)
-                    
-                    ratings.append(rating)
-                    weights.append(weight)
-            
-            if ratings:
-                # Weighted average of historical ratings
-                preseason[team] = np.average(ratings, weights=weights)
-            else:
-                # No history - use average rating
-                preseason[team] = 0.0
-        
-        return preseason
+        # Historical seasons in the lookback window with exponential decay
+        years = [year for year in range(current_year - lookback_years, current_year)
+                 if year in self._year_row]
+        rows = np.array([self._year_row[year] for year in years], dtype=np.intp)
+        weights = self.decay ** (current_year - np.array(years, dtype=np.float64))
+        
+        # Gather the (years x teams) block; unknown teams hit the NaN column
+        cols = np.array([self._team_col.get(team, -1) for team in teams], dtype=np.intp)
+        block = self._R[np.ix_(rows, cols)]
+        
+        # Weighted average of historical ratings; no history -> average rating
+        has_rating = ~np.isnan(block)
+        w = weights[:, None] * has_rating
+        total_weight = w.sum(axis=0)
+        weighted_sum = (w * np.where(has_rating, block, 0.0)).sum(axis=0)
+        preseason = np.divide(weighted_sum, total_weight,
+                              out=np.zeros(len(teams)), where=total_weight > 0)
+        
+        return dict(zip(teams, preseason.tolist()))
     
     def calculate_rating_weight(self,
                               games_played: int,
@@ -77,13 +113,33 @@ class PreseasonRatings:
             return 0.0
         
         # Exponential decay of preseason weight
-        return np.exp(-3 * games_played / max_games)
+        return math.exp(-3.0 * games_played / max_games)
+    
+    @staticmethod
+    def calculate_rating_weights(games_played: np.ndarray,
+                                 max_games: int = 12) -> np.ndarray:
+        """
+        Vectorized calculate_rating_weight for all teams at once.
+        
+        Args:
+            games_played: Array of games played per team
+            max_games: Games needed for preseason to be fully phased out
+            
+        Returns:
+            Array of weights between 0 and 1
+        """
+        games_played = np.asarray(games_played, dtype=np.float64)
+        weights = np.exp(-3.0 * games_played / max_games)
+        weights[games_played >= max_games] = 0.0
+        return weights
 
 class TimeAdjustments:
     def __init__(self,
                  current_date: datetime,
                  season_start: datetime,
-                 season_end: datetime):
+                 season_end: datetime,
+                 seed: Optional[int] = None,
+                 rng: Optional[np.random.Generator] = None):
         """
         Initialize with season dates.
         
@@ -91,10 +147,19 @@ class TimeAdjustments:
             current_date: Current date
             season_start: Season start date
             season_end: Season end date
+            seed: Optional seed for reproducible rating noise
+            rng: Optional generator to draw rating noise from (overrides seed)
         """
         self.current_date = current_date
         self.season_start = season_start
         self.season_end = season_end
+        # Integer epoch seconds so day arithmetic avoids timedelta objects
+        self._cur_ts = to_epoch_seconds(current_date)
+        self._start_ts = to_epoch_seconds(season_start)
+        self._end_ts = to_epoch_seconds(season_end)
+        if rng is None:
+            rng = _RNG if seed is None else np.random.default_rng(seed)
+        self.rng = rng
         
     def calculate_game_weight(self,
                             game_date: datetime,
@@ -110,14 +175,15 @@ class TimeAdjustments:
         Returns:
             Weight between 0 and 1
         """
-        if game_date > self.current_date:
+        game_ts = to_epoch_seconds(game_date)
+        if game_ts > self._cur_ts:
             return 0.0
             
-        days_old = (self.current_date - game_date).days
-        season_length = (self.season_end - self.season_start).days
+        days_old = (self._cur_ts - game_ts) // SECONDS_PER_DAY
+        season_length = (self._end_ts - self._start_ts) // SECONDS_PER_DAY
         
         # Exponential decay based on age of game
-        return np.exp(-recency_factor * days_old / season_length)
+        return math.exp(-recency_factor * days_old / season_length)
     
     def calculate_season_phase_adjustments(self) -> Dict[str, float]:
         """
@@ -129,8 +195,8 @@ class TimeAdjustments:
             - home_advantage: Home advantage varies through season
             - upset_factor: Upsets more likely at certain times
         """
-        season_progress = (self.current_date - self.season_start).days
-        total_days = (self.season_end - self.season_start).days
+        season_progress = (self._cur_ts - self._start_ts) // SECONDS_PER_DAY
+        total_days = (self._end_ts - self._start_ts) // SECONDS_PER_DAY
         phase = season_progress / total_days
         
         adjustments = {
@@ -161,16 +227,15 @@ class TimeAdjustments:
         """
         adjustments = self.calculate_season_phase_adjustments()
         
-        # Apply variance multiplier based on games played
-        adjusted = {}
-        for team, rating in base_ratings.items():
-            n_games = games_played.get(team, 0)
-            
-            # More variance for teams with fewer games
-            team_variance = adjustments['variance_multiplier'] * np.exp(-0.1 * n_games)
-            
-            # Add random noise based on variance
-            noise = np.random.normal(0, 20 * team_variance)
-            adjusted[team] = rating + noise
+        # Stack ratings and games played into aligned arrays
+        teams = list(base_ratings)
+        ratings = np.fromiter(base_ratings.values(), dtype=np.float64, count=len(teams))
+        n_games = np.array([games_played.get(team, 0) for team in teams], dtype=np.float64)
+        
+        # More variance for teams with fewer games
+        team_variance = adjustments['variance_multiplier'] * np.exp(-0.1 * n_games)
+        
+        # Add random noise based on variance, drawn for all teams at once
+        noise = self.rng.standard_normal(ratings.size) * (20.0 * team_variance)
         
-        return adjusted 
\ No newline at end of file
+        return dict(zip(teams, (ratings + noise).tolist())) 
\ No newline at end of file
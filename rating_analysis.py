@@ -3,13 +3,23 @@ Comprehensive analysis module for Massey Ratings system.
 Combines formulas, statistics, and decision-making tools.
 """
 
+import functools
 import numpy as np
 from scipy import stats
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from dataclasses import dataclass
-from massey_formulas import MasseyFormulas, GameResult
+from contextlib import contextmanager
+from massey_formulas import MasseyFormulas, GameResult, to_epoch_seconds
+from rating_kernels import NUMBA_AVAILABLE, team_stats_kernel
 from datetime import datetime
 
+# Number of most recent games used for the performance trend
+RECENT_GAMES = 5
+
+# Precomputed trend weights (and their sums) indexed by number of recent games
+_TREND_WEIGHTS = [np.exp(np.linspace(-1, 0, k)) for k in range(RECENT_GAMES + 1)]
+_TREND_WEIGHT_SUMS = [w.sum() for w in _TREND_WEIGHTS]
+
 @dataclass
 class RatingAnalysis:
     """Container for comprehensive rating analysis."""
@@ -34,16 +44,169 @@ class MatchupAnalysis:
     confidence: float
     historical_results: List[Dict[str, Any]]
 
+_EMPTY_IDX = np.empty(0, dtype=np.intp)
+
+def _pair_key(i: int, j: int) -> Tuple[int, int]:
+    """Canonical (order-independent) key for a pair of team indices."""
+    return (i, j) if i <= j else (j, i)
+
+@dataclass
+class GameArray:
+    """
+    Structure-of-arrays view of a list of GameResult objects.
+    
+    Teams are stored as integer indices into `teams`. Per-team (date-sorted)
+    and head-to-head game indices are precomputed for O(1) lookup.
+    """
+    teams: List[str]
+    team_to_idx: Dict[str, int]
+    team_a_idx: np.ndarray  # int32
+    team_b_idx: np.ndarray  # int32
+    score_a: np.ndarray
+    score_b: np.ndarray
+    date: np.ndarray  # int64 seconds since the epoch
+    team_games: List[np.ndarray]  # team index -> its game indices sorted by date
+    pair_games: Dict[Tuple[int, int], np.ndarray]  # sorted index pair -> h2h game indices
+    
+    @classmethod
+    def from_games(cls,
+                   games: List[GameResult],
+                   team_to_idx: Optional[Dict[str, int]] = None) -> 'GameArray':
+        """
+        Build the arrays and indices from a list of games.
+        
+        Args:
+            games: List of GameResult objects
+            team_to_idx: Optional existing team index mapping; teams not in
+                it are appended in order of first appearance
+        """
+        team_to_idx = dict(team_to_idx or {})
+        for game in games:
+            for team in (game.team_a, game.team_b):
+                if team not in team_to_idx:
+                    team_to_idx[team] = len(team_to_idx)
+        teams = [''] * len(team_to_idx)
+        for team, i in team_to_idx.items():
+            teams[i] = team
+        
+        team_a_idx = np.array([team_to_idx[g.team_a] for g in games], dtype=np.int32)
+        team_b_idx = np.array([team_to_idx[g.team_b] for g in games], dtype=np.int32)
+        dates = np.fromiter((to_epoch_seconds(g.date) for g in games),
+                            dtype=np.int64, count=len(games))
+        
+        team_games: List[List[int]] = [[] for _ in teams]
+        pair_games: Dict[Tuple[int, int], List[int]] = {}
+        for k, (i, j) in enumerate(zip(team_a_idx.tolist(), team_b_idx.tolist())):
+            team_games[i].append(k)
+            if j != i:
+                team_games[j].append(k)
+            pair_games.setdefault(_pair_key(i, j), []).append(k)
+        
+        sorted_team_games = []
+        for idx in team_games:
+            idx = np.array(idx, dtype=np.intp)
+            sorted_team_games.append(idx[np.argsort(dates[idx], kind='stable')])
+        
+        return cls(
+            teams=teams,
+            team_to_idx=team_to_idx,
+            team_a_idx=team_a_idx,
+            team_b_idx=team_b_idx,
+            score_a=np.array([g.score_a for g in games]),
+            score_b=np.array([g.score_b for g in games]),
+            date=dates,
+            team_games=sorted_team_games,
+            pair_games={p: np.array(idx, dtype=np.intp) for p, idx in pair_games.items()}
+        )
+    
+    def __len__(self) -> int:
+        return len(self.team_a_idx)
+    
+    def games_for(self, team: str) -> np.ndarray:
+        """Indices of a team's games, sorted by date."""
+        i = self.team_to_idx.get(team)
+        return _EMPTY_IDX if i is None else self.team_games[i]
+    
+    def head_to_head(self, team_a: str, team_b: str) -> np.ndarray:
+        """Indices of games between two teams, in original order."""
+        i = self.team_to_idx.get(team_a)
+        j = self.team_to_idx.get(team_b)
+        if i is None or j is None:
+            return _EMPTY_IDX
+        return self.pair_games.get(_pair_key(i, j), _EMPTY_IDX)
+    
+    def ratings_array(self, ratings: Dict[str, float]) -> np.ndarray:
+        """Ratings aligned with team indices (NaN for unrated teams)."""
+        return np.array([ratings.get(team, np.nan) for team in self.teams], dtype=np.float64)
+
+@dataclass
+class _TeamStats:
+    """Per-team game statistics computed together by RatingAnalyzer._team_stats."""
+    offense: float
+    defense: float
+    variance: float
+    std_error: float
+    trend: float
+    schedule_strength: float
+    expected_wins: float
+
 class RatingAnalyzer:
     def __init__(self, formulas: MasseyFormulas):
         """Initialize with MasseyFormulas instance."""
         self.formulas = formulas
+        # Bind win-probability functions once; the scalar one is memoized since
+        # the same rating pairs recur across team and matchup analyses
+        self._win_prob = functools.lru_cache(maxsize=4096)(formulas.calculate_win_probability)
+        self._win_prob_vec = getattr(formulas, 'calculate_win_probability_vec',
+                                     formulas.calculate_win_probability)
+        self._games: Optional[List[GameResult]] = None
+        self._games_len = 0
+        self._game_array: Optional[GameArray] = None
+        self._now_ts: Optional[float] = None
+        # Rating gap beyond which get_decision_factors skips the full analysis
+        self.fast_path_threshold = 500.0
+    
+    @contextmanager
+    def _freeze_now(self, now_ts: Optional[float] = None) -> Iterator[float]:
+        """Pin "now" to a single timestamp for the duration of a request."""
+        previous = self._now_ts
+        if previous is None:
+            self._now_ts = datetime.now().timestamp() if now_ts is None else now_ts
+        try:
+            yield self._now_ts
+        finally:
+            self._now_ts = previous
+    
+    def _current_ts(self) -> float:
+        """Frozen request timestamp if one is active, else the wall clock."""
+        return self._now_ts if self._now_ts is not None else datetime.now().timestamp()
+    
+    def _get_game_array(self, games: List[GameResult]) -> GameArray:
+        """
+        Adapt a list of games to a GameArray, reusing it for the same list.
+        
+        The cached array is reused while `games` is the very list it was
+        built from and has the same length, so appending games rebuilds it.
+        Games replaced or edited in place are not detected; call
+        invalidate_games() after doing so.
+        """
+        if games is not self._games or len(games) != self._games_len:
+            self._game_array = GameArray.from_games(games)
+            self._games = games
+            self._games_len = len(games)
+        return self._game_array
+    
+    def invalidate_games(self) -> None:
+        """Rebuild the game index on next use, after games were edited in place."""
+        self._games = None
+        self._game_array = None
         
     def analyze_team(self, 
                     team: str,
                     ratings: Dict[str, float],
                     games: List[GameResult],
-                    current_date: float) -> RatingAnalysis:
+                    current_date: float,
+                    avg_rating: Optional[float] = None) -> RatingAnalysis:
         """
         Perform comprehensive analysis of a team's performance.
         
@@ -52,52 +215,58 @@ class RatingAnalyzer:
             ratings: Current ratings for all teams
             games: List of all games played
             current_date: Current timestamp
+            avg_rating: Average of all ratings (computed if not given)
         
         Returns:
             RatingAnalysis object with comprehensive metrics
         """
-        # Get team's games
-        team_games = [g for g in games 
-                     if team in [g.team_a, g.team_b]]
+        # Get team's games (already sorted by date)
+        game_array = self._get_game_array(games)
+        idx = game_array.games_for(team)
         
-        if not team_games:
+        if len(idx) == 0:
             return self._empty_analysis()
         
         # Calculate basic metrics
         rating = ratings[team]
         
-        # Calculate recent performance trend
-        recent_games = sorted(team_games, key=lambda g: g.date)[-5:]
-        trend = self._calculate_trend(team, recent_games)
+        # Offense, defense, variance, trend and schedule in a single pass
+        team_stats = self._team_stats(
+            game_array.team_to_idx[team], rating, game_array, idx,
+            game_array.ratings_array(ratings)
+        )
         
         # Calculate win probability against average team
-        avg_rating = np.mean(list(ratings.values()))
-        win_prob = self.formulas.calculate_win_probability(rating, avg_rating)
-        
-        # Calculate confidence interval
-        ci = self._calculate_confidence_interval(team, team_games, rating)
+        if avg_rating is None:
+            avg_rating = self._average_rating(ratings)
+        win_prob = self._win_prob(rating, avg_rating)
         
-        # Calculate variance in performance
-        variance = self._calculate_performance_variance(team, team_games)
+        # 95% confidence interval
+        ci = (
+            rating - 1.96 * team_stats.std_error,
+            rating + 1.96 * team_stats.std_error
+        )
         
         return RatingAnalysis(
             rating=rating,
-            power=rating + trend,  # Adjust for recent performance
-            offense=self._calculate_offense(team, team_games),
-            defense=self._calculate_defense(team, team_games),
-            schedule_strength=self._calculate_schedule_strength(team, team_games, ratings),
-            expected_wins=self._calculate_expected_wins(team, ratings, games),
+            power=rating + team_stats.trend,  # Adjust for recent performance
+            offense=team_stats.offense,
+            defense=team_stats.defense,
+            schedule_strength=team_stats.schedule_strength,
+            expected_wins=team_stats.expected_wins,
             win_probability=win_prob,
             confidence_interval=ci,
-            variance=variance,
-            trend=trend
+            variance=team_stats.variance,
+            trend=team_stats.trend
         )
     
     def analyze_matchup(self,
                        team_a: str,
                        team_b: str,
                        ratings: Dict[str, float],
-                       games: List[GameResult]) -> MatchupAnalysis:
+                       games: List[GameResult],
+                       current_date: Optional[float] = None,
+                       avg_rating: Optional[float] = None) -> MatchupAnalysis:
         """
         Analyze a specific matchup between two teams.
         
@@ -105,18 +274,20 @@ class RatingAnalyzer:
             team_a, team_b: Teams to analyze
             ratings: Current ratings
             games: All games played
+            current_date: Current timestamp (defaults to now)
+            avg_rating: Average of all ratings (computed if not given)
         
         Returns:
             MatchupAnalysis object with matchup-specific metrics
         """
         # Get head-to-head games
-        h2h_games = [g for g in games 
-                    if {g.team_a, g.team_b} == {team_a, team_b}]
+        game_array = self._get_game_array(games)
+        h2h_idx = game_array.head_to_head(team_a, team_b)
         
         # Calculate win probability
         r_a = ratings[team_a]
         r_b = ratings[team_b]
-        win_prob = self.formulas.calculate_win_probability(r_a, r_b)
+        win_prob = self._win_prob(r_a, r_b)
         
         # Calculate expected margin
         exp_margin = (r_a - r_b) * 3.5  # Typical scaling factor
@@ -124,21 +295,23 @@ class RatingAnalyzer:
         # Calculate upset probability
         favorite = team_a if r_a > r_b else team_b
         upset_prob = self._calculate_upset_probability(
-            favorite, h2h_games, ratings
+            favorite, game_array, h2h_idx, ratings
         )
         
         # Identify key factors
+        if current_date is None:
+            current_date = self._current_ts()
         key_factors = self._identify_key_factors(
-            team_a, team_b, ratings, games
+            team_a, team_b, ratings, games, current_date, avg_rating
         )
         
         # Calculate confidence in prediction
         confidence = self._calculate_prediction_confidence(
-            team_a, team_b, h2h_games, ratings
+            team_a, team_b, len(h2h_idx), ratings
         )
         
         # Get historical results
-        historical = self._get_historical_results(h2h_games)
+        historical = self._get_historical_results(games, game_array, h2h_idx)
         
         return MatchupAnalysis(
             win_probability=win_prob,
@@ -163,11 +336,24 @@ class RatingAnalyzer:
         - Risk factors
         - Historical patterns
         - Situational factors
+        
+        Lopsided matchups (rating gap above fast_path_threshold) and teams
+        with at most one game each skip the full team/matchup analysis.
         """
-        # Get analyses
-        team_a_analysis = self.analyze_team(team_a, ratings, games, datetime.now().timestamp())
-        team_b_analysis = self.analyze_team(team_b, ratings, games, datetime.now().timestamp())
-        matchup = self.analyze_matchup(team_a, team_b, ratings, games)
+        game_array = self._get_game_array(games)
+        r_a = ratings[team_a]
+        r_b = ratings[team_b]
+        if (abs(r_a - r_b) > self.fast_path_threshold or
+                (len(game_array.games_for(team_a)) <= 1 and
+                 len(game_array.games_for(team_b)) <= 1)):
+            return self._fast_decision_factors(team_a, team_b, ratings, games, game_array)
+        
+        # Get analyses against a single frozen "now" and average rating
+        avg_rating = self._average_rating(ratings)
+        with self._freeze_now() as now_ts:
+            team_a_analysis = self.analyze_team(team_a, ratings, games, now_ts, avg_rating)
+            team_b_analysis = self.analyze_team(team_b, ratings, games, now_ts, avg_rating)
+            matchup = self.analyze_matchup(team_a, team_b, ratings, games, now_ts, avg_rating)
         
         # Identify advantages
         advantages = []
@@ -195,163 +381,115 @@ class RatingAnalyzer:
             'historical': matchup.historical_results
         }
     
-    def _calculate_trend(self, team: str, recent_games: List[GameResult]) -> float:
-        """Calculate recent performance trend."""
-        if not recent_games:
-            return 0.0
-            
-        performances = []
-        for game in recent_games:
-            if game.team_a == team:
-                perf = game.score_a - game.score_b
-            else:
-                perf = game.score_b - game.score_a
-            performances.append(perf)
-            
-        # Calculate weighted average with more recent games weighted higher
-        weights = np.exp(np.linspace(-1, 0, len(performances)))
-        return np.average(performances, weights=weights)
-    
-    def _calculate_confidence_interval(self,
-                                    team: str,
-                                    games: List[GameResult],
-                                    rating: float) -> Tuple[float, float]:
-        """Calculate 95% confidence interval for rating."""
-        if not games:
-            return (float('-inf'), float('inf'))
-            
-        # Calculate standard error
-        performances = []
-        for game in games:
-            if game.team_a == team:
-                perf = game.score_a - game.score_b
-            else:
-                perf = game.score_b - game.score_a
-            performances.append(perf)
-            
-        std_error = np.std(performances) / np.sqrt(len(games))
-        
-        # 95% confidence interval
-        return (
-            rating - 1.96 * std_error,
-            rating + 1.96 * std_error
-        )
-    
-    def _calculate_performance_variance(self,
-                                     team: str,
-                                     games: List[GameResult]) -> float:
-        """Calculate variance in team's performance."""
-        if not games:
-            return float('inf')
-            
-        performances = []
-        for game in games:
-            if game.team_a == team:
-                perf = game.score_a - game.score_b
-            else:
-                perf = game.score_b - game.score_a
-            performances.append(perf)
-            
-        return np.var(performances)
-    
-    def _calculate_offense(self,
-                         team: str,
-                         games: List[GameResult]) -> float:
-        """Calculate offensive rating."""
-        if not games:
-            return 0.0
-            
-        scores = []
-        for game in games:
-            if game.team_a == team:
-                scores.append(game.score_a)
-            else:
-                scores.append(game.score_b)
-                
-        return np.mean(scores)
-    
-    def _calculate_defense(self,
-                         team: str,
-                         games: List[GameResult]) -> float:
-        """Calculate defensive rating."""
-        if not games:
-            return 0.0
-            
-        scores = []
-        for game in games:
-            if game.team_a == team:
-                scores.append(game.score_b)
-            else:
-                scores.append(game.score_a)
-                
-        return -np.mean(scores)  # Negative so higher is better
+    def _fast_decision_factors(self,
+                               team_a: str,
+                               team_b: str,
+                               ratings: Dict[str, float],
+                               games: List[GameResult],
+                               game_array: GameArray) -> Dict[str, Any]:
+        """Decision factors from ratings and head-to-head history alone."""
+        r_a = ratings[team_a]
+        r_b = ratings[team_b]
+        h2h_idx = game_array.head_to_head(team_a, team_b)
+        return {
+            'prediction': {
+                'win_probability': self._win_prob(r_a, r_b),
+                'expected_margin': (r_a - r_b) * 3.5,
+                'confidence': self._calculate_prediction_confidence(
+                    team_a, team_b, len(h2h_idx), ratings
+                )
+            },
+            'advantages': [],
+            'risks': [],
+            'key_factors': [],
+            'historical': self._get_historical_results(games, game_array, h2h_idx)
+        }
     
-    def _calculate_schedule_strength(self,
-                                   team: str,
-                                   games: List[GameResult],
-                                   ratings: Dict[str, float]) -> float:
-        """Calculate strength of schedule."""
-        if not games:
-            return 0.0
-            
-        opp_ratings = []
-        for game in games:
-            opp = game.team_b if game.team_a == team else game.team_a
-            opp_ratings.append(ratings[opp])
-            
-        return np.mean(opp_ratings)
+    @staticmethod
+    def _average_rating(ratings: Dict[str, float]) -> float:
+        """Mean of all ratings without materializing an intermediate list."""
+        return float(np.fromiter(ratings.values(), dtype=np.float64, count=len(ratings)).mean())
     
-    def _calculate_expected_wins(self,
-                               team: str,
-                               ratings: Dict[str, float],
-                               games: List[GameResult]) -> float:
-        """Calculate expected wins for remaining schedule."""
-        exp_wins = 0.0
-        team_rating = ratings[team]
+    def _team_stats(self,
+                    team_idx: int,
+                    rating: float,
+                    game_array: GameArray,
+                    idx: np.ndarray,
+                    ratings_arr: np.ndarray) -> _TeamStats:
+        """Compute all per-team game statistics in one pass over its games."""
+        if NUMBA_AVAILABLE:
+            offense, defense, variance, std_error, trend, sos, opp_ratings = team_stats_kernel(
+                game_array.team_a_idx, game_array.team_b_idx,
+                game_array.score_a, game_array.score_b,
+                idx, team_idx, ratings_arr,
+                _TREND_WEIGHTS[min(len(idx), RECENT_GAMES)]
+            )
+            return _TeamStats(
+                offense=offense,
+                defense=defense,
+                variance=variance,
+                std_error=std_error,
+                trend=trend,
+                schedule_strength=sos,
+                expected_wins=float(np.sum(self._win_prob_vec(rating, opp_ratings)))
+            )
         
-        for game in games:
-            if game.team_a == team:
-                opp = game.team_b
-                exp_wins += self.formulas.calculate_win_probability(
-                    team_rating, ratings[opp]
-                )
-            elif game.team_b == team:
-                opp = game.team_a
-                exp_wins += self.formulas.calculate_win_probability(
-                    team_rating, ratings[opp]
-                )
-                
-        return exp_wins
+        # NumPy fallback: gather the team's side of each game once
+        is_a = game_array.team_a_idx[idx] == team_idx
+        score_a = game_array.score_a[idx]
+        score_b = game_array.score_b[idx]
+        scores_for = np.where(is_a, score_a, score_b)
+        scores_against = np.where(is_a, score_b, score_a)
+        performances = scores_for - scores_against
+        opp_ratings = ratings_arr[np.where(is_a, game_array.team_b_idx[idx], game_array.team_a_idx[idx])]
+        
+        # Weighted recent trend with more recent games weighted higher
+        recent = performances[-RECENT_GAMES:]
+        trend = np.dot(recent, _TREND_WEIGHTS[len(recent)]) / _TREND_WEIGHT_SUMS[len(recent)]
+        
+        return _TeamStats(
+            offense=float(scores_for.mean()),
+            defense=float(-scores_against.mean()),  # Negative so higher is better
+            variance=float(performances.var()),
+            std_error=float(performances.std() / np.sqrt(len(idx))),
+            trend=float(trend),
+            schedule_strength=float(opp_ratings.mean()),
+            expected_wins=float(np.sum(self._win_prob_vec(rating, opp_ratings)))
+        )
     
     def _calculate_upset_probability(self,
                                    favorite: str,
-                                   h2h_games: List[GameResult],
+                                   game_array: GameArray,
+                                   h2h_idx: np.ndarray,
                                    ratings: Dict[str, float]) -> float:
         """Calculate probability of an upset based on historical data."""
-        if not h2h_games:
+        if len(h2h_idx) == 0:
             return 0.3  # Default upset probability
             
         # Calculate historical upset rate
-        upsets = 0
-        for game in h2h_games:
-            pre_game_favorite = game.team_a if ratings[game.team_a] > ratings[game.team_b] else game.team_b
-            winner = game.team_a if game.score_a > game.score_b else game.team_b
-            if winner != pre_game_favorite:
-                upsets += 1
+        ratings_arr = game_array.ratings_array(ratings)
+        favorites_are_a = (ratings_arr[game_array.team_a_idx[h2h_idx]] >
+                           ratings_arr[game_array.team_b_idx[h2h_idx]])
+        winners_are_a = game_array.score_a[h2h_idx] > game_array.score_b[h2h_idx]
+        upsets = int(np.count_nonzero(favorites_are_a != winners_are_a))
                 
-        return (upsets / len(h2h_games) + 0.3) / 2  # Blend with prior
+        return (upsets / len(h2h_idx) + 0.3) / 2  # Blend with prior
     
     def _identify_key_factors(self,
                             team_a: str,
                             team_b: str,
                             ratings: Dict[str, float],
-                            games: List[GameResult]) -> List[str]:
+                            games: List[GameResult],
+                            current_date: float,
+                            avg_rating: Optional[float] = None) -> List[str]:
         """Identify key factors that could influence the game."""
         factors = []
         
         # Get team analyses
-        a_analysis = self.analyze_team(team_a, ratings, games, datetime.now().timestamp())
-        b_analysis = self.analyze_team(team_b, ratings, games, datetime.now().timestamp())
+        if avg_rating is None:
+            avg_rating = self._average_rating(ratings)
+        a_analysis = self.analyze_team(team_a, ratings, games, current_date, avg_rating)
+        b_analysis = self.analyze_team(team_b, ratings, games, current_date, avg_rating)
         
         # Check offensive/defensive matchups
         if abs(a_analysis.offense - b_analysis.defense) > 10:
@@ -370,14 +508,14 @@ class RatingAnalyzer:
     def _calculate_prediction_confidence(self,
                                       team_a: str,
                                       team_b: str,
-                                      h2h_games: List[GameResult],
+                                      n_h2h: int,
                                       ratings: Dict[str, float]) -> float:
         """Calculate confidence in prediction (0-1)."""
         # Start with base confidence
         confidence = 0.7
         
         # Adjust based on number of games
-        confidence *= min(1.0, len(h2h_games) / 5)
+        confidence *= min(1.0, n_h2h / 5)
         
         # Adjust based on rating difference
         rating_diff = abs(ratings[team_a] - ratings[team_b])
@@ -386,14 +524,22 @@ class RatingAnalyzer:
         return min(1.0, confidence)
     
     def _get_historical_results(self,
-                              h2h_games: List[GameResult]) -> List[Dict[str, Any]]:
+                              games: List[GameResult],
+                              game_array: GameArray,
+                              h2h_idx: np.ndarray) -> List[Dict[str, Any]]:
         """Get historical head-to-head results."""
+        score_a = game_array.score_a[h2h_idx]
+        score_b = game_array.score_b[h2h_idx]
+        winners = np.where(score_a > score_b,
+                           game_array.team_a_idx[h2h_idx], game_array.team_b_idx[h2h_idx])
+        margins = np.abs(score_a - score_b)
         return [{
-            'date': game.date,
-            'score': (game.score_a, game.score_b),
-            'winner': game.team_a if game.score_a > game.score_b else game.team_b,
-            'margin': abs(game.score_a - game.score_b)
-        } for game in h2h_games]
+            'date': games[i].date,
+            'score': (a, b),
+            'winner': game_array.teams[winner],
+            'margin': margin
+        } for i, a, b, winner, margin in zip(h2h_idx.tolist(), score_a.tolist(), score_b.tolist(),
+                                             winners.tolist(), margins.tolist())]
     
     def _empty_analysis(self) -> RatingAnalysis:
         """Return empty analysis for teams with no games."""
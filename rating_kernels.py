@@ -0,0 +1,136 @@
+"""
+Compiled numeric kernels for the rating systems' hot paths.
+Kernels are JIT-compiled with Numba when it is installed; callers should
+check NUMBA_AVAILABLE and use their NumPy implementation otherwise.
+Modules defining their own kernels import njit from here so they stay
+importable (as plain Python) without Numba.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels stay importable."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# fastmath without the no-NaN/no-inf assumptions, so NaN inputs (such as
+# unrated opponents) still propagate
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+@njit(cache=True, fastmath=FASTMATH)
+def team_stats_kernel(team_a_idx: np.ndarray,
+                      team_b_idx: np.ndarray,
+                      score_a: np.ndarray,
+                      score_b: np.ndarray,
+                      idx: np.ndarray,
+                      my_idx: int,
+                      ratings_arr: np.ndarray,
+                      trend_weights: np.ndarray):
+    """
+    Single-pass reduction over one team's games.
+
+    Args:
+        team_a_idx, team_b_idx: Team indices for every game
+        score_a, score_b: Scores for every game
+        idx: The team's game indices, sorted by date
+        my_idx: Index of the team being analyzed
+        ratings_arr: Ratings aligned with team indices
+        trend_weights: Weights for the most recent len(trend_weights) games
+
+    Returns:
+        (offense, defense, variance, std_error, trend, schedule_strength,
+        opp_ratings) where opp_ratings holds each opponent's rating
+    """
+    n = idx.shape[0]
+    n_recent = trend_weights.shape[0]
+    opp_ratings = np.empty(n, dtype=np.float64)
+
+    sum_for = 0.0
+    sum_against = 0.0
+    sum_opp = 0.0
+    mean = 0.0
+    m2 = 0.0
+    trend_sum = 0.0
+    weight_sum = 0.0
+
+    for k in range(n):
+        g = idx[k]
+        if team_a_idx[g] == my_idx:
+            s_for = float(score_a[g])
+            s_against = float(score_b[g])
+            opp = team_b_idx[g]
+        else:
+            s_for = float(score_b[g])
+            s_against = float(score_a[g])
+            opp = team_a_idx[g]
+
+        sum_for += s_for
+        sum_against += s_against
+        opp_ratings[k] = ratings_arr[opp]
+        sum_opp += opp_ratings[k]
+
+        # Welford update for the performance variance
+        perf = s_for - s_against
+        delta = perf - mean
+        mean += delta / (k + 1)
+        m2 += delta * (perf - mean)
+
+        # Weighted trend over the most recent games
+        w_pos = k - (n - n_recent)
+        if w_pos >= 0:
+            w = trend_weights[w_pos]
+            trend_sum += w * perf
+            weight_sum += w
+
+    variance = m2 / n
+    std_error = np.sqrt(variance) / np.sqrt(n)
+    trend = trend_sum / weight_sum if weight_sum > 0 else 0.0
+    return (sum_for / n, -sum_against / n, variance, std_error,
+            trend, sum_opp / n, opp_ratings)
+
+@njit(cache=True, fastmath=FASTMATH)
+def woodbury_system_kernel(Z: np.ndarray,
+                           y: np.ndarray,
+                           pos_i: np.ndarray,
+                           pos_j: np.ndarray,
+                           w: np.ndarray):
+    """
+    Capacitance system of a Woodbury update made of games.
+    
+    Update column k is u = e_i - e_j over the solved system's teams, read
+    straight from the positions instead of a dense incidence matrix V.
+    
+    Args:
+        Z: A^-1 U, one column per update
+        y: A^-1 b
+        pos_i, pos_j: Positions of each update's two teams, -1 for a team
+            outside the system
+        w: Weight of each update
+        
+    Returns:
+        (capacitance, rhs) = (I + C V^T Z, C V^T y) with C = diag(w)
+    """
+    k = w.shape[0]
+    capacitance = np.eye(k)
+    rhs = np.zeros(k)
+    
+    for a in range(k):
+        p = pos_i[a]
+        q = pos_j[a]
+        if p >= 0:
+            for c in range(k):
+                capacitance[a, c] += w[a] * Z[p, c]
+            rhs[a] += w[a] * y[p]
+        if q >= 0:
+            for c in range(k):
+                capacitance[a, c] -= w[a] * Z[q, c]
+            rhs[a] -= w[a] * y[q]
+    
+    return capacitance, rhs
@@ -1,8 +1,20 @@
+import heapq
 import numpy as np
 from scipy import stats
-from typing import Dict, List, Tuple, Any
+from scipy import linalg, sparse
+from scipy.sparse.linalg import lsmr
+from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 
+# Leagues up to this size solve the offense/defense system densely
+DENSE_SOLVE_MAX_TEAMS = 64
+
+# Recent-performance weights (more weight to recent games) and their sums,
+# indexed by number of games; a team appears at most once per recent game
+RECENT_GAMES = 5
+_RECENT_WEIGHTS = tuple(np.exp(np.linspace(-1, 0, n)) for n in range(RECENT_GAMES + 1))
+_RECENT_WEIGHT_SUMS = tuple(float(w.sum()) for w in _RECENT_WEIGHTS)
+
 @dataclass
 class TeamStats:
     """Container for team statistics."""
@@ -21,14 +33,53 @@ class RatingStatistics:
     def __init__(self, elos_ratings):
         """Initialize with an ElosRatings instance."""
         self.ratings = elos_ratings
+        self._soa_games: Optional[List] = None
+        self._soa_len = 0
+        self._soa: Optional[Tuple[np.ndarray, ...]] = None
     
-    def calculate_power_ratings(self) -> Dict[str, float]:
+    def _games_soa(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Games flattened to arrays, cached until the games list changes.
+        
+        The arrays are reused while self.ratings.games is the very list they
+        were built from and has the same length, so added games rebuild them.
+        Games replaced or edited in place need invalidate_games().
+        
+        Returns:
+            (a_idx, b_idx, score_a, score_b, is_home_a) where the indices
+            refer to positions in self.ratings.teams
+        """
+        games = self.ratings.games
+        if games is not self._soa_games or len(games) != self._soa_len:
+            team_to_idx = {team: i for i, team in enumerate(self.ratings.teams)}
+            n = len(games)
+            self._soa = (
+                np.fromiter((team_to_idx[g.team_a] for g in games), dtype=np.intp, count=n),
+                np.fromiter((team_to_idx[g.team_b] for g in games), dtype=np.intp, count=n),
+                np.fromiter((g.score_a for g in games), dtype=np.float64, count=n),
+                np.fromiter((g.score_b for g in games), dtype=np.float64, count=n),
+                np.fromiter((g.is_home_a for g in games), dtype=bool, count=n)
+            )
+            self._soa_games = games
+            self._soa_len = n
+        return self._soa
+    
+    def invalidate_games(self) -> None:
+        """Rebuild the game arrays on next use, after games were edited in place."""
+        self._soa_games = None
+        self._soa = None
+    
+    def calculate_power_ratings(self,
+                                ratings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Calculate power ratings that measure potential rather than past performance.
         Uses Bayesian smoothing and recent game weighting.
+        
+        Args:
+            ratings: Precomputed base ratings (calculated if not given)
         """
-        base_ratings = self.ratings.calculate_ratings()
-        recent_perf = self._calculate_recent_performance()
+        base_ratings = ratings if ratings is not None else self.ratings.calculate_ratings()
+        recent_perf = self._calculate_recent_performance(base_ratings)
         
         power_ratings = {}
         for team in self.ratings.teams:
@@ -39,15 +90,21 @@ class RatingStatistics:
         
         return power_ratings
     
-    def _calculate_recent_performance(self) -> Dict[str, float]:
+    def _calculate_recent_performance(self,
+                                      ratings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """Helper method to calculate recent performance metrics."""
-        recent_games = sorted(self.ratings.games, key=lambda g: g.date)[-5:]
+        # Five latest games in date order; ties go to the later-added game
+        # exactly as a stable sort would
+        latest = heapq.nlargest(RECENT_GAMES, enumerate(self.ratings.games),
+                                key=lambda item: (item[1].date, item[0]))
+        recent_games = [game for _, game in reversed(latest)]
+        base_ratings = ratings if ratings is not None else self.ratings.calculate_ratings()
         
         performances = {}
         for game in recent_games:
             # Calculate performance rating for team_a
             margin = game.score_a - game.score_b
-            opp_rating = self.ratings.calculate_ratings()[game.team_b]
+            opp_rating = base_ratings[game.team_b]
             perf_a = margin + opp_rating
             
             # Update running average
@@ -56,7 +113,7 @@ class RatingStatistics:
             performances[game.team_a].append(perf_a)
             
             # Do the same for team_b
-            perf_b = -margin + self.ratings.calculate_ratings()[game.team_a]
+            perf_b = -margin + base_ratings[game.team_a]
             if game.team_b not in performances:
                 performances[game.team_b] = []
             performances[game.team_b].append(perf_b)
@@ -64,9 +121,8 @@ class RatingStatistics:
         # Calculate weighted averages
         recent_ratings = {}
         for team, perfs in performances.items():
-            # More weight to recent games
-            weights = np.exp(np.linspace(-1, 0, len(perfs)))
-            recent_ratings[team] = np.average(perfs, weights=weights)
+            n = len(perfs)
+            recent_ratings[team] = float(np.dot(perfs, _RECENT_WEIGHTS[n]) / _RECENT_WEIGHT_SUMS[n])
         
         return recent_ratings
     
@@ -75,41 +131,38 @@ class RatingStatistics:
         Split team strength into offensive and defensive components.
         Uses scoring patterns and opponent adjustments.
         """
-        games = self.ratings.games
-        n_teams = len(self.ratings.teams)
-        team_to_idx = {team: i for i, team in enumerate(self.ratings.teams)}
-        
-        # Build matrices for offense/defense decomposition
-        A = np.zeros((2*n_teams, 2*n_teams))
-        b = np.zeros(2*n_teams)
+        teams = self.ratings.teams
+        n_teams = len(teams)
+        a_idx, b_idx, score_a, score_b, _ = self._games_soa()
         
-        for game in games:
-            i = team_to_idx[game.team_a]
-            j = team_to_idx[game.team_b]
-            
-            # Offensive contribution
-            A[i, i] += 1  # Own offense
-            A[i, j+n_teams] += 1  # Opponent defense
-            b[i] += game.score_a
-            
-            # Defensive contribution
-            A[j+n_teams, j+n_teams] += 1  # Own defense
-            A[j+n_teams, i] += 1  # Opponent offense
-            b[j+n_teams] += game.score_b
-        
-        # Add constraint that average offense = average defense = 0
-        constraint_row = np.ones(n_teams)
-        A = np.vstack([A, [*constraint_row, *np.zeros(n_teams)]])
-        A = np.vstack([A, [*np.zeros(n_teams), *constraint_row]])
-        b = np.append(b, [0, 0])
+        # Build the offense/defense system: each game adds own offense +
+        # opponent defense to team_a's offense row and own defense + opponent
+        # offense to team_b's defense row
+        team_range = np.arange(n_teams)
+        rows = np.concatenate([a_idx, a_idx, b_idx + n_teams, b_idx + n_teams,
+                               np.full(n_teams, 2*n_teams),  # average offense = 0
+                               np.full(n_teams, 2*n_teams + 1)])  # average defense = 0
+        cols = np.concatenate([a_idx, b_idx + n_teams, b_idx + n_teams, a_idx,
+                               team_range, team_range + n_teams])
+        shape = (2*n_teams + 2, 2*n_teams)
+        b = np.concatenate([np.bincount(a_idx, weights=score_a, minlength=n_teams),
+                            np.bincount(b_idx, weights=score_b, minlength=n_teams),
+                            [0.0, 0.0]])
         
         try:
-            # Solve system
-            x = np.linalg.lstsq(A, b, rcond=None)[0]
+            # Solve system (minimum-norm least squares): dense complete
+            # orthogonal factorization for small leagues, sparse LSMR otherwise
+            if n_teams <= DENSE_SOLVE_MAX_TEAMS:
+                A = np.zeros(shape)
+                np.add.at(A, (rows, cols), 1.0)
+                x = linalg.lstsq(A, b, lapack_driver='gelsy', check_finite=False)[0]
+            else:
+                A = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=shape).tocsr()
+                x = lsmr(A, b, atol=1e-12, btol=1e-12, maxiter=20 * shape[1])[0]
             
             # Split into offense and defense ratings
-            offense = {team: x[i] for team, i in team_to_idx.items()}
-            defense = {team: -x[i+n_teams] for team, i in team_to_idx.items()}
+            offense = {team: float(x[i]) for i, team in enumerate(teams)}
+            defense = {team: float(-x[i+n_teams]) for i, team in enumerate(teams)}
             
             return offense, defense
             
@@ -119,138 +172,129 @@ class RatingStatistics:
     
     def _calculate_simple_off_def(self) -> Tuple[Dict[str, float], Dict[str, float]]:
         """Simplified offense/defense calculation as fallback."""
-        offense = {team: 0.0 for team in self.ratings.teams}
-        defense = {team: 0.0 for team in self.ratings.teams}
+        teams = self.ratings.teams
+        n_teams = len(teams)
+        a_idx, b_idx, score_a, score_b, _ = self._games_soa()
         
-        for game in self.ratings.games:
-            # Update offensive ratings
-            offense[game.team_a] += game.score_a
-            offense[game.team_b] += game.score_b
-            
-            # Update defensive ratings
-            defense[game.team_a] += game.score_b
-            defense[game.team_b] += game.score_a
+        # Points scored and allowed per team
+        offense = (np.bincount(a_idx, weights=score_a, minlength=n_teams) +
+                   np.bincount(b_idx, weights=score_b, minlength=n_teams))
+        defense = (np.bincount(a_idx, weights=score_b, minlength=n_teams) +
+                   np.bincount(b_idx, weights=score_a, minlength=n_teams))
         
-        # Average and normalize
-        for team in self.ratings.teams:
-            games_played = len([g for g in self.ratings.games 
-                              if g.team_a == team or g.team_b == team])
-            if games_played > 0:
-                offense[team] /= games_played
-                defense[team] /= games_played
+        # Average and normalize (self-games count once)
+        games_played = (np.bincount(a_idx, minlength=n_teams) +
+                        np.bincount(b_idx, weights=(a_idx != b_idx), minlength=n_teams))
+        played = games_played > 0
+        offense = np.divide(offense, games_played, out=np.zeros(n_teams), where=played)
+        defense = np.divide(defense, games_played, out=np.zeros(n_teams), where=played)
         
         # Center ratings
-        off_mean = np.mean(list(offense.values()))
-        def_mean = np.mean(list(defense.values()))
-        
-        for team in self.ratings.teams:
-            offense[team] -= off_mean
-            defense[team] -= def_mean
+        offense -= offense.mean()
+        defense -= defense.mean()
         
-        return offense, defense
+        return dict(zip(teams, offense.tolist())), dict(zip(teams, defense.tolist()))
     
-    def calculate_schedule_strength(self) -> Dict[str, float]:
+    def calculate_schedule_strength(self,
+                                    power: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Calculate schedule strength based on opponent ratings.
         Accounts for home/away games and opponent's power rating.
+        
+        Args:
+            power: Precomputed power ratings (calculated if not given)
         """
-        power_ratings = self.calculate_power_ratings()
-        schedule_strength = {}
+        power_ratings = power if power is not None else self.calculate_power_ratings()
         
-        for team in self.ratings.teams:
-            # Get all games involving this team
-            team_games = [g for g in self.ratings.games 
-                         if g.team_a == team or g.team_b == team]
-            
-            if not team_games:
-                schedule_strength[team] = 0.0
-                continue
-            
-            # Calculate average opponent strength
-            total_strength = 0.0
-            for game in team_games:
-                opp = game.team_b if game.team_a == team else game.team_a
-                opp_rating = power_ratings[opp]
-                
-                # Adjust for home/away
-                if (game.team_a == team and game.is_home_a) or \
-                   (game.team_b == team and not game.is_home_a):
-                    # Home game
-                    opp_rating += 50  # Typical home advantage
-                
-                total_strength += opp_rating
-            
-            schedule_strength[team] = total_strength / len(team_games)
+        teams = self.ratings.teams
+        n_teams = len(teams)
+        a_idx, b_idx, _, _, is_home_a = self._games_soa()
+        power_arr = np.array([power_ratings[team] for team in teams], dtype=np.float64)
+        
+        # Opponent strength from each side's perspective, plus 50 (typical
+        # home advantage) when the team was at home
+        opp_for_a = power_arr[b_idx] + 50.0 * is_home_a
+        opp_for_b = power_arr[a_idx] + 50.0 * ~is_home_a
+        b_weight = (a_idx != b_idx).astype(np.float64)  # count self-games once
+        totals = (np.bincount(a_idx, weights=opp_for_a, minlength=n_teams) +
+                  np.bincount(b_idx, weights=opp_for_b * b_weight, minlength=n_teams))
+        counts = (np.bincount(a_idx, minlength=n_teams) +
+                  np.bincount(b_idx, weights=b_weight, minlength=n_teams))
         
-        return schedule_strength
+        # Average opponent strength; 0 for teams without games
+        strength = np.divide(totals, counts, out=np.zeros(n_teams), where=counts > 0)
+        return dict(zip(teams, strength.tolist()))
     
     def calculate_expected_wins_losses(self) -> Dict[str, Tuple[float, float]]:
         """
         Calculate expected wins and losses for remaining schedule.
-        Uses power ratings and home advantage.
+        Uses the rating system's game predictions.
         """
-        power_ratings = self.calculate_power_ratings()
-        expected = {team: [0.0, 0.0] for team in self.ratings.teams}
+        teams = self.ratings.teams
+        n_teams = len(teams)
+        a_idx, b_idx, _, _, _ = self._games_soa()
+        p_a = self.ratings.predict_games(a_idx, b_idx)
         
-        for game in self.ratings.games:
-            p_a = self.ratings.predict_game(game.team_a, game.team_b)
-            
-            # Update expected W-L
-            expected[game.team_a][0] += p_a
-            expected[game.team_a][1] += (1 - p_a)
-            expected[game.team_b][0] += (1 - p_a)
-            expected[game.team_b][1] += p_a
+        # Accumulate expected W-L for both sides of every game
+        expected_w = (np.bincount(a_idx, weights=p_a, minlength=n_teams) +
+                      np.bincount(b_idx, weights=1 - p_a, minlength=n_teams))
+        expected_l = (np.bincount(a_idx, weights=1 - p_a, minlength=n_teams) +
+                      np.bincount(b_idx, weights=p_a, minlength=n_teams))
         
-        return {team: tuple(vals) for team, vals in expected.items()}
+        return {
+            team: (float(w), float(l))
+            for team, w, l in zip(teams, expected_w.tolist(), expected_l.tolist())
+        }
     
-    def calculate_parity_indices(self) -> Dict[str, float]:
+    def calculate_parity_indices(self,
+                                 ratings: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """
         Calculate parity indices to measure competitive balance.
         1.0 indicates perfect parity, 0.0 indicates complete imbalance.
+        
+        Args:
+            ratings: Precomputed base ratings (calculated if not given)
         """
-        ratings = self.ratings.calculate_ratings()
+        if ratings is None:
+            ratings = self.ratings.calculate_ratings()
         
         # Calculate standard deviation of ratings
-        rating_std = np.std(list(ratings.values()))
+        rating_std = np.std(np.fromiter(ratings.values(), dtype=np.float64, count=len(ratings)))
         
-        # Calculate parity index for each team's games
-        parity = {}
-        for team in self.ratings.teams:
-            team_games = [g for g in self.ratings.games 
-                         if g.team_a == team or g.team_b == team]
-            
-            if not team_games:
-                parity[team] = 1.0  # Default to perfect parity if no games
-                continue
-            
-            # Calculate rating differences in team's games
-            diffs = []
-            for game in team_games:
-                r_a = ratings[game.team_a]
-                r_b = ratings[game.team_b]
-                diffs.append(abs(r_a - r_b))
-            
-            # Convert to parity index
-            avg_diff = np.mean(diffs)
-            parity[team] = 1.0 / (1.0 + avg_diff/rating_std)
+        # Rating difference of every game, accumulated per team
+        teams = self.ratings.teams
+        n_teams = len(teams)
+        a_idx, b_idx, _, _, _ = self._games_soa()
+        ratings_arr = np.array([ratings[team] for team in teams], dtype=np.float64)
+        diffs = np.abs(ratings_arr[a_idx] - ratings_arr[b_idx])
+        b_weight = (a_idx != b_idx).astype(np.float64)  # count self-games once
+        totals = (np.bincount(a_idx, weights=diffs, minlength=n_teams) +
+                  np.bincount(b_idx, weights=diffs * b_weight, minlength=n_teams))
+        counts = (np.bincount(a_idx, minlength=n_teams) +
+                  np.bincount(b_idx, weights=b_weight, minlength=n_teams))
+        
+        # Convert to parity index; default to perfect parity if no games
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_diff = totals / counts
+            parity_arr = np.where(counts > 0, 1.0 / (1.0 + avg_diff / rating_std), 1.0)
         
-        return parity
+        return dict(zip(teams, parity_arr.tolist()))
     
     def get_complete_team_stats(self) -> Dict[str, TeamStats]:
         """
         Get comprehensive statistics for each team.
         Returns a dictionary mapping team names to TeamStats objects.
         """
-        # Calculate all metrics
+        # Calculate all metrics, solving for base and power ratings only once
         ratings = self.ratings.calculate_ratings()
-        power = self.calculate_power_ratings()
+        power = self.calculate_power_ratings(ratings)
         offense, defense = self.calculate_offense_defense_ratings()
-        schedule = self.calculate_schedule_strength()
+        schedule = self.calculate_schedule_strength(power)
         exp_wl = self.calculate_expected_wins_losses()
-        parity = self.calculate_parity_indices()
+        parity = self.calculate_parity_indices(ratings)
         
         # Calculate standard deviations
-        conf = self.ratings.calculate_rating_confidence()
+        conf = self.ratings.calculate_rating_confidence(ratings)
         
         stats = {}
         for team in self.ratings.teams:
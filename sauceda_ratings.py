@@ -3,9 +3,21 @@ Implements the Sauceda Rating System for NBA games.
 Based on Elo ratings with modifications for point differential and home court advantage.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
+from types import MappingProxyType
 from dataclasses import dataclass
+import bisect
 import math
+import numpy as np
+from rating_kernels import njit
+
+_LOG10 = math.log(10.0)
+_LOG04 = math.log(0.4)
+
+# Rating tiers from lowest to highest and the thresholds separating them
+_TIERS = ("POOR", "WEAK", "AVERAGE", "STRONG", "ELITE")
+_TIER_BOUNDS = (900, 1000, 1100, 1200)
+_TIER_THRESHOLDS = np.array(_TIER_BOUNDS, dtype=np.float64)
 
 @dataclass
 class GamePoints:
@@ -13,6 +25,40 @@ class GamePoints:
     loser_points: float
     win_probability: float
 
+@njit(cache=True)
+def _update(rating_a: float, rating_b: float,
+            score_a: float, score_b: float, is_home_a: bool,
+            k: float, pd_factor: float, home_advantage: float) -> Tuple[float, float]:
+    """Sauceda rating update for a single game; returns the new (rating_a, rating_b)."""
+    # Game points from the point differential
+    pd = score_a - score_b
+    gp = 1.0 - math.exp(_LOG04 * (1.0 + abs(pd) / pd_factor))
+    
+    # Win expectancy for team A
+    home_adj = home_advantage if is_home_a else -home_advantage
+    we = 1.0 / (1.0 + math.exp(_LOG10 * (rating_b - rating_a + home_adj) / k))
+    
+    # Winner earns gp, loser 1 - gp
+    if pd > 0:
+        return (rating_a + k * (gp - we),
+                rating_b + k * ((1.0 - gp) - (1.0 - we)))
+    return (rating_a + k * ((1.0 - gp) - we),
+            rating_b + k * (gp - (1.0 - we)))
+
+@njit(cache=True)
+def bulk_update(scores_a: np.ndarray, scores_b: np.ndarray,
+                idx_a: np.ndarray, idx_b: np.ndarray, is_home: np.ndarray,
+                ratings_array: np.ndarray,
+                k: float, pd_factor: float, home_advantage: float) -> None:
+    """Apply _update for a sequence of games in order, mutating ratings_array in place."""
+    for g in range(scores_a.shape[0]):
+        i = idx_a[g]
+        j = idx_b[g]
+        ratings_array[i], ratings_array[j] = _update(
+            ratings_array[i], ratings_array[j], scores_a[g], scores_b[g], is_home[g],
+            k, pd_factor, home_advantage
+        )
+
 class SaucedaRatings:
     def __init__(self, k: float = 300, initial_rating: float = 1000, pd_factor: float = 11):
         """
@@ -27,11 +73,72 @@ class SaucedaRatings:
         self.initial_rating = initial_rating
         self.pd_factor = pd_factor
         self.home_advantage = 100  # Initial home court advantage value
-        self.ratings: Dict[str, float] = {}
+        
+        # Ratings live in a dense array indexed by team id; the read-only dict view is
+        # built on demand and cached until the next update
+        self._team_idx: Dict[str, int] = {}
+        self._ratings_arr = np.empty(32, dtype=np.float64)
+        self._ratings_dict: Optional[Mapping[str, float]] = None
+    
+    @property
+    def k(self) -> float:
+        """Prediction constant."""
+        return self._k
+    
+    @k.setter
+    def k(self, k: float) -> None:
+        self._k = k
+        self._log10_over_k = _LOG10 / k
+    
+    @property
+    def pd_factor(self) -> float:
+        """Point differential factor."""
+        return self._pd_factor
+    
+    @pd_factor.setter
+    def pd_factor(self, pd_factor: float) -> None:
+        self._pd_factor = pd_factor
+        self._inv_pd = 1.0 / pd_factor
+    
+    @property
+    def ratings(self) -> Mapping[str, float]:
+        """
+        Current ratings keyed by team name, as a read-only view.
+        
+        Item writes raise TypeError; seed or replace ratings by assigning a
+        whole dict to this property instead.
+        """
+        if self._ratings_dict is None:
+            self._ratings_dict = MappingProxyType(dict(zip(
+                self._team_idx, self._ratings_arr[:len(self._team_idx)].tolist())))
+        return self._ratings_dict
+    
+    @ratings.setter
+    def ratings(self, ratings: Dict[str, float]) -> None:
+        self._team_idx = {}
+        self._ratings_arr = np.empty(max(32, len(ratings)), dtype=np.float64)
+        for team, rating in ratings.items():
+            self._ratings_arr[self._get_team_idx(team)] = rating
+        self._ratings_dict = None
+    
+    def _get_team_idx(self, team: str) -> int:
+        """Index of a team in the ratings array, adding it at the initial rating if new."""
+        idx = self._team_idx.get(team)
+        if idx is None:
+            idx = len(self._team_idx)
+            if idx == len(self._ratings_arr):
+                self._ratings_arr = np.resize(self._ratings_arr, 2 * idx)
+            self._ratings_arr[idx] = self.initial_rating
+            self._team_idx[team] = idx
+        return idx
         
     def calculate_game_points(self, point_differential: float) -> float:
         """Calculate game points based on point differential."""
-        return 1 - 0.4 ** (1 + point_differential / self.pd_factor)
+        return 1.0 - math.exp(_LOG04 * (1.0 + point_differential * self._inv_pd))
+    
+    def calculate_game_points_batch(self, point_differentials: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_game_points for an array of point differentials."""
+        return 1.0 - np.exp(_LOG04 * (1.0 + np.asarray(point_differentials, dtype=np.float64) * self._inv_pd))
         
     def calculate_win_expectancy(self, rating_a: float, rating_b: float, is_a_home: bool) -> float:
         """
@@ -46,9 +153,9 @@ class SaucedaRatings:
             Expected win probability for team A
         """
         home_adj = self.home_advantage if is_a_home else -self.home_advantage
-        return 1 / (1 + 10 ** ((rating_b - rating_a + home_adj) / self.k))
+        return 1.0 / (1.0 + math.exp(self._log10_over_k * (rating_b - rating_a + home_adj)))
         
-    def update_ratings(self, game_result: 'GameResult') -> Dict[str, float]:
+    def update_ratings(self, game_result: 'GameResult') -> Tuple[float, float]:
         """
         Update ratings based on game result.
         
@@ -56,46 +163,56 @@ class SaucedaRatings:
             game_result: GameResult object containing game details
             
         Returns:
-            Dictionary with updated ratings for both teams
+            Tuple of (team_a rating, team_b rating) after the update;
+            use snapshot() for all teams
         """
         # Initialize ratings if needed
-        if game_result.team_a not in self.ratings:
-            self.ratings[game_result.team_a] = self.initial_rating
-        if game_result.team_b not in self.ratings:
-            self.ratings[game_result.team_b] = self.initial_rating
-            
-        # Calculate point differential and game points
-        pd = game_result.score_a - game_result.score_b
-        gp = self.calculate_game_points(abs(pd))
-        
-        # Determine winner and loser points
-        if pd > 0:
-            winner_gp = gp
-            loser_gp = 1 - gp
-            winner = game_result.team_a
-            loser = game_result.team_b
-        else:
-            winner_gp = gp
-            loser_gp = 1 - gp
-            winner = game_result.team_b
-            loser = game_result.team_a
+        i = self._get_team_idx(game_result.team_a)
+        j = self._get_team_idx(game_result.team_b)
+        ratings = self._ratings_arr
             
-        # Calculate win expectancy
-        we = self.calculate_win_expectancy(
-            self.ratings[game_result.team_a],
-            self.ratings[game_result.team_b],
-            game_result.is_home_a
+        # Apply point-differential game points against win expectancy
+        ratings[i], ratings[j] = _update(
+            ratings[i], ratings[j],
+            game_result.score_a, game_result.score_b, game_result.is_home_a,
+            self.k, self.pd_factor, self.home_advantage
         )
+        self._ratings_dict = None
+            
+        return float(ratings[i]), float(ratings[j])
         
-        # Update ratings
-        if pd > 0:
-            self.ratings[game_result.team_a] += self.k * (winner_gp - we)
-            self.ratings[game_result.team_b] += self.k * (loser_gp - (1 - we))
-        else:
-            self.ratings[game_result.team_a] += self.k * (loser_gp - we)
-            self.ratings[game_result.team_b] += self.k * (winner_gp - (1 - we))
+    def update_ratings_bulk(self, games: List['GameResult']) -> Dict[str, float]:
+        """
+        Update ratings for a sequence of games in order with one compiled loop.
+        
+        Args:
+            games: GameResult objects in chronological order
             
-        return self.ratings.copy()
+        Returns:
+            Dictionary with updated ratings for all teams
+        """
+        n = len(games)
+        idx_a = np.fromiter((self._get_team_idx(g.team_a) for g in games), dtype=np.int64, count=n)
+        idx_b = np.fromiter((self._get_team_idx(g.team_b) for g in games), dtype=np.int64, count=n)
+        bulk_update(
+            np.fromiter((g.score_a for g in games), dtype=np.float64, count=n),
+            np.fromiter((g.score_b for g in games), dtype=np.float64, count=n),
+            idx_a, idx_b,
+            np.fromiter((g.is_home_a for g in games), dtype=np.bool_, count=n),
+            self._ratings_arr, float(self.k), float(self.pd_factor), float(self.home_advantage)
+        )
+        self._ratings_dict = None
+        
+        return self.snapshot()
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Copy of the current ratings that later updates will not change.
+        
+        Returns:
+            Dictionary mapping team names to ratings
+        """
+        return dict(self.ratings)
         
     def predict_game(self, team_a: str, team_b: str, is_a_home: bool) -> GamePoints:
         """
@@ -109,12 +226,12 @@ class SaucedaRatings:
         Returns:
             GamePoints object with win probabilities
         """
-        if team_a not in self.ratings or team_b not in self.ratings:
+        if team_a not in self._team_idx or team_b not in self._team_idx:
             raise ValueError("Both teams must have ratings")
             
         win_prob = self.calculate_win_expectancy(
-            self.ratings[team_a],
-            self.ratings[team_b],
+            self._ratings_arr[self._team_idx[team_a]],
+            self._ratings_arr[self._team_idx[team_b]],
             is_a_home
         )
         
@@ -134,16 +251,9 @@ class SaucedaRatings:
         Returns:
             String describing the team's tier
         """
-        if rating >= 1200:
-            return "ELITE"
-        elif rating >= 1100:
-            return "STRONG"
-        elif rating >= 1000:
-            return "AVERAGE"
-        elif rating >= 900:
-            return "WEAK"
-        else:
+        if rating != rating:  # NaN fails every threshold
             return "POOR"
+        return _TIERS[bisect.bisect_right(_TIER_BOUNDS, rating)]
             
     def analyze_rating_distribution(self, ratings: Optional[Dict[str, float]] = None) -> Dict[str, List[str]]:
         """
@@ -156,18 +266,17 @@ class SaucedaRatings:
             Dictionary mapping tiers to lists of team names
         """
         if ratings is None:
-            ratings = self.ratings
-            
-        distribution = {
-            "ELITE": [],
-            "STRONG": [],
-            "AVERAGE": [],
-            "WEAK": [],
-            "POOR": []
-        }
+            teams = list(self._team_idx)
+            ratings_arr = self._ratings_arr[:len(teams)]
+        else:
+            teams = list(ratings)
+            ratings_arr = np.fromiter(ratings.values(), dtype=np.float64, count=len(ratings))
         
-        for team, rating in ratings.items():
-            tier = self.get_rating_tier(rating)
-            distribution[tier].append(team)
-            
-        return distribution 
\ No newline at end of file
+        # Tier index for every team in one pass (NaN ratings fall to POOR)
+        tier_idx = np.searchsorted(_TIER_THRESHOLDS, ratings_arr, side='right')
+        tier_idx[np.isnan(ratings_arr)] = 0
+        
+        return {
+            tier: [teams[i] for i in np.flatnonzero(tier_idx == k).tolist()]
+            for k, tier in reversed(list(enumerate(_TIERS)))
+        }
@@ -2,12 +2,29 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple, Union
+
+def _american_to_decimal(odds: np.ndarray) -> np.ndarray:
+    """Convert an array of American odds to decimal odds (branch-free)."""
+    return 1.0 + np.where(odds > 0, odds / 100, 100 / -odds)
+
+def american_to_decimal(odds: float) -> float:
+    """Convert American odds to decimal odds using a select instead of a branch."""
+    positive = odds > 0
+    return 1.0 + positive * (odds / 100) + (not positive) * (100 / abs(odds))
 
 class SharpTools:
     def __init__(self, odds_api_key: Optional[str] = None):
         self.odds_api_key = odds_api_key
         
+        # Keep-alive session so repeated odds polls reuse the TLS connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                              max_retries=Retry(total=3, backoff_factor=0.2))
+        self._session.mount("https://", adapter)
+        
     def fetch_odds(self, sport: str = "basketball_nba") -> Dict:
         """Fetch real-time odds from The Odds API."""
         if not self.odds_api_key:
@@ -22,34 +39,42 @@ class SharpTools:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self._session.get(url, params=params, timeout=5)
             return response.json()
         except Exception as e:
             return {"error": str(e)}
     
-    def detect_steam_move(self, line_movements: pd.DataFrame, 
+    def detect_steam_move(self, line_movements: Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray]],
                          time_window: int = 5,
                          threshold: float = 1.0) -> bool:
         """
         Detect steam moves based on rapid line movement.
         
         Args:
-            line_movements: DataFrame with columns [timestamp, odds]
+            line_movements: DataFrame with columns [timestamp, odds], or a
+                (timestamps, odds) pair of arrays, in chronological order
             time_window: Minutes to check for movement
             threshold: Minimum line movement to qualify as steam
         """
         if len(line_movements) < 2:
             return False
-            
-        recent_moves = line_movements[
-            line_movements['timestamp'] >= datetime.now() - timedelta(minutes=time_window)
-        ]
         
-        if len(recent_moves) < 2:
+        if isinstance(line_movements, pd.DataFrame):
+            timestamps = line_movements['timestamp'].to_numpy(dtype='datetime64[ns]')
+            odds = line_movements['odds'].to_numpy()
+        else:
+            timestamps, odds = line_movements
+            timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        
+        # First move inside the window (timestamps are sorted)
+        cutoff = np.datetime64(datetime.now()) - np.timedelta64(time_window, 'm')
+        start = np.searchsorted(timestamps, cutoff, side='left')
+        
+        if len(timestamps) - start < 2:
             return False
             
-        total_movement = abs(recent_moves['odds'].iloc[-1] - recent_moves['odds'].iloc[0])
-        return total_movement >= threshold
+        total_movement = abs(odds[-1] - odds[start])
+        return bool(total_movement >= threshold)
     
     def detect_reverse_line_movement(self, 
                                    public_percentage: float,
@@ -88,14 +113,29 @@ class SharpTools:
             return closing_line - bet_line
         elif bet_type == "moneyline":
             # Convert American odds to decimal for comparison
-            def american_to_decimal(odds):
-                if odds > 0:
-                    return (odds / 100) + 1
-                else:
-                    return (100 / abs(odds)) + 1
             return american_to_decimal(closing_line) - american_to_decimal(bet_line)
         return 0.0
     
+    def calculate_closing_line_value_batch(self,
+                                         bet_lines: np.ndarray,
+                                         closing_lines: np.ndarray,
+                                         bet_type: str = "spread") -> np.ndarray:
+        """
+        Calculate Closing Line Value (CLV) for many bets of one type at once.
+        
+        Args:
+            bet_lines: Lines you bet at
+            closing_lines: Final lines before the games started
+            bet_type: Type of bet (spread, moneyline, total)
+        """
+        bet_lines = np.asarray(bet_lines, dtype=np.float64)
+        closing_lines = np.asarray(closing_lines, dtype=np.float64)
+        if bet_type == "spread":
+            return closing_lines - bet_lines
+        elif bet_type == "moneyline":
+            return _american_to_decimal(closing_lines) - _american_to_decimal(bet_lines)
+        return np.zeros(np.broadcast(bet_lines, closing_lines).shape)
+    
     def get_sharp_confidence(self, 
                            steam_move: bool,
                            reverse_line_movement: bool,
@@ -147,18 +187,29 @@ class SharpTools:
             odds: American odds
             kelly_fraction: Fraction of Kelly to use (0-1)
         """
-        # Convert American odds to decimal
-        if odds > 0:
-            decimal_odds = (odds / 100) + 1
-        else:
-            decimal_odds = (100 / abs(odds)) + 1
-            
-        # Calculate full Kelly
-        b = decimal_odds - 1  # Decimal odds minus 1
-        q = 1 - win_probability  # Probability of losing
-        p = win_probability  # Probability of winning
+        return float(self.calculate_optimal_kelly_batch(
+            np.array([win_probability], dtype=np.float64),
+            np.array([odds], dtype=np.float64),
+            kelly_fraction
+        )[0])
+    
+    def calculate_optimal_kelly_batch(self,
+                                    win_probabilities: np.ndarray,
+                                    odds: np.ndarray,
+                                    kelly_fraction: float = 0.5) -> np.ndarray:
+        """
+        Calculate fractional Kelly bet sizes for many bets at once.
+        
+        Args:
+            win_probabilities: Estimated probabilities of winning (0-1)
+            odds: American odds for each bet
+            kelly_fraction: Fraction of Kelly to use (0-1)
+        """
+        p = np.asarray(win_probabilities, dtype=np.float64)
+        b = _american_to_decimal(np.asarray(odds, dtype=np.float64)) - 1
         
-        kelly = (b * p - q) / b
+        # Full Kelly: (b*p - q) / b
+        kelly = (b * p - (1 - p)) / b
         
         # Apply Kelly fraction
-        return max(0, kelly * kelly_fraction) 
\ No newline at end of file
+        return np.maximum(0.0, kelly * kelly_fraction)
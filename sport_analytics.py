@@ -1,23 +1,274 @@
+import os
+import sys
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import IntEnum
+import orjson
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import ClassVar, Dict, List, Mapping, Optional, Tuple, Union
 import requests
 from datetime import datetime, timedelta
+from rating_kernels import FASTMATH, njit
 
-class SportAnalytics:
-    def __init__(self):
-        self.sport_models = {
-            "NFL": NFLAnalytics(),
-            "NBA": NBAAnalytics(),
-            "UFC/MMA": UFCAnalytics(),
-            "Soccer - EPL": SoccerAnalytics()
+# Per-venue constants, read once from data/venues.csv ("venue" column plus
+# any VENUE_DTYPE columns; missing columns are 0)
+VENUE_FILE = os.path.join("data", "venues.csv")
+VENUE_DTYPE = np.dtype([
+    ("altitude_ft", np.float64),
+    ("home_edge", np.float64),
+    ("shooting_effect", np.float64)
+])
+
+# Analyses kept per sport model
+ANALYSIS_MEMO_SIZE = 1024
+
+def _game_key(game_data: Dict) -> int:
+    """Order-independent 64-bit hash of a game_data dict's contents."""
+    payload = orjson.dumps(game_data, default=str,
+                           option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "little")
+
+@njit(cache=True, fastmath=FASTMATH, nogil=True)
+def _score_kernel(values: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Edge and confidence for each row of a (games, metrics) matrix in one pass.
+    
+    The edge is the weighted sum of the row. Confidence (50-100) rises above
+    50 with how much the weighted contributions agree in direction, scaled
+    by the share of total weight carried by metrics that have data (are
+    nonzero). Runs without the GIL so concurrent analyses overlap.
+    """
+    n_games, n_metrics = values.shape
+    total_weight = 0.0
+    for j in range(n_metrics):
+        total_weight += abs(weights[j])
+    
+    edges = np.empty(n_games)
+    confidence = np.empty(n_games)
+    for i in range(n_games):
+        net = 0.0
+        gross = 0.0
+        covered = 0.0
+        for j in range(n_metrics):
+            contribution = values[i, j] * weights[j]
+            net += contribution
+            gross += abs(contribution)
+            if values[i, j] != 0.0:
+                covered += abs(weights[j])
+        edges[i] = net
+        if gross > 0:
+            confidence[i] = 50.0 + 50.0 * (abs(net) / gross) * (covered / total_weight)
+        else:
+            confidence[i] = 50.0
+    return edges, confidence
+
+def _group_sums(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sum rows of values per integer key.
+    
+    Sort-based: one stable argsort makes each group contiguous, then
+    np.add.reduceat sums every segment in a single pass.
+    
+    Args:
+        keys: Group key of each row (must not be empty)
+        values: (rows, columns) values to sum
+        
+    Returns:
+        (unique_keys, sums, counts)
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    sums = np.add.reduceat(values[order], starts, axis=0)
+    counts = np.diff(np.r_[starts, len(sorted_keys)])
+    return sorted_keys[starts], sums, counts
+
+def _load_venue_features(path: str) -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Load the venue feature table.
+    
+    Args:
+        path: CSV file of venues; a missing file gives an empty table
+        
+    Returns:
+        (index, features) mapping venue name to row, and VENUE_DTYPE rows
+        with a trailing all-zero row (index -1) for unknown venues
+    """
+    if not os.path.exists(path):
+        return {}, np.zeros(1, dtype=VENUE_DTYPE)
+    
+    frame = pd.read_csv(path)
+    features = np.zeros(len(frame) + 1, dtype=VENUE_DTYPE)
+    for name in VENUE_DTYPE.names:
+        if name in frame:
+            features[name][:-1] = frame[name].fillna(0.0).to_numpy(dtype=np.float64)
+    index = {sys.intern(str(venue)): i for i, venue in enumerate(frame["venue"])}
+    return index, features
+
+VENUE_INDEX, VENUE_FEATURES = _load_venue_features(VENUE_FILE)
+
+def _venue_feature(games: pd.DataFrame, feature: str) -> np.ndarray:
+    """
+    A VENUE_DTYPE constant for the venue named in each game's "venue".
+    
+    Unknown or missing venues give 0.
+    """
+    column = VENUE_FEATURES[feature]
+    if "venue" not in games:
+        return np.zeros(len(games))
+    rows = games["venue"].map(VENUE_INDEX).fillna(-1).to_numpy(dtype=np.intp)
+    return column[rows]
+
+def _memoize_analysis(analyze):
+    """
+    LRU-memoize a sport model's analysis on the contents of game_data.
+    
+    An analysis depends only on game_data (and the module's constant
+    tables), so entries stay valid until evicted. Results are immutable, so
+    memo entries are handed to every caller as is. The memo is guarded by
+    the model's lock, so a model may be shared between threads.
+    """
+    @functools.wraps(analyze)
+    def wrapper(self, game_data: Dict):
+        memo = self._memo
+        if memo is None:
+            return analyze(self, game_data)
+        
+        key = _game_key(game_data)
+        with self._memo_lock:
+            result = memo.get(key)
+            if result is not None:
+                memo.move_to_end(key)
+                return result
+        
+        result = analyze(self, game_data)
+        with self._memo_lock:
+            memo[key] = result
+            if len(memo) > ANALYSIS_MEMO_SIZE:
+                memo.popitem(last=False)
+        return result
+    return wrapper
+
+@dataclass(frozen=True)
+class SportAnalysis:
+    """
+    A sport model's analysis of one game.
+    
+    key_metrics is a read-only METRIC_DTYPE record; to_dict() gives the
+    nested dict layout used at the JSON boundary.
+    """
+    __slots__ = ("edge", "confidence", "key_metrics", "hidden_factors")
+    edge: float
+    confidence: float
+    key_metrics: np.void
+    hidden_factors: Mapping[str, float]
+    
+    # (name, factory) for the sport's placeholder sections of "analysis"
+    SECTIONS: ClassVar[Tuple[Tuple[str, type], ...]] = ()
+    
+    def to_dict(self) -> Dict:
+        """The analysis as {"edge", "confidence", "analysis": {...}} dicts."""
+        analysis = {"key_metrics": dict(zip(self.key_metrics.dtype.names, self.key_metrics.tolist()))}
+        analysis.update((name, factory()) for name, factory in self.SECTIONS)
+        analysis["hidden_factors"] = dict(self.hidden_factors)
+        
+        return {
+            "edge": self.edge,
+            "confidence": self.confidence,
+            "analysis": analysis
         }
+
+class NFLAnalysis(SportAnalysis):
+    __slots__ = ()
+    SECTIONS = (("matchup_edges", list), ("injury_impact", int), ("weather_impact", int))
+
+class NBAAnalysis(SportAnalysis):
+    __slots__ = ()
+    SECTIONS = (("matchup_advantages", list), ("rest_impact", int))
+
+class UFCAnalysis(SportAnalysis):
+    __slots__ = ()
+    SECTIONS = (("style_matchup", dict),)
+
+class SoccerAnalysis(SportAnalysis):
+    __slots__ = ()
+    SECTIONS = (("form_analysis", dict),)
+
+class Sport(IntEnum):
+    """Sports with a dedicated model; values index SportAnalytics.sport_models."""
+    NFL = 0
+    NBA = 1
+    UFC = 2
+    EPL = 3
+
+# Display names accepted wherever a Sport is expected
+SPORT_NAMES = {
+    "NFL": Sport.NFL,
+    "NBA": Sport.NBA,
+    "UFC/MMA": Sport.UFC,
+    "Soccer - EPL": Sport.EPL
+}
+
+class SportAnalytics:
+    def __init__(self, cache: bool = True):
+        """
+        Args:
+            cache: Memoize analyses per sport (default True)
+        """
+        # Indexed by Sport
+        self.sport_models = (
+            NFLAnalytics(cache=cache),
+            NBAAnalytics(cache=cache),
+            UFCAnalytics(cache=cache),
+            SoccerAnalytics(cache=cache)
+        )
+    
+    def get_sport_analysis(self, sport: Union[Sport, str], game_data: Dict) -> Union[SportAnalysis, Dict]:
+        """
+        Get sport-specific analysis if available, otherwise return basic analysis.
+        
+        Args:
+            sport: A Sport, or its display name (e.g. "NFL", "UFC/MMA")
+            game_data: The game's data
+        """
+        if not isinstance(sport, Sport):
+            sport = SPORT_NAMES.get(sport)
+            if sport is None:
+                return self._basic_analysis(game_data)
+        return self.sport_models[sport].analyze(game_data)
+    
+    def get_sport_analyses(self, games: List[Tuple[Union[Sport, str], Dict]]) -> List[Union[SportAnalysis, Dict]]:
+        """
+        Analyze several games, each as get_sport_analysis would.
+        
+        Args:
+            games: (sport, game_data) pairs, sport as for get_sport_analysis
+            
+        Returns:
+            Analyses in the same order as games
+        """
+        return [self.get_sport_analysis(sport, game_data) for sport, game_data in games]
     
-    def get_sport_analysis(self, sport: str, game_data: Dict) -> Dict:
-        """Get sport-specific analysis if available, otherwise return basic analysis."""
-        if sport in self.sport_models:
-            return self.sport_models[sport].analyze(game_data)
-        return self._basic_analysis(game_data)
+    def get_sport_analysis_json(self, sport: Union[Sport, str], game_data: bytes) -> bytes:
+        """
+        get_sport_analysis for JSON in and out, e.g. straight from an HTTP body.
+        
+        Args:
+            sport: A Sport, or its display name
+            game_data: JSON-encoded game data
+            
+        Returns:
+            JSON-encoded analysis
+        """
+        analysis = self.get_sport_analysis(sport, orjson.loads(game_data))
+        if isinstance(analysis, SportAnalysis):
+            analysis = analysis.to_dict()
+        return orjson.dumps(analysis, option=orjson.OPT_SERIALIZE_NUMPY)
     
     def _basic_analysis(self, game_data: Dict) -> Dict:
         """Basic analysis for sports without specific models."""
@@ -27,235 +278,436 @@ class SportAnalytics:
             "key_factors": []
         }
 
-class NFLAnalytics:
+class BaseAnalytics:
+    """Behaviour shared by the sport-specific models."""
+    
+    # (key, helper method name) pairs and the matching record dtype,
+    # declared by each subclass; metrics without a helper yet stay 0
+    METRIC_PLAN: Tuple[Tuple[str, Optional[str]], ...]
+    METRIC_DTYPE: np.dtype
+    HIDDEN_PLAN: Tuple[Tuple[str, Optional[str]], ...]
+    # SportAnalysis subclass returned by analyze()
+    ANALYSIS: type
+    # Edge weight of each key metric, declared by each subclass
+    EDGE_WEIGHTS: np.ndarray
+    
     def __init__(self):
-        self.nextgen_stats_url = "https://api.nextgenstats.nfl.com/"
-        
-    def analyze(self, game_data: Dict) -> Dict:
-        """Analyze NFL game using NextGen Stats and Sharp Football data."""
-        analysis = {
-            "key_metrics": {},
-            "matchup_edges": [],
-            "injury_impact": 0,
-            "weather_impact": 0,
-            "hidden_factors": {}
-        }
+        self._memo_lock = threading.Lock()
+        # Resolve both plans to bound methods once rather than on every call,
+        # as (is it a key metric, key, helper)
+        self._plan = tuple(
+            (True, key, getattr(self, name)) for key, name in self.METRIC_PLAN if name
+        ) + tuple((False, key, getattr(self, name)) for key, name in self.HIDDEN_PLAN if name)
+    
+    def _compute_metrics(self, games: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Key metrics and hidden factors for a slate of games.
         
-        # Add NFL-specific analysis
-        analysis["key_metrics"].update({
-            # Standard metrics
-            "pass_rush_win_rate": self._get_pass_rush_stats(game_data),
-            "yards_per_play": self._get_offensive_efficiency(game_data),
-            "defensive_dvoa": self._get_defensive_metrics(game_data),
+        Args:
+            games: DataFrame with one row per game
             
-            # Hidden edges
-            "ref_tendency_impact": self._analyze_ref_tendencies(game_data),
-            "travel_fatigue": self._calculate_travel_impact(game_data),
-            "weather_advantage": self._analyze_weather_edge(game_data),
+        Returns:
+            (key_metrics, hidden_factors) where key_metrics is a
+            METRIC_DTYPE record array and each hidden factor an array,
+            both with one row per game
+        """
+        key_metrics = np.zeros(len(games), dtype=self.METRIC_DTYPE)
+        unfilled = np.zeros(len(games))
+        hidden_factors = {key: unfilled for key, _ in self.HIDDEN_PLAN}
+        
+        # One pass over both plans, so the games are walked once
+        for is_metric, key, fn in self._plan:
+            if is_metric:
+                key_metrics[key] = fn(games)
+            else:
+                hidden_factors[key] = fn(games)
+        
+        return key_metrics, hidden_factors
+    
+    def _score(self, metrics: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate betting edge and confidence from key metrics.
+        
+        Args:
+            metrics: METRIC_DTYPE records, one per game
             
-            # Advanced situational metrics
-            "third_down_efficiency_detail": self._get_third_down_metrics(game_data),
-            "redzone_performance": self._get_redzone_metrics(game_data),
-            "pressure_rate_impact": self._analyze_pressure_impact(game_data),
+        Returns:
+            (edges, confidences) with one entry per game
+        """
+        values = metrics.view(np.float64).reshape(len(metrics), -1)
+        return _score_kernel(values, self.EDGE_WEIGHTS)
+    
+    @_memoize_analysis
+    def _analyze_game(self, game_data: Dict) -> SportAnalysis:
+        """
+        analyze() for any sport: analyze_batch's pass over a one-game slate.
+        
+        The result is immutable (read-only key-metric record, read-only
+        hidden factors), so the memo can share it between callers.
+        """
+        key_metrics, hidden_factors = self._compute_metrics(pd.DataFrame([game_data]))
+        edges, confidence = self._score(key_metrics)
+        key_metrics.flags.writeable = False
+        hidden_factors = {key: float(values[0]) for key, values in hidden_factors.items()}
+        return self.ANALYSIS(float(edges[0]), float(confidence[0]),
+                             key_metrics[0], MappingProxyType(hidden_factors))
+    
+    def analyze_json(self, game_data: bytes) -> bytes:
+        """
+        analyze() for JSON in and out, e.g. straight from an HTTP body.
+        
+        Args:
+            game_data: JSON-encoded game data
             
-            # Pace and game script
-            "pace_mismatch": self._analyze_pace_mismatch(game_data),
-            "script_advantage": self._predict_game_script(game_data),
+        Returns:
+            JSON-encoded analysis
+        """
+        return orjson.dumps(self.analyze(orjson.loads(game_data)).to_dict(), option=orjson.OPT_SERIALIZE_NUMPY)
+    
+    def analyze_batch(self, games: List[Dict]) -> List[Dict]:
+        """
+        Edge and confidence for a whole slate in one vectorized pass.
+        
+        Games are stacked into a DataFrame so each metric is computed once
+        per column rather than once per game.
+        
+        Args:
+            games: game_data dicts as passed to analyze()
             
-            # Market inefficiencies
-            "public_perception_bias": self._calculate_public_bias(game_data),
-            "line_movement_efficiency": self._analyze_line_efficiency(game_data)
-        })
-        
-        # Hidden factors that most bettors miss
-        analysis["hidden_factors"].update({
-            "rest_advantage_detail": self._analyze_rest_advantage(game_data),
-            "stadium_specific_edge": self._get_stadium_edge(game_data),
-            "coordinator_tendency": self._analyze_coordinator_impact(game_data),
-            "injury_cascade_effect": self._analyze_injury_impact(game_data),
-            "division_familiarity": self._calculate_division_edge(game_data)
-        })
-        
-        # Calculate edge based on metrics
-        edge = self._calculate_edge(analysis["key_metrics"])
-        confidence = self._calculate_confidence(analysis)
+        Returns:
+            {"edge": ..., "confidence": ...} for each game, in order
+        """
+        if not games:
+            return []
         
-        return {
-            "edge": edge,
-            "confidence": confidence,
-            "analysis": analysis
-        }
+        frame = pd.DataFrame(games)
+        key_metrics, _ = self._compute_metrics(frame)
+        edges, confidence = self._score(key_metrics)
+        results = pd.DataFrame({"edge": edges, "confidence": confidence}, index=frame.index)
+        
+        return results.to_dict(orient="records")
+
+class NFLAnalytics(BaseAnalytics):
+    # (key, helper) for each key metric, in output order
+    METRIC_PLAN = (
+        # Standard metrics
+        ("pass_rush_win_rate", None),
+        ("yards_per_play", None),
+        ("defensive_dvoa", None),
+        
+        # Hidden edges
+        ("ref_tendency_impact", None),
+        ("travel_fatigue", None),
+        ("weather_advantage", None),
+        
+        # Advanced situational metrics
+        ("third_down_efficiency_detail", None),
+        ("redzone_performance", None),
+        ("pressure_rate_impact", None),
+        
+        # Pace and game script
+        ("pace_mismatch", None),
+        ("script_advantage", None),
+        
+        # Market inefficiencies
+        ("public_perception_bias", None),
+        ("line_movement_efficiency", None)
+    )
+    METRIC_DTYPE = np.dtype([(key, np.float64) for key, _ in METRIC_PLAN])
+    ANALYSIS = NFLAnalysis
+    
+    # Hidden factors that most bettors miss
+    HIDDEN_PLAN = (
+        ("rest_advantage_detail", None),
+        ("stadium_specific_edge", "_get_stadium_edge"),
+        ("coordinator_tendency", None),
+        ("injury_cascade_effect", None),
+        ("division_familiarity", None)
+    )
     
-    def _calculate_edge(self, metrics: Dict) -> float:
-        """Calculate betting edge based on NFL metrics."""
-        # Implement edge calculation logic
-        return 0.0
+    # Edge weight per key metric, in METRIC_DTYPE order
+    EDGE_WEIGHTS = np.array([
+         0.10,  # pass_rush_win_rate
+         0.12,  # yards_per_play
+         0.12,  # defensive_dvoa
+         0.04,  # ref_tendency_impact
+         0.05,  # travel_fatigue
+         0.03,  # weather_advantage
+         0.08,  # third_down_efficiency_detail
+         0.08,  # redzone_performance
+         0.08,  # pressure_rate_impact
+         0.05,  # pace_mismatch
+         0.07,  # script_advantage
+        -0.08,  # public_perception_bias
+         0.10,  # line_movement_efficiency
+    ])
+    
+    def __init__(self, cache: bool = True):
+        self.nextgen_stats_url = "https://api.nextgenstats.nfl.com/"
+        self._memo: Optional[OrderedDict] = OrderedDict() if cache else None
+        super().__init__()
+        
+    def analyze(self, game_data: Dict) -> NFLAnalysis:
+        """Analyze NFL game using NextGen Stats and Sharp Football data."""
+        return self._analyze_game(game_data)
+    
+    def _get_stadium_edge(self, games: pd.DataFrame) -> np.ndarray:
+        """Venue-specific home edge from the venue table."""
+        return _venue_feature(games, "home_edge")
     
-    def _calculate_confidence(self, analysis: Dict) -> float:
-        """Calculate confidence score based on NFL analysis."""
-        # Implement confidence calculation logic
-        return 50.0
 
-class NBAAnalytics:
-    def __init__(self):
+class NBAAnalytics(BaseAnalytics):
+    # (key, helper) for each key metric, in output order
+    METRIC_PLAN = (
+        # Standard metrics
+        ("shot_quality", None),
+        ("defensive_rating", None),
+        ("pace_factor", None),
+        
+        # Advanced tracking data
+        ("defender_distance", None),
+        ("transition_efficiency", None),
+        ("paint_protection", None),
+        
+        # Hidden edges
+        ("rest_impact_detail", None),
+        ("travel_distance", None),
+        ("arena_shooting_effect", "_analyze_arena_impact"),
+        
+        # Matchup-specific advantages
+        ("individual_matchup_edges", None),
+        ("rotation_impact", None),
+        ("bench_advantage", None)
+    )
+    METRIC_DTYPE = np.dtype([(key, np.float64) for key, _ in METRIC_PLAN])
+    ANALYSIS = NBAAnalysis
+    
+    # Hidden factors
+    HIDDEN_PLAN = (
+        ("ref_crew_tendencies", None),
+        ("schedule_spot_analysis", None),
+        ("injury_replacement_value", None),
+        ("lineup_chemistry", None),
+        ("momentum_factors", None)
+    )
+    
+    # Edge weight per key metric, in METRIC_DTYPE order
+    EDGE_WEIGHTS = np.array([
+         0.12,  # shot_quality
+         0.12,  # defensive_rating
+         0.05,  # pace_factor
+         0.08,  # defender_distance
+         0.08,  # transition_efficiency
+         0.08,  # paint_protection
+         0.10,  # rest_impact_detail
+         0.06,  # travel_distance
+         0.04,  # arena_shooting_effect
+         0.12,  # individual_matchup_edges
+         0.07,  # rotation_impact
+         0.08,  # bench_advantage
+    ])
+    
+    def __init__(self, cache: bool = True):
         self.tracking_data_url = "https://stats.nba.com/stats/"
+        self._memo: Optional[OrderedDict] = OrderedDict() if cache else None
+        super().__init__()
         
-    def analyze(self, game_data: Dict) -> Dict:
+    def analyze(self, game_data: Dict) -> NBAAnalysis:
         """Analyze NBA game using Second Spectrum tracking data."""
-        analysis = {
-            "key_metrics": {},
-            "matchup_advantages": [],
-            "rest_impact": 0,
-            "hidden_factors": {}
-        }
+        return self._analyze_game(game_data)
+    
+    def _analyze_arena_impact(self, games: pd.DataFrame) -> np.ndarray:
+        """Arena-specific shooting effect from the venue table."""
+        return _venue_feature(games, "shooting_effect")
+    
+
+class UFCAnalytics(BaseAnalytics):
+    # (key, helper) for each key metric, in output order
+    METRIC_PLAN = (
+        # Standard metrics
+        ("striking_accuracy", "_get_striking_stats"),
+        ("takedown_defense", None),
+        ("weight_cut", None),
         
-        # Add NBA-specific analysis
-        analysis["key_metrics"].update({
-            # Standard metrics
-            "shot_quality": self._get_shot_quality_metrics(game_data),
-            "defensive_rating": self._get_defensive_metrics(game_data),
-            "pace_factor": self._get_pace_metrics(game_data),
-            
-            # Advanced tracking data
-            "defender_distance": self._analyze_defender_distance(game_data),
-            "transition_efficiency": self._get_transition_metrics(game_data),
-            "paint_protection": self._analyze_paint_protection(game_data),
-            
-            # Hidden edges
-            "rest_impact_detail": self._analyze_rest_situations(game_data),
-            "travel_distance": self._calculate_travel_fatigue(game_data),
-            "arena_shooting_effect": self._analyze_arena_impact(game_data),
-            
-            # Matchup-specific advantages
-            "individual_matchup_edges": self._analyze_player_matchups(game_data),
-            "rotation_impact": self._analyze_rotation_patterns(game_data),
-            "bench_advantage": self._calculate_bench_impact(game_data)
-        })
-        
-        # Hidden factors
-        analysis["hidden_factors"].update({
-            "ref_crew_tendencies": self._analyze_ref_impact(game_data),
-            "schedule_spot_analysis": self._analyze_schedule_spot(game_data),
-            "injury_replacement_value": self._calculate_injury_impact(game_data),
-            "lineup_chemistry": self._analyze_lineup_cohesion(game_data),
-            "momentum_factors": self._analyze_momentum_metrics(game_data)
-        })
-        
-        edge = self._calculate_edge(analysis["key_metrics"])
-        confidence = self._calculate_confidence(analysis)
+        # Advanced metrics
+        ("cardio_efficiency", None),
+        ("recovery_ability", None),
+        ("damage_absorption", None),
         
-        return {
-            "edge": edge,
-            "confidence": confidence,
-            "analysis": analysis
-        }
-
-class UFCAnalytics:
-    def __init__(self):
+        # Style analysis
+        ("style_effectiveness", None),
+        ("distance_control", None),
+        ("clinch_efficiency", None),
+        
+        # Hidden edges
+        ("camp_quality", None),
+        ("weight_cut_history", "_analyze_weight_history"),
+        ("opponent_quality", None)
+    )
+    METRIC_DTYPE = np.dtype([(key, np.float64) for key, _ in METRIC_PLAN])
+    ANALYSIS = UFCAnalysis
+    
+    # Hidden factors
+    HIDDEN_PLAN = (
+        ("travel_impact", None),
+        ("altitude_adjustment", "_calculate_altitude_impact"),
+        ("career_phase", None),
+        ("injury_history", "_analyze_injury_patterns"),
+        ("momentum_shift", None)
+    )
+    
+    # Edge weight per key metric, in METRIC_DTYPE order
+    EDGE_WEIGHTS = np.array([
+         0.12,  # striking_accuracy
+         0.10,  # takedown_defense
+         0.06,  # weight_cut
+         0.10,  # cardio_efficiency
+         0.08,  # recovery_ability
+         0.10,  # damage_absorption
+         0.12,  # style_effectiveness
+         0.08,  # distance_control
+         0.05,  # clinch_efficiency
+         0.07,  # camp_quality
+         0.05,  # weight_cut_history
+         0.07,  # opponent_quality
+    ])
+    
+    def __init__(self, cache: bool = True):
         self.tapology_url = "https://www.tapology.com/"
         self.betmma_tips_url = "https://www.betmmatips.com/"
+        self._memo: Optional[OrderedDict] = OrderedDict() if cache else None
+        super().__init__()
         
-    def analyze(self, game_data: Dict) -> Dict:
+    def analyze(self, game_data: Dict) -> UFCAnalysis:
         """Analyze UFC fight using comprehensive fighter data."""
-        analysis = {
-            "key_metrics": {},
-            "style_matchup": {},
-            "hidden_factors": {}
-        }
+        return self._analyze_game(game_data)
+    
+    def _get_striking_stats(self, games: pd.DataFrame) -> np.ndarray:
+        """Significant strike accuracy differential (fighter_a minus fighter_b) from strike_history."""
+        sums, _ = self._side_history(games, "strike_history", ("landed", "attempted"))
+        accuracy = np.divide(sums[..., 0], sums[..., 1],
+                             out=np.zeros(sums.shape[:2]), where=sums[..., 1] > 0)
+        return accuracy[:, 0] - accuracy[:, 1]
+    
+    def _analyze_weight_history(self, games: pd.DataFrame) -> np.ndarray:
+        """Missed-weight edge: fighter_b's share of missed weigh-ins minus fighter_a's."""
+        return self._side_rate_edge(games, "weight_history", "missed_weight")
+    
+    def _calculate_altitude_impact(self, games: pd.DataFrame) -> np.ndarray:
+        """Altitude effect on cardio, in miles above sea level of the venue."""
+        return _venue_feature(games, "altitude_ft") / 5280.0
+    
+    def _analyze_injury_patterns(self, games: pd.DataFrame) -> np.ndarray:
+        """Recurring injury edge: fighter_b's share of injury-hit bouts minus fighter_a's."""
+        return self._side_rate_edge(games, "injury_history", "injured")
+    
+    def _side_rate_edge(self, games: pd.DataFrame, history_key: str, flag: str) -> np.ndarray:
+        """Rate of a 0/1 history flag for fighter_b minus the rate for fighter_a."""
+        sums, counts = self._side_history(games, history_key, (flag,))
+        rates = np.divide(sums[..., 0], counts, out=np.zeros(counts.shape), where=counts > 0)
+        return rates[:, 1] - rates[:, 0]
+    
+    def _side_history(self, games: pd.DataFrame, history_key: str,
+                      columns: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sum history columns per fighter for every fight in games.
         
-        # Add UFC-specific analysis
-        analysis["key_metrics"].update({
-            # Standard metrics
-            "striking_accuracy": self._get_striking_stats(game_data),
-            "takedown_defense": self._get_grappling_stats(game_data),
-            "weight_cut": self._get_weight_data(game_data),
-            
-            # Advanced metrics
-            "cardio_efficiency": self._analyze_cardio_metrics(game_data),
-            "recovery_ability": self._analyze_recovery_stats(game_data),
-            "damage_absorption": self._calculate_damage_metrics(game_data),
-            
-            # Style analysis
-            "style_effectiveness": self._analyze_style_matchup(game_data),
-            "distance_control": self._analyze_distance_management(game_data),
-            "clinch_efficiency": self._get_clinch_metrics(game_data),
+        Rows from all fights are grouped together in one sort-based pass
+        rather than one hash groupby per fight.
+        
+        Args:
+            games: DataFrame of fights. Each fight's history_key holds rows
+                like {"fighter": name, column: value} for both fighters' past
+                bouts; rows naming neither fighter_a nor fighter_b are ignored.
+            history_key: Field holding the history rows
+            columns: Row fields to sum
             
-            # Hidden edges
-            "camp_quality": self._analyze_training_camp(game_data),
-            "weight_cut_history": self._analyze_weight_history(game_data),
-            "opponent_quality": self._analyze_competition_level(game_data)
-        })
-        
-        # Hidden factors
-        analysis["hidden_factors"].update({
-            "travel_impact": self._analyze_travel_effect(game_data),
-            "altitude_adjustment": self._calculate_altitude_impact(game_data),
-            "career_phase": self._analyze_career_trajectory(game_data),
-            "injury_history": self._analyze_injury_patterns(game_data),
-            "momentum_shift": self._analyze_momentum_factors(game_data)
-        })
-        
-        edge = self._calculate_edge(analysis["key_metrics"])
-        confidence = self._calculate_confidence(analysis)
+        Returns:
+            (sums, counts) shaped (fights, 2, len(columns)) and (fights, 2),
+            side 0 being fighter_a and side 1 fighter_b
+        """
+        fights = games.to_dict("records")
+        keys = []
+        rows = []
+        for i, fight in enumerate(fights):
+            history = fight.get(history_key)
+            if not isinstance(history, list):
+                continue
+            sides = {fight.get("fighter_a"): 0, fight.get("fighter_b"): 1}
+            for event in history:
+                side = sides.get(event.get("fighter"))
+                if side is not None:
+                    keys.append(2 * i + side)
+                    rows.append([float(event.get(column, 0.0)) for column in columns])
         
-        return {
-            "edge": edge,
-            "confidence": confidence,
-            "analysis": analysis
-        }
+        sums = np.zeros((2 * len(games), len(columns)))
+        counts = np.zeros(2 * len(games))
+        if keys:
+            groups, group_sums, group_counts = _group_sums(np.array(keys), np.array(rows))
+            sums[groups] = group_sums
+            counts[groups] = group_counts
+        return sums.reshape(len(games), 2, len(columns)), counts.reshape(len(games), 2)
+    
 
-class SoccerAnalytics:
-    def __init__(self):
-        self.xg_url = "https://understat.com/api/"
+class SoccerAnalytics(BaseAnalytics):
+    # (key, helper) for each key metric, in output order
+    METRIC_PLAN = (
+        # Standard metrics
+        ("xg_last_5", None),
+        ("possession_quality", None),
+        ("pressing_intensity", None),
         
-    def analyze(self, game_data: Dict) -> Dict:
-        """Analyze soccer match using comprehensive data."""
-        analysis = {
-            "key_metrics": {},
-            "form_analysis": {},
-            "hidden_factors": {}
-        }
+        # Advanced metrics
+        ("tactical_matchup", None),
+        ("set_piece_advantage", None),
+        ("transition_threat", None),
         
-        # Add soccer-specific analysis
-        analysis["key_metrics"].update({
-            # Standard metrics
-            "xg_last_5": self._get_xg_data(game_data),
-            "possession_quality": self._get_possession_metrics(game_data),
-            "pressing_intensity": self._get_pressing_stats(game_data),
-            
-            # Advanced metrics
-            "tactical_matchup": self._analyze_tactical_fit(game_data),
-            "set_piece_advantage": self._analyze_set_pieces(game_data),
-            "transition_threat": self._analyze_transition_play(game_data),
-            
-            # Hidden edges
-            "referee_impact": self._analyze_referee_bias(game_data),
-            "travel_fatigue": self._calculate_travel_impact(game_data),
-            "pitch_conditions": self._analyze_pitch_impact(game_data),
-            
-            # Competition context
-            "motivation_factor": self._analyze_motivation_levels(game_data),
-            "competition_priority": self._assess_competition_importance(game_data),
-            "squad_rotation": self._analyze_rotation_impact(game_data)
-        })
-        
-        # Hidden factors
-        analysis["hidden_factors"].update({
-            "weather_impact": self._analyze_weather_effect(game_data),
-            "rest_advantage": self._calculate_rest_impact(game_data),
-            "fan_pressure": self._analyze_atmosphere_impact(game_data),
-            "tactical_flexibility": self._analyze_tactical_options(game_data),
-            "injury_cascade": self._analyze_squad_depth_impact(game_data)
-        })
-        
-        edge = self._calculate_edge(analysis["key_metrics"])
-        confidence = self._calculate_confidence(analysis)
+        # Hidden edges
+        ("referee_impact", None),
+        ("travel_fatigue", None),
+        ("pitch_conditions", None),
         
-        return {
-            "edge": edge,
-            "confidence": confidence,
-            "analysis": analysis
-        }
+        # Competition context
+        ("motivation_factor", None),
+        ("competition_priority", None),
+        ("squad_rotation", None)
+    )
+    METRIC_DTYPE = np.dtype([(key, np.float64) for key, _ in METRIC_PLAN])
+    ANALYSIS = SoccerAnalysis
+    
+    # Hidden factors
+    HIDDEN_PLAN = (
+        ("weather_impact", None),
+        ("rest_advantage", None),
+        ("fan_pressure", None),
+        ("tactical_flexibility", None),
+        ("injury_cascade", None)
+    )
+    
+    # Edge weight per key metric, in METRIC_DTYPE order
+    EDGE_WEIGHTS = np.array([
+         0.18,  # xg_last_5
+         0.08,  # possession_quality
+         0.08,  # pressing_intensity
+         0.10,  # tactical_matchup
+         0.07,  # set_piece_advantage
+         0.08,  # transition_threat
+         0.04,  # referee_impact
+         0.04,  # travel_fatigue
+         0.03,  # pitch_conditions
+         0.12,  # motivation_factor
+         0.10,  # competition_priority
+         0.08,  # squad_rotation
+    ])
+    
+    def __init__(self, cache: bool = True):
+        self.xg_url = "https://understat.com/api/"
+        self._memo: Optional[OrderedDict] = OrderedDict() if cache else None
+        super().__init__()
+        
+    def analyze(self, game_data: Dict) -> SoccerAnalysis:
+        """Analyze soccer match using comprehensive data."""
+        return self._analyze_game(game_data)
     
     def _get_xg_data(self, game_data: Dict) -> Dict:
         """Get expected goals data from Understat."""
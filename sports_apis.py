@@ -1,9 +1,17 @@
+import os
+import sys
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import random
+import math
 import logging
+from collections import OrderedDict
 from typing import Dict, Optional, List, Union, Tuple
 import pandas as pd
+from io import StringIO
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import aiohttp
 import asyncio
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -12,24 +20,156 @@ from api_config import APIConfig
 from nba_api.stats.endpoints import scoreboardv2, leaguegamefinder
 from nba_api.stats.static import teams, players
 import numpy as np
-from scipy import linalg
-from collections import defaultdict
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from scipy.special import expit
+from datetime import date
+from rating_kernels import NUMBA_AVAILABLE, woodbury_system_kernel
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# nba_api responses are cached on disk under data/cache/nba_api
+NBA_CACHE_DIR = os.path.join("data", "cache", "nba_api")
+# Seconds results for the current day or season are kept; past ones never expire
+NBA_CURRENT_TTL = 3600
+
+def _nba_date_expiry(game_date: Optional[str]) -> Optional[int]:
+    """Cache lifetime of a scoreboard: none for past dates, NBA_CURRENT_TTL otherwise."""
+    try:
+        past = game_date is not None and pd.Timestamp(game_date).date() < date.today()
+    except ValueError:
+        past = False
+    return None if past else NBA_CURRENT_TTL
+
+def _nba_season_expiry(season: str) -> Optional[int]:
+    """Cache lifetime of a season's stats ("2023-24"): none once it ended in June."""
+    try:
+        over = date(int(season[:4]) + 1, 7, 1) <= date.today()
+    except ValueError:
+        over = False
+    return None if over else NBA_CURRENT_TTL
+
+# Seconds a scraped page is reused before being re-requested
+PAGE_CACHE_TTL = 30
+# Scraped pages kept per SportsAPI; the least recently used is dropped first
+PAGE_CACHE_SIZE = 256
+# Bytes of a scraped page fed to the HTML parser at a time as it arrives
+PAGE_CHUNK_SIZE = 64 * 1024
+
+# User-Agent strings drawn once per SportsAPI and rotated between requests
+USER_AGENT_POOL_SIZE = 64
+
+# Browser-like headers for scraped pages (plus a pooled User-Agent)
+SCRAPE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Connection pool and timeout of the aiohttp session shared by all requests
+HTTP_CONNECTION_LIMIT = 32
+HTTP_CONNECTIONS_PER_HOST = 4
+HTTP_TIMEOUT = 15
+
+def _has_class(name: str) -> str:
+    """XPath test for the CSS class selector .name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def _xpaths(*paths: str) -> Tuple[etree.XPath, ...]:
+    return tuple(etree.XPath(path) for path in paths)
+
+# NHL.com layouts, compiled once and tried in order; the fields use
+# ancestor:: so they match like CSS descendant selectors on a game
+_NHL_GAME_PATHS = _xpaths(
+    f"//*[{_has_class('nhl-scores-page__game')}]",
+    f"//*[{_has_class('nhl-score-card')}]",
+    f"//*[{_has_class('nhl-scores__list-item')}][ancestor::*[{_has_class('nhl-scores__list')}]]",
+    f"//*[{_has_class('nhl-scores__game-wrapper')}]",
+    f"//*[{_has_class('nhl-widget-game-card')}]"
+)
+# Any div with "game" or "score" in its class, when no layout matches
+_NHL_GAME_FALLBACK = etree.XPath(
+    "//div[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'game')"
+    " or contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'score')]"
+)
+def _first_text(*paths: str) -> etree.XPath:
+    """String value of the first element matched by the highest-priority path.
+    
+    Each path is relative to a game and is skipped if an earlier one
+    matches; evaluate with the game bound to $game as well as the context.
+    """
+    terms = []
+    for k, path in enumerate(paths):
+        earlier = ''.join(f"[not({p.replace('.//', '$game//', 1)})]" for p in paths[:k])
+        terms.append(f"({path})[1]{earlier}")
+    return etree.XPath(f"string({' | '.join(terms)})")
+
+_NHL_FIELD_TEXT = {
+    field: _first_text(
+        f".//*[{_has_class(f'nhl-score-card__{item}')}][ancestor::*[{_has_class(f'nhl-score-card__team--{side}')}]]",
+        f".//*[{_has_class(f'nhl-scores-page__{item}')}][ancestor::*[{_has_class(f'nhl-scores-page__team--{side}')}]]",
+        f".//*[contains(@class, '{item}')][ancestor::*[contains(@class, '{side}')]]"
+    )
+    for field, side, item in (
+        ('home_team', 'home', 'team-name'),
+        ('away_team', 'away', 'team-name'),
+        ('home_score', 'home', 'score'),
+        ('away_score', 'away', 'score')
+    )
+}
+_NHL_FIELD_TEXT['status'] = _first_text(
+    f".//*[{_has_class('nhl-score-card__status')}]",
+    f".//*[{_has_class('nhl-scores-page__status')}]",
+    ".//*[contains(@class, 'status')]",
+    ".//*[contains(@class, 'state')]"
+)
+
+# ESPN odds table layouts, tried in order
+_ESPN_TABLE_PATHS = _xpaths(
+    f"//table[{_has_class('odds-table')}]",
+    f"//table[{_has_class('Table')}]",
+    "//table[ancestor::div[@data-type='odds']]",
+    f"//table[ancestor::div[{_has_class('odds-container')}]]"
+)
 
 class MasseyRatings:
+    # Games absorbed as low-rank updates before the system is refactorized
+    MAX_UPDATE_RANK = 32
+    
     def __init__(self, teams: List[str], min_games: int = 3):
         """Initialize Massey Ratings system.
         
+        Team names are interned, so lookups with names that ingesters have
+        also interned (sys.intern) compare by identity.
+        
         Args:
             teams: List of team names/identifiers
             min_games: Minimum number of games needed for rating calculation
         """
-        self.teams = {team: idx for idx, team in enumerate(teams)}
+        self._team_names = [sys.intern(team) for team in teams]
+        self.teams = {team: idx for idx, team in enumerate(self._team_names)}
         self.n_teams = len(teams)
         self.min_games = min_games
-        self.M = np.zeros((self.n_teams, self.n_teams))  # Massey matrix
+        self.M = sparse.csr_matrix((self.n_teams, self.n_teams))  # Massey matrix (sparse)
         self.b = np.zeros(self.n_teams)  # Point differential vector
-        self.games_played = defaultdict(int)
+        # Games played per team, and the teams with games in order of
+        # their first game (the order teams are rated in)
+        self._gp = np.zeros(self.n_teams, dtype=np.int64)
+        self._seen = []
         self.last_ratings = None
+        # (i, j, point differential, weight) of games not yet in M and b
+        self._pending = []
+        # (active team indices, LU factors) of the last factorized system
+        self._factor = None
+        # (i, j, weight) of games added to M since it was factorized, and
+        # their absorbed Woodbury terms: A^-1 U, the teams' positions in
+        # the system (-1 if inactive) and the weights
+        self._new_games = []
+        self._update_z = self._update_i = self._update_j = self._update_w = None
         
         # Initialize logging
         self.logger = logging.getLogger(__name__)
@@ -48,6 +188,9 @@ class MasseyRatings:
     def add_game(self, team1: str, team2: str, score1: int, score2: int, weight: float = 1.0):
         """Add a game result to the system.
         
+        The game is queued and folded into the Massey matrix together with
+        any other new games the next time ratings are calculated.
+        
         Args:
             team1: Name of first team
             team2: Name of second team
@@ -58,28 +201,148 @@ class MasseyRatings:
         valid, error = self._validate_teams(team1, team2)
         if not valid:
             raise ValueError(error)
-            
-        i, j = self.teams[team1], self.teams[team2]
-        pd = score1 - score2  # Point differential
         
-        # Update Massey matrix
-        self.M[i][i] += weight
-        self.M[j][j] += weight
-        self.M[i][j] -= weight
-        self.M[j][i] -= weight
+        self.add_game_by_idx(self.teams[team1], self.teams[team2], score1, score2, weight)
+        self.logger.debug(f"Added game: {team1} {score1} - {score2} {team2} (weight: {weight})")
+    
+    def add_game_by_idx(self, i: int, j: int, score1: int, score2: int, weight: float = 1.0):
+        """Add a game result by team index, without validation.
         
-        # Update point differential vector
-        self.b[i] += pd * weight
-        self.b[j] -= pd * weight
+        For ingesters that resolve team names once up front; i and j must
+        be valid indices into self.teams.
         
-        # Track games played
-        self.games_played[team1] += 1
-        self.games_played[team2] += 1
+        Args:
+            i: Index of first team
+            j: Index of second team
+            score1: Score of first team
+            score2: Score of second team
+            weight: Weight of the game
+        """
+        self._pending.append((i, j, score1 - score2, weight))
         
         # Clear last ratings since we have new data
         self.last_ratings = None
+    
+    def add_games_batch(self, team1_idx, team2_idx, score_diff, weight=1.0):
+        """Add many game results at once.
         
-        self.logger.debug(f"Added game: {team1} {score1} - {score2} {team2} (weight: {weight})")
+        Args:
+            team1_idx: Index (as in self.teams) of each game's first team
+            team2_idx: Index of each game's second team
+            score_diff: First team's score minus second team's, per game
+            weight: Weight of each game, or a single weight for all of them
+        """
+        i = np.asarray(team1_idx, dtype=np.intp)
+        j = np.asarray(team2_idx, dtype=np.intp)
+        if i.size and (min(i.min(), j.min()) < 0 or max(i.max(), j.max()) >= self.n_teams):
+            raise ValueError("Team index out of range")
+        
+        w = np.broadcast_to(np.asarray(weight, dtype=float), i.shape)
+        self._flush_pending()
+        self._scatter_games(i, j, np.asarray(score_diff, dtype=float), w)
+        
+        # Track games played
+        self._count_games(i, j)
+        
+        self.last_ratings = None
+        self.logger.debug(f"Added {i.size} games")
+    
+    def _scatter_games(self, i: np.ndarray, j: np.ndarray, diff: np.ndarray, w: np.ndarray):
+        """Accumulate games into the Massey matrix and point differential vector."""
+        # Duplicate (row, col) entries are summed, so repeated match-ups all count
+        rows = np.concatenate((i, j, i, j))
+        cols = np.concatenate((i, j, j, i))
+        data = np.concatenate((w, w, -w, -w))
+        self.M = self.M + sparse.csr_matrix((data, (rows, cols)), shape=self.M.shape)
+        if self._factor is not None:
+            self._new_games.append((i, j, w))
+        
+        # np.add.at is unbuffered for the same reason
+        np.add.at(self.b, i, diff * w)
+        np.add.at(self.b, j, -diff * w)
+    
+    def _flush_pending(self):
+        """Fold games queued by add_game into M, b and the games played."""
+        if not self._pending:
+            return
+        i, j, diff, w = (np.array(column) for column in zip(*self._pending))
+        self._pending = []
+        self._scatter_games(i, j, diff.astype(float), w.astype(float))
+        self._count_games(i, j)
+    
+    def _count_games(self, i: np.ndarray, j: np.ndarray):
+        """Add games to the games played.
+        
+        New teams are recorded in the order they appeared, each game's first
+        team first, exactly as adding the games one at a time would.
+        
+        Args:
+            i: Index of each game's first team
+            j: Index of each game's second team
+        """
+        order = np.column_stack((i, j)).ravel()
+        _, first = np.unique(order, return_index=True)
+        teams = order[np.sort(first)]
+        self._seen.extend(teams[self._gp[teams] == 0].tolist())
+        self._gp += np.bincount(order, minlength=self.n_teams)
+    
+    @property
+    def games_played(self) -> Dict[str, int]:
+        """Games played by each team that has played, in order of first game."""
+        self._flush_pending()
+        return {self._team_names[idx]: int(self._gp[idx]) for idx in self._seen}
+    
+    def save(self, path: str):
+        """Save the games added so far, for other processes to load.
+        
+        The state is written to the directory path as one .npy file per
+        array. Each file is replaced atomically, so a reader never sees a
+        partly written array.
+        
+        Args:
+            path: Directory to write to, created if missing
+        """
+        self._flush_pending()
+        os.makedirs(path, exist_ok=True)
+        arrays = {
+            'teams': np.array(self._team_names),
+            'M_data': self.M.data,
+            'M_indices': self.M.indices,
+            'M_indptr': self.M.indptr,
+            'b': self.b,
+            'games_played': self._gp,
+            'seen': np.array(self._seen, dtype=np.intp)
+        }
+        for name, array in arrays.items():
+            tmp_path = os.path.join(path, f'{name}.tmp.npy')
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(path, f'{name}.npy'))
+        self.logger.info(f"Saved Massey state to {path}")
+    
+    @classmethod
+    def load(cls, path: str, min_games: int = 3) -> 'MasseyRatings':
+        """Load a system saved with save().
+        
+        The arrays are memory-mapped copy-on-write, so processes loading
+        the same state share its pages, and games added afterwards stay
+        private to the process.
+        
+        Args:
+            path: Directory written by save()
+            min_games: Minimum number of games needed for rating calculation
+            
+        Returns:
+            MasseyRatings with the saved games
+        """
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='c')
+                  for name in ('teams', 'M_data', 'M_indices', 'M_indptr', 'b', 'games_played', 'seen')}
+        massey = cls(arrays['teams'].tolist(), min_games)
+        n = massey.n_teams
+        massey.M = sparse.csr_matrix((arrays['M_data'], arrays['M_indices'], arrays['M_indptr']), shape=(n, n))
+        massey.b = arrays['b']
+        massey._gp = arrays['games_played']
+        massey._seen = arrays['seen'].tolist()
+        return massey
     
     def calculate_ratings(self) -> Dict[str, float]:
         """Calculate the Massey ratings for all teams.
@@ -87,9 +350,12 @@ class MasseyRatings:
         Returns:
             Dict mapping team names to their Massey rating
         """
+        self._flush_pending()
+        
         # Remove teams with insufficient games
-        active_teams = [team for team, games in self.games_played.items() 
-                       if games >= self.min_games]
+        seen = np.array(self._seen, dtype=np.intp)
+        active_indices = seen[self._gp[seen] >= self.min_games].tolist()
+        active_teams = [self._team_names[idx] for idx in active_indices]
         
         self.logger.info(f"Calculating ratings for {len(active_teams)} teams with {self.min_games}+ games")
         
@@ -98,20 +364,13 @@ class MasseyRatings:
             self.last_ratings = {}
             return {}
             
-        # Create submatrix for active teams
-        active_indices = [self.teams[team] for team in active_teams]
-        M_sub = self.M[np.ix_(active_indices, active_indices)]
         b_sub = self.b[active_indices]
-        
-        # Replace last row with constraint that ratings sum to zero
-        n = len(active_teams)
-        if n > 0:
-            M_sub[-1] = np.ones(n)
-            b_sub[-1] = 0
+        # Last row is the constraint that ratings sum to zero
+        b_sub[-1] = 0
         
         try:
             # Solve the system
-            r = linalg.solve(M_sub, b_sub)
+            r = self._solve(active_indices, b_sub)
             
             # Create ratings dictionary
             ratings = {}
@@ -128,6 +387,110 @@ class MasseyRatings:
             self.last_ratings = {}
             return {}
     
+    def _solve(self, active_indices: List[int], b_sub: np.ndarray) -> np.ndarray:
+        """Solve the Massey system for the active teams.
+        
+        Each game adds w * u u^T to M, with u = e_i - e_j, so games added
+        since the last factorization are applied to it as a Woodbury
+        low-rank correction instead of refactorizing. The system is
+        refactorized once MAX_UPDATE_RANK games have accumulated or the
+        set of active teams changes.
+        
+        Args:
+            active_indices: Indices of the teams being rated
+            b_sub: Right-hand side for the active teams
+            
+        Returns:
+            Ratings of the active teams, in active_indices order
+        """
+        key = tuple(active_indices)
+        if self._factor is None or self._factor[0] != key or not self._absorb_new_games():
+            self._factorize(active_indices)
+        
+        r = self._factor[1].solve(b_sub)
+        if self._update_w.size:
+            # (A + U C V^T)^-1 b = y - Z (I + C V^T Z)^-1 C V^T y with y = A^-1 b
+            Z, w = self._update_z, self._update_w
+            if NUMBA_AVAILABLE:
+                capacitance, rhs = woodbury_system_kernel(Z, r, self._update_i, self._update_j, w)
+            else:
+                V = self._incidence(self._update_i, self._update_j, len(r))
+                capacitance = np.eye(w.size) + w[:, None] * (V.T @ Z)
+                rhs = w * (V.T @ r)
+            try:
+                r = r - Z @ np.linalg.solve(capacitance, rhs)
+            except np.linalg.LinAlgError:
+                self._factorize(active_indices)
+                r = self._factor[1].solve(b_sub)
+        return r
+    
+    def _absorb_new_games(self) -> bool:
+        """Turn games added since the factorization into Woodbury terms.
+        
+        Returns:
+            False if the update rank would exceed MAX_UPDATE_RANK
+        """
+        if not self._new_games:
+            return True
+        
+        key = self._factor[0]
+        n = len(key)
+        pos = np.full(self.n_teams, -1, dtype=np.intp)
+        pos[list(key)] = np.arange(n)
+        i, j, w = (np.concatenate(column) for column in zip(*self._new_games))
+        self._new_games = []
+        
+        # Games between two inactive teams (or a team and itself) leave the system unchanged
+        pi, pj = pos[i], pos[j]
+        keep = pi != pj
+        pi, pj, w = pi[keep], pj[keep], w[keep]
+        if self._update_w.size + w.size > self.MAX_UPDATE_RANK:
+            return False
+        
+        # The constraint row is not updated
+        U = self._incidence(pi, pj, n)
+        U[-1] = 0.0
+        
+        self._update_z = np.hstack((self._update_z, self._factor[1].solve(U)))
+        self._update_i = np.concatenate((self._update_i, pi))
+        self._update_j = np.concatenate((self._update_j, pj))
+        self._update_w = np.concatenate((self._update_w, w))
+        return True
+    
+    @staticmethod
+    def _incidence(pos_i: np.ndarray, pos_j: np.ndarray, n: int) -> np.ndarray:
+        """Columns u = e_i - e_j over n teams, skipping positions of -1."""
+        cols = np.arange(len(pos_i))
+        V = np.zeros((n, len(pos_i)))
+        V[pos_i[pos_i >= 0], cols[pos_i >= 0]] = 1.0
+        V[pos_j[pos_j >= 0], cols[pos_j >= 0]] = -1.0
+        return V
+    
+    def _factorize(self, active_indices: List[int]):
+        """LU-factorize the Massey system for the active teams.
+        
+        Args:
+            active_indices: Indices of the teams being rated
+        """
+        # Create submatrix for active teams, replacing the last row with
+        # the constraint that ratings sum to zero
+        n = len(active_indices)
+        M_sub = self.M[active_indices][:, active_indices]
+        M_sub = sparse.vstack([M_sub[:-1], np.ones((1, n))], format='csc')
+        self._factor = None
+        self._new_games = []
+        try:
+            lu = splu(M_sub)
+        except RuntimeError as e:
+            # SuperLU reports an exactly singular matrix as a RuntimeError
+            raise np.linalg.LinAlgError(str(e)) from e
+        
+        self._factor = (tuple(active_indices), lu)
+        self._update_z = np.empty((n, 0))
+        self._update_i = np.empty(0, dtype=np.intp)
+        self._update_j = np.empty(0, dtype=np.intp)
+        self._update_w = np.empty(0)
+    
     def predict_game(self, team1: str, team2: str, home_advantage: float = 3.5) -> Tuple[float, float]:
         """Predict the outcome of a game between two teams.
         
@@ -153,11 +516,46 @@ class MasseyRatings:
         rating_diff = self.last_ratings[team1] - self.last_ratings[team2] + home_advantage
         
         # Convert rating difference to win probability using logistic function
-        win_prob = 1 / (1 + np.exp(-rating_diff * 0.2))  # 0.2 is a scaling factor
+        win_prob = 1.0 / (1.0 + math.exp(-rating_diff * 0.2))  # 0.2 is a scaling factor
         
         self.logger.debug(f"Prediction for {team1} vs {team2}: {win_prob:.2%} win probability, {rating_diff:.1f} point diff")
         return win_prob, rating_diff
     
+    def predict_games(self, pairs: List[Tuple[str, str]],
+                      home_advantage: float = 3.5) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict the outcomes of a slate of games in one pass.
+        
+        Args:
+            pairs: (home team, away team) for each game
+            home_advantage: Points added to each home team's rating
+            
+        Returns:
+            Tuple of arrays (win probability for each home team, predicted
+            point differential); games with an unrated team get 0.5 and 0.0
+            as in predict_game
+        """
+        for team1, team2 in pairs:
+            valid, error = self._validate_teams(team1, team2)
+            if not valid:
+                raise ValueError(error)
+        
+        if not self.last_ratings:
+            self.calculate_ratings()
+        
+        ratings = np.full(self.n_teams, np.nan)
+        for team, rating in (self.last_ratings or {}).items():
+            ratings[self.teams[team]] = rating
+        
+        idx1 = np.fromiter((self.teams[team1] for team1, _ in pairs), dtype=np.intp, count=len(pairs))
+        idx2 = np.fromiter((self.teams[team2] for _, team2 in pairs), dtype=np.intp, count=len(pairs))
+        rating_diff = np.nan_to_num(ratings[idx1] - ratings[idx2] + home_advantage, nan=0.0)
+        
+        # Same logistic as predict_game
+        win_prob = expit(0.2 * rating_diff)
+        
+        self.logger.debug(f"Predicted {len(pairs)} games")
+        return win_prob, rating_diff
+    
     def get_rankings(self) -> pd.DataFrame:
         """Get team rankings based on current ratings.
         
@@ -172,18 +570,20 @@ class MasseyRatings:
             # Return empty DataFrame with correct columns if no ratings
             return pd.DataFrame(columns=['team', 'rating', 'games_played'])
             
-        rankings = []
-        for team, rating in self.last_ratings.items():
-            rankings.append({
-                'team': team,
-                'rating': rating,
-                'games_played': self.games_played[team]
-            })
-            
-        df = pd.DataFrame(rankings)
-        df_sorted = df.sort_values('rating', ascending=False).reset_index(drop=True)
+        n = len(self.last_ratings)
+        names = np.array(list(self.last_ratings), dtype=object)
+        ratings = np.fromiter(self.last_ratings.values(), dtype=np.float64, count=n)
+        games = self._gp[np.fromiter((self.teams[team] for team in names), dtype=np.intp, count=n)]
+        
+        # Stable, so tied teams stay in the order they were rated
+        order = np.argsort(-ratings, kind='stable')
+        df_sorted = pd.DataFrame({
+            'team': names[order],
+            'rating': ratings[order],
+            'games_played': games[order]
+        })
         
-        self.logger.info(f"Generated rankings for {len(df)} teams")
+        self.logger.info(f"Generated rankings for {n} teams")
         self.logger.debug(f"Rankings:\n{df_sorted}")
         
         return df_sorted
@@ -191,9 +591,24 @@ class MasseyRatings:
 class SportsAPI:
     def __init__(self):
         self.config = APIConfig()
-        self.last_request_time = {}
+        # api_type -> monotonic time of its next allowed request, and the
+        # locks queueing async callers for it
+        self._next_allowed = {}
+        self._rate_limit_locks = {}
         self.session = None
+        # Keep-alive session so repeated sync API calls reuse their connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=20)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
         self.user_agent = UserAgent()
+        self._nba_cache = diskcache.Cache(NBA_CACHE_DIR) if diskcache is not None else None
+        self._user_agents = [self.user_agent.random for _ in range(USER_AGENT_POOL_SIZE)]
+        # api_type -> its configured headers, built on first use
+        self._base_headers = {}
+        # URL -> (expiry, ETag, Last-Modified, parsed DataFrame) of scraped
+        # pages, in least to most recently used order
+        self._page_cache = OrderedDict()
         
         # Initialize logging
         logging.basicConfig(
@@ -204,7 +619,7 @@ class SportsAPI:
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self._get_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -212,31 +627,66 @@ class SportsAPI:
         if self.session:
             await self.session.close()
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The shared client session, created on first use.
+        
+        All requests go through one connection pool with cached DNS, so
+        concurrent scrapes of the same host reuse connections.
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT,
+                                             limit_per_host=HTTP_CONNECTIONS_PER_HOST,
+                                             ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+        return self.session
+    
+    def _api_headers(self, api_type: str) -> Dict:
+        """Configured headers for an API, cached; copy before modifying."""
+        headers = self._base_headers.get(api_type)
+        if headers is None:
+            headers = self._base_headers[api_type] = self.config.get_api_headers(api_type)
+        return headers
+    
+    def _request_headers(self, api_type: str) -> Dict:
+        """Headers for an API request: a pooled User-Agent under the API's own headers."""
+        return {'User-Agent': random.choice(self._user_agents), **self._api_headers(api_type)}
+    
     def _handle_rate_limit(self, api_type: str):
-        """Handle rate limiting for specific APIs."""
-        current_time = time.time()
-        last_time = self.last_request_time.get(api_type, 0)
-        min_interval = self.config.RATE_LIMITS[api_type]['min_interval']
+        """Handle rate limiting for specific APIs (blocking; for sync callers)."""
+        delay = self._next_allowed.get(api_type, 0.0) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        
+        self._next_allowed[api_type] = time.monotonic() + self.config.RATE_LIMITS[api_type]['min_interval']
+    
+    async def _handle_rate_limit_async(self, api_type: str):
+        """Handle rate limiting for specific APIs without blocking the event loop.
         
-        if current_time - last_time < min_interval:
-            time.sleep(min_interval - (current_time - last_time))
+        Concurrent callers for the same API queue on a lock and are spaced
+        min_interval apart, while other APIs' requests keep running.
+        """
+        lock = self._rate_limit_locks.get(api_type)
+        if lock is None:
+            lock = self._rate_limit_locks[api_type] = asyncio.Lock()
         
-        self.last_request_time[api_type] = time.time()
+        async with lock:
+            delay = self._next_allowed.get(api_type, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            self._next_allowed[api_type] = time.monotonic() + self.config.RATE_LIMITS[api_type]['min_interval']
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _async_request(self, url: str, api_type: str, params: Dict = None) -> Optional[Dict]:
         """Make an async API request with retry logic."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            
+        session = self._get_session()
+        
         try:
-            self._handle_rate_limit(api_type)
-            headers = {
-                'User-Agent': self.user_agent.random,
-                **self.config.get_api_headers(api_type)
-            }
+            await self._handle_rate_limit_async(api_type)
+            headers = self._request_headers(api_type)
             
-            async with self.session.get(url, headers=headers, params=params) as response:
+            async with session.get(url, headers=headers, params=params) as response:
                 response.raise_for_status()
                 return await response.json()
         except Exception as e:
@@ -248,12 +698,9 @@ class SportsAPI:
         """Make a synchronous API request with retry logic."""
         try:
             self._handle_rate_limit(api_type)
-            headers = {
-                'User-Agent': self.user_agent.random,
-                **self.config.get_api_headers(api_type)
-            }
+            headers = self._request_headers(api_type)
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._http.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             
             return response.json()
@@ -265,14 +712,14 @@ class SportsAPI:
     async def get_nba_data(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
         """Get NBA data from stats.nba.com with async support."""
         try:
-            self._handle_rate_limit("nba_stats")
+            await self._handle_rate_limit_async("nba_stats")
             url = f"https://stats.nba.com/stats/{endpoint}"
             headers = {
-                **self.config.get_api_headers("nba_stats"),
+                **self._api_headers("nba_stats"),
                 'Referer': 'https://www.nba.com'
             }
             
-            async with self.session.get(url, headers=headers, params=params) as response:
+            async with self._get_session().get(url, headers=headers, params=params) as response:
                 response.raise_for_status()
                 return await response.json()
         except Exception as e:
@@ -304,124 +751,9 @@ class SportsAPI:
         """Scrape NHL scores from NHL.com."""
         try:
             url = f"https://www.nhl.com/scores/{date if date else ''}"
-            headers = {
-                'User-Agent': self.user_agent.random,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            async with self.session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                html = await response.text()
-                
-            soup = BeautifulSoup(html, 'lxml')
-            games = []
-            
-            # Try multiple selectors for game items
-            selectors = [
-                '.nhl-scores-page__game',
-                '.nhl-score-card',
-                '.nhl-scores__list .nhl-scores__list-item',
-                '.nhl-scores__game-wrapper',
-                '.nhl-widget-game-card'
-            ]
-            
-            game_items = []
-            for selector in selectors:
-                game_items = soup.select(selector)
-                if game_items:
-                    break
-            
-            if not game_items:
-                # If no games found with regular selectors, try a more general approach
-                game_items = soup.find_all('div', class_=lambda x: x and ('game' in x.lower() or 'score' in x.lower()))
+            headers = {'User-Agent': random.choice(self._user_agents), **SCRAPE_HEADERS}
             
-            for game in game_items:
-                try:
-                    # Try multiple selectors for each piece of data
-                    home_team = None
-                    away_team = None
-                    home_score = None
-                    away_score = None
-                    status = None
-                    
-                    # Home team selectors
-                    for selector in ['.nhl-score-card__team--home .nhl-score-card__team-name',
-                                   '.nhl-scores-page__team--home .nhl-scores-page__team-name',
-                                   '[class*="home"] [class*="team-name"]']:
-                        element = game.select_one(selector)
-                        if element:
-                            home_team = element.text.strip()
-                            break
-                    
-                    # Away team selectors
-                    for selector in ['.nhl-score-card__team--away .nhl-score-card__team-name',
-                                   '.nhl-scores-page__team--away .nhl-scores-page__team-name',
-                                   '[class*="away"] [class*="team-name"]']:
-                        element = game.select_one(selector)
-                        if element:
-                            away_team = element.text.strip()
-                            break
-                    
-                    # Home score selectors
-                    for selector in ['.nhl-score-card__team--home .nhl-score-card__score',
-                                   '.nhl-scores-page__team--home .nhl-scores-page__score',
-                                   '[class*="home"] [class*="score"]']:
-                        element = game.select_one(selector)
-                        if element:
-                            home_score = element.text.strip()
-                            break
-                    
-                    # Away score selectors
-                    for selector in ['.nhl-score-card__team--away .nhl-score-card__score',
-                                   '.nhl-scores-page__team--away .nhl-scores-page__score',
-                                   '[class*="away"] [class*="score"]']:
-                        element = game.select_one(selector)
-                        if element:
-                            away_score = element.text.strip()
-                            break
-                    
-                    # Status selectors
-                    for selector in ['.nhl-score-card__status',
-                                   '.nhl-scores-page__status',
-                                   '[class*="status"]',
-                                   '[class*="state"]']:
-                        element = game.select_one(selector)
-                        if element:
-                            status = element.text.strip()
-                            break
-                    
-                    # Only add game if we found all required data
-                    if all([home_team, away_team, home_score, away_score, status]):
-                        game_data = {
-                            'home_team': home_team,
-                            'away_team': away_team,
-                            'home_score': home_score,
-                            'away_score': away_score,
-                            'status': status
-                        }
-                        games.append(game_data)
-                except (AttributeError, ValueError) as e:
-                    self.logger.warning(f"Error parsing game data: {str(e)}")
-                    continue
-            
-            if not games:
-                self.logger.warning("No NHL games found")
-                # For testing purposes, create a sample game
-                if 'test' in str(url):
-                    games.append({
-                        'home_team': 'Test Home',
-                        'away_team': 'Test Away',
-                        'home_score': '0',
-                        'away_score': '0',
-                        'status': 'Preview'
-                    })
-                # Return empty DataFrame with correct columns
-                return pd.DataFrame(columns=['home_team', 'away_team', 'home_score', 'away_score', 'status'])
-            
-            return pd.DataFrame(games)
+            return await self._scrape_page(url, headers, lambda root: self._parse_nhl_scores(root, url))
         except Exception as e:
             self.logger.error(f"Error scraping NHL scores: {str(e)}")
             return None
@@ -441,66 +773,146 @@ class SportsAPI:
                 raise ValueError(f"Invalid sport: {sport}")
             
             url = f"https://www.espn.com/{sport_path}"
-            headers = {
-                'User-Agent': self.user_agent.random,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            async with self.session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                html = await response.text()
-            
-            soup = BeautifulSoup(html, 'lxml')
-            
-            # Try different selectors for odds tables
-            odds_tables = []
-            selectors = [
-                'table.odds-table',
-                'table.Table',
-                'div[data-type="odds"] table',
-                'div.odds-container table'
-            ]
-            
-            for selector in selectors:
-                tables = soup.select(selector)
-                if tables:
-                    odds_tables.extend(tables)
-                    break
-            
-            if not odds_tables:
-                self.logger.warning(f"No odds tables found for {sport}")
-                # Return empty DataFrame with basic columns
-                return pd.DataFrame(columns=['team', 'spread', 'moneyline', 'total', 'sport'])
+            headers = {'User-Agent': random.choice(self._user_agents), **SCRAPE_HEADERS}
             
-            # Parse tables into DataFrames
-            dfs = []
-            for table in odds_tables:
-                try:
-                    df = pd.read_html(str(table))[0]
-                    df['sport'] = sport
-                    dfs.append(df)
-                except Exception as e:
-                    self.logger.warning(f"Error parsing odds table: {str(e)}")
-                    continue
-            
-            if not dfs:
-                self.logger.warning(f"No valid odds data found for {sport}")
-                return pd.DataFrame(columns=['team', 'spread', 'moneyline', 'total', 'sport'])
-            
-            # Combine all DataFrames
-            result = pd.concat(dfs, ignore_index=True)
-            
-            # Clean up column names
-            result.columns = result.columns.str.lower().str.replace(' ', '_')
-            
-            return result
+            return await self._scrape_page(url, headers, lambda root: self._parse_espn_odds(root, sport))
         except Exception as e:
             self.logger.error(f"Error scraping ESPN odds for {sport}: {str(e)}")
             return None
     
+    async def _scrape_page(self, url: str, headers: Dict, parse) -> pd.DataFrame:
+        """Fetch and parse a scraped page, reusing recent results.
+        
+        A parsed page is reused for PAGE_CACHE_TTL seconds. After that the
+        page is re-requested conditionally on its ETag/Last-Modified, and a
+        304 Not Modified keeps the previous parse. Only the PAGE_CACHE_SIZE
+        most recently used pages are kept.
+        
+        Args:
+            url: Page URL (including any date or sport)
+            headers: Request headers
+            parse: Function from the page's parsed root element to a DataFrame
+            
+        Returns:
+            A copy of the parsed DataFrame
+        """
+        now = time.monotonic()
+        entry = self._page_cache.get(url)
+        if entry is not None:
+            self._page_cache.move_to_end(url)
+            if entry[0] > now:
+                return entry[3].copy()
+        
+        headers = dict(headers)
+        if entry is not None:
+            if entry[1]:
+                headers['If-None-Match'] = entry[1]
+            if entry[2]:
+                headers['If-Modified-Since'] = entry[2]
+        
+        async with self._get_session().get(url, headers=headers) as response:
+            if response.status == 304 and entry is not None:
+                etag, last_modified, result = entry[1], entry[2], entry[3]
+            else:
+                response.raise_for_status()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                result = None
+                
+                # Parse the page as it streams in instead of buffering its text
+                parser = lxml_html.HTMLParser(encoding=response.charset or 'utf-8')
+                async for chunk in response.content.iter_chunked(PAGE_CHUNK_SIZE):
+                    parser.feed(chunk)
+                try:
+                    root = parser.close()
+                except etree.XMLSyntaxError:
+                    # Nothing was received
+                    root = None
+        
+        if result is None:
+            if root is None:
+                root = lxml_html.document_fromstring('<html></html>')
+            result = parse(root)
+        self._page_cache[url] = (now + PAGE_CACHE_TTL, etag, last_modified, result)
+        self._page_cache.move_to_end(url)
+        while len(self._page_cache) > PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+        return result.copy()
+    
+    def _parse_nhl_scores(self, root: lxml_html.HtmlElement, url: str) -> pd.DataFrame:
+        """Games on an NHL.com scores page."""
+        games = []
+        
+        # Try each layout's game items, then the general fallback
+        game_items = []
+        for path in _NHL_GAME_PATHS:
+            game_items = path(root)
+            if game_items:
+                break
+        
+        if not game_items:
+            game_items = _NHL_GAME_FALLBACK(root)
+        
+        for game in game_items:
+            game_data = {field: text(game, game=game).strip() for field, text in _NHL_FIELD_TEXT.items()}
+            
+            # Only add game if we found all required data
+            if all(game_data.values()):
+                games.append(game_data)
+        
+        if not games:
+            self.logger.warning("No NHL games found")
+            # For testing purposes, create a sample game
+            if 'test' in str(url):
+                games.append({
+                    'home_team': 'Test Home',
+                    'away_team': 'Test Away',
+                    'home_score': '0',
+                    'away_score': '0',
+                    'status': 'Preview'
+                })
+            # Return empty DataFrame with correct columns
+            return pd.DataFrame(columns=['home_team', 'away_team', 'home_score', 'away_score', 'status'])
+        
+        return pd.DataFrame(games)
+    
+    def _parse_espn_odds(self, root: lxml_html.HtmlElement, sport: str) -> pd.DataFrame:
+        """Odds tables on an ESPN lines page."""
+        # Tables of the first layout that matches
+        odds_tables = []
+        for path in _ESPN_TABLE_PATHS:
+            odds_tables = path(root)
+            if odds_tables:
+                break
+        
+        if not odds_tables:
+            self.logger.warning(f"No odds tables found for {sport}")
+            # Return empty DataFrame with basic columns
+            return pd.DataFrame(columns=['team', 'spread', 'moneyline', 'total', 'sport'])
+        
+        # Mark the chosen tables so pandas reads all of them in one pass;
+        # tables without data are skipped
+        for table in odds_tables:
+            table.set('data-odds-table', '1')
+        try:
+            dfs = pd.read_html(StringIO(lxml_html.tostring(root, encoding='unicode')),
+                               attrs={'data-odds-table': '1'}, flavor='lxml')
+        except ValueError as e:
+            self.logger.warning(f"Error parsing odds tables: {str(e)}")
+            dfs = []
+        
+        if not dfs:
+            self.logger.warning(f"No valid odds data found for {sport}")
+            return pd.DataFrame(columns=['team', 'spread', 'moneyline', 'total', 'sport'])
+        
+        # Combine all DataFrames
+        result = pd.concat([df.assign(sport=sport) for df in dfs], ignore_index=True)
+        
+        # Clean up column names
+        result.columns = result.columns.str.lower().str.replace(' ', '_')
+        
+        return result
+    
     async def get_all_odds(self) -> Dict[str, pd.DataFrame]:
         """Get odds data for all supported sports."""
         tasks = []
@@ -514,8 +926,33 @@ class SportsAPI:
                 if not isinstance(result, Exception) and result is not None}
     
     # NBA Stats API Methods using nba_api package
+    def _nba_cached(self, key: Tuple, expire: Optional[int], fetch):
+        """Serve an nba_api result from the disk cache, fetching it on a miss.
+        
+        Failed fetches (None or empty) are not cached. Without diskcache
+        installed every call fetches.
+        
+        Args:
+            key: Cache key, the method name plus its arguments
+            expire: Seconds to keep the result, None for no expiry
+            fetch: Function performing the request
+        """
+        if self._nba_cache is None:
+            return fetch()
+        
+        result = self._nba_cache.get(key)
+        if result is None:
+            result = fetch()
+            if result:
+                self._nba_cache.set(key, result, expire=expire)
+        return result
+    
     def get_nba_scoreboard(self, game_date: str = None) -> Optional[Dict]:
-        """Get NBA scoreboard data."""
+        """Get NBA scoreboard data (cached on disk; past dates never expire)."""
+        return self._nba_cached(("scoreboard", game_date), _nba_date_expiry(game_date),
+                                lambda: self._fetch_nba_scoreboard(game_date))
+    
+    def _fetch_nba_scoreboard(self, game_date: Optional[str]) -> Optional[Dict]:
         try:
             self._handle_rate_limit("nba_stats")
             scoreboard = scoreboardv2.ScoreboardV2(
@@ -537,7 +974,11 @@ class SportsAPI:
             return None
     
     def get_nba_player_stats(self, season: str = "2023-24") -> Optional[Dict]:
-        """Get NBA player statistics using nba_api package."""
+        """Get NBA player statistics using nba_api package (cached on disk)."""
+        return self._nba_cached(("player_stats", season), _nba_season_expiry(season),
+                                lambda: self._fetch_nba_player_stats(season))
+    
+    def _fetch_nba_player_stats(self, season: str) -> Optional[Dict]:
         try:
             self._handle_rate_limit("nba_stats")
             game_finder = leaguegamefinder.LeagueGameFinder(
@@ -599,12 +1040,12 @@ class SportsAPI:
             url += f"/_/week/{week}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers={"User-Agent": self.config.get_api_headers("")["User-Agent"]}) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return self._parse_espn_scores(html)
-                    return None
+            headers = {'User-Agent': random.choice(self._user_agents), **SCRAPE_HEADERS}
+            async with self._get_session().get(url, headers=headers) as response:
+                if response.status == 200:
+                    html = await response.text()
+                    return self._parse_espn_scores(html)
+                return None
         except Exception as e:
             self.logger.error(f"Error scraping NFL scores: {str(e)}")
             return None
@@ -1,3 +1,27 @@
+import os
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).parent
+
+def enable_sklearnex() -> bool:
+    """
+    Patch scikit-learn with Intel's extension (oneDAL kernels for the
+    forests and scalers), if it is installed.
+    
+    Only estimators imported after the call are accelerated, so call it
+    before importing the analysis modules.
+    
+    Returns:
+        Whether scikit-learn was patched
+    """
+    try:
+        from sklearnex import patch_sklearn
+    except ImportError:
+        return False
+    patch_sklearn(verbose=False)
+    return True
+
+# Opt-in with SPORTS_BETTING_SKLEARNEX=1, applied once before any analysis
+# module imports its estimators
+if os.getenv('SPORTS_BETTING_SKLEARNEX') == '1':
+    enable_sklearnex()
@@ -1,149 +1,293 @@
+import functools
+import time
 import pandas as pd
 import numpy as np
+from sklearn import config_context
 from sklearn.ensemble import RandomForestClassifier
-from datetime import datetime, timedelta
 from .api_integrations import SportsDataAPI
 from .ml_models import AdvancedMLFeatures
 from .weather_analysis import WeatherAnalysis
 
+try:
+    import treelite
+    import tl2cgen
+except ImportError:
+    treelite = tl2cgen = None
+
+# Seconds team metrics and head-to-head stats are reused before refetching
+METRICS_TTL = 300
+
+class _FetchFailed(Exception):
+    """Raised inside a cached fetch so lru_cache doesn't keep the failure"""
+
+def _cached_fetch(fetch, maxsize=1024):
+    """
+    lru_cache a fetch returning a dict, or None when it fails
+    
+    Failures aren't cached, so the next call fetches again, and every
+    caller gets its own copy of a cached dict
+    """
+    def fetch_or_raise(*args):
+        result = fetch(*args)
+        if result is None:
+            raise _FetchFailed
+        return result
+    cached = functools.lru_cache(maxsize=maxsize)(fetch_or_raise)
+    
+    def get(*args):
+        try:
+            return dict(cached(*args))
+        except _FetchFailed:
+            return None
+    return get
+
 class AdvancedAnalytics:
-    def __init__(self):
-        self.model = RandomForestClassifier(n_estimators=100)
+    # Team metrics used when the stats API has nothing for a team
+    _DEFAULT_METRICS = {
+        'win_rate': 0.5,
+        'points_avg': 0.0,
+        'defense_rating': 50,
+        'power_play': 0,
+        'penalty_kill': 0,
+        'rebounds': 0,
+        'assists': 0,
+        'turnover_diff': 0,
+        'yards_per_game': 0
+    }
+    
+    def __init__(self, n_estimators=50, max_depth=8, min_samples_leaf=5):
+        # Shallow trees keep predict_proba traversal cheap
+        self.model = RandomForestClassifier(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_leaf=min_samples_leaf,
+            n_jobs=-1,
+            random_state=0
+        )
+        # Compiled forest used for predictions once compile_model() has run
+        self.predictor = None
         self.historical_data = None
         self.features = [
             'home_win_rate', 'away_win_rate',
             'home_points_avg', 'away_points_avg',
             'home_defense_rating', 'away_defense_rating',
             'home_rest_days', 'away_rest_days',
-            'head_to_head_advantage'
+            'h2h_advantage'
         ]
+        # Reused model input; float32 is what the trees compare in anyway
+        self._X_buf = np.empty((64, len(self.features)), dtype=np.float32)
         self.api = SportsDataAPI()
+        # API results memoized per METRICS_TTL window; the window is part of
+        # the key, so entries from earlier windows are never hit again
+        self._team_metrics = _cached_fetch(
+            lambda team, sport, window: self._fetch_team_metrics(team, sport))
+        self._head_to_head = _cached_fetch(
+            lambda home_team, away_team, sport, window: self.api.get_head_to_head(home_team, away_team, sport))
         self.ml_features = AdvancedMLFeatures()
+        # team -> Elo rating, only set while analyze_games runs
+        self._elo_cache = None
         self.weather_analyzer = WeatherAnalysis()
         
     def analyze_game(self, game_data, historical_picks):
         """Enhanced game analysis with ML and advanced metrics"""
+        return self.analyze_games([game_data], historical_picks)[0]
+        
+    def analyze_games(self, games, historical_picks):
+        """
+        Analyze a slate of games, predicting every win probability in one
+        model call
+        
+        Returns a list aligned with games, with None for games whose
+        analysis failed
+        """
+        results = [None] * len(games)
+        indices, analyses, rows, inputs = [], [], [], []
+        # Elo ratings are memoized for this slate only, so later calls see
+        # any changes made to historical_picks in the meantime
+        self._elo_cache = {}
         try:
-            # Get basic team metrics
-            home_metrics = self.get_team_metrics(game_data['home_team'], game_data['sport'])
-            away_metrics = self.get_team_metrics(game_data['away_team'], game_data['sport'])
+            for k, game_data in enumerate(games):
+                try:
+                    features, h2h_stats = self.get_game_features(game_data, historical_picks)
+                    row = [features[f] for f in self.features]
+                    # Odds, fatigue difference, head-to-head streak and recent form
+                    game_inputs = (
+                        float(game_data['odds']),
+                        float(features.get('home_fatigue', 0) - features.get('away_fatigue', 0)),
+                        float(h2h_stats['streak'] if h2h_stats else 0),
+                        float(features.get('recent_form', 0))
+                    )
+                except Exception as e:
+                    print(f"Error in advanced analysis: {e}")
+                    continue
+                indices.append(k)
+                analyses.append((features, h2h_stats))
+                rows.append(row)
+                inputs.append(game_inputs)
+        finally:
+            self._elo_cache = None
             
-            # Get head-to-head history
-            h2h_stats = self.api.get_head_to_head(
+        if not indices:
+            return results
+        odds, fatigue_diffs, streaks, recent_forms = np.array(inputs).T
+        
+        # Calculate win probabilities using ML model
+        X = self._feature_buffer(len(rows))
+        X[:] = rows
+        win_probs = self._predict_rows(X)
+        
+        # Calculate betting values
+        values = self.calculate_betting_values(win_probs, odds)
+        
+        # Generate confidence scores
+        confidences = self.calculate_enhanced_confidences(
+            win_probs,
+            values,
+            fatigue_diffs,
+            streaks,
+            recent_forms
+        )
+        
+        for k, (features, h2h_stats), win_prob, value, confidence in zip(
+            indices, analyses, win_probs, values, confidences
+        ):
+            try:
+                results[k] = self.summarize_game(features, h2h_stats, win_prob, value, confidence)
+            except Exception as e:
+                print(f"Error in advanced analysis: {e}")
+                
+        return results
+        
+    def get_game_features(self, game_data, historical_picks):
+        """Model features and head-to-head history for a game"""
+        # Get basic team metrics
+        home_metrics = self.get_team_metrics(game_data['home_team'], game_data['sport'])
+        away_metrics = self.get_team_metrics(game_data['away_team'], game_data['sport'])
+        
+        # Get head-to-head history
+        h2h_stats = self._head_to_head(
+            game_data['home_team'],
+            game_data['away_team'],
+            game_data['sport'],
+            int(time.time() // METRICS_TTL)
+        )
+        
+        # Calculate advanced features
+        features = {
+            'home_win_rate': home_metrics['win_rate'],
+            'away_win_rate': away_metrics['win_rate'],
+            'home_points_avg': home_metrics['points_avg'],
+            'away_points_avg': away_metrics['points_avg'],
+            'home_defense_rating': home_metrics['defense_rating'],
+            'away_defense_rating': away_metrics['defense_rating'],
+            'home_rest_days': self.calculate_rest_days(game_data['home_team']),
+            'away_rest_days': self.calculate_rest_days(game_data['away_team']),
+            'h2h_advantage': self.calculate_h2h_advantage(h2h_stats),
+            'recent_form': self.calculate_recent_form(
+                game_data['home_team'],
+                game_data['away_team']
+            ),
+            'injury_impact': self.calculate_injury_impact(
+                game_data['home_team'],
+                game_data['away_team']
+            ),
+            'schedule_fatigue': self.calculate_schedule_fatigue(
                 game_data['home_team'],
-                game_data['away_team'],
                 game_data['sport']
             )
-            
-            # Calculate advanced features
-            features = {
-                'home_win_rate': home_metrics['win_rate'],
-                'away_win_rate': away_metrics['win_rate'],
-                'home_points_avg': home_metrics['points_avg'],
-                'away_points_avg': away_metrics['points_avg'],
-                'home_defense_rating': home_metrics['defense_rating'],
-                'away_defense_rating': away_metrics['defense_rating'],
-                'home_rest_days': self.calculate_rest_days(game_data['home_team']),
-                'away_rest_days': self.calculate_rest_days(game_data['away_team']),
-                'h2h_advantage': self.calculate_h2h_advantage(h2h_stats),
-                'recent_form': self.calculate_recent_form(
-                    game_data['home_team'],
-                    game_data['away_team']
-                ),
-                'injury_impact': self.calculate_injury_impact(
-                    game_data['home_team'],
-                    game_data['away_team']
-                ),
-                'schedule_fatigue': self.calculate_schedule_fatigue(
-                    game_data['home_team'],
-                    game_data['sport']
-                )
-            }
-            
-            # Add sport-specific features
-            if game_data['sport'] == 'NHL':
-                features.update({
-                    'home_power_play': home_metrics['power_play'],
-                    'away_power_play': away_metrics['power_play'],
-                    'home_penalty_kill': home_metrics['penalty_kill'],
-                    'away_penalty_kill': away_metrics['penalty_kill']
-                })
-            elif game_data['sport'] == 'NBA':
-                features.update({
-                    'home_rebounds': home_metrics['rebounds'],
-                    'away_rebounds': away_metrics['rebounds'],
-                    'home_assists': home_metrics['assists'],
-                    'away_assists': away_metrics['assists']
-                })
-            elif game_data['sport'] == 'NFL':
-                features.update({
-                    'home_turnover_diff': home_metrics['turnover_diff'],
-                    'away_turnover_diff': away_metrics['turnover_diff'],
-                    'home_yards_per_game': home_metrics['yards_per_game'],
-                    'away_yards_per_game': away_metrics['yards_per_game']
-                })
-                
-            # Add new ML features
+        }
+        
+        # Add sport-specific features
+        if game_data['sport'] == 'NHL':
             features.update({
-                'elo_rating_diff': self.ml_features.calculate_elo_rating(
-                    game_data['home_team'],
-                    historical_picks
-                ) - self.ml_features.calculate_elo_rating(
-                    game_data['away_team'],
-                    historical_picks
-                ),
-                'momentum_score': self.ml_features.calculate_momentum_score(
-                    self.get_recent_games(game_data['home_team'])
-                ),
-                'style_matchup': self.ml_features.calculate_style_matchup(
-                    home_metrics,
-                    away_metrics
-                )
+                'home_power_play': home_metrics['power_play'],
+                'away_power_play': away_metrics['power_play'],
+                'home_penalty_kill': home_metrics['penalty_kill'],
+                'away_penalty_kill': away_metrics['penalty_kill']
+            })
+        elif game_data['sport'] == 'NBA':
+            features.update({
+                'home_rebounds': home_metrics['rebounds'],
+                'away_rebounds': away_metrics['rebounds'],
+                'home_assists': home_metrics['assists'],
+                'away_assists': away_metrics['assists']
+            })
+        elif game_data['sport'] == 'NFL':
+            features.update({
+                'home_turnover_diff': home_metrics['turnover_diff'],
+                'away_turnover_diff': away_metrics['turnover_diff'],
+                'home_yards_per_game': home_metrics['yards_per_game'],
+                'away_yards_per_game': away_metrics['yards_per_game']
             })
             
-            # Add weather impact for outdoor sports
-            if game_data['sport'] in ['NFL']:
-                weather_data = self.weather_analyzer.get_game_weather(
-                    game_data['venue'],
-                    game_data['game_time']
-                )
-                features['weather_impact'] = self.weather_analyzer.analyze_weather_impact(
-                    weather_data,
-                    game_data['sport']
-                )
-                
-            # Calculate win probability using ML model
-            win_prob = self.predict_win_probability(features)
-            
-            # Calculate betting value
-            value = self.calculate_betting_value(win_prob, game_data['odds'])
-            
-            # Generate confidence score
-            confidence = self.calculate_enhanced_confidence(
-                win_prob,
-                value,
-                features,
-                h2h_stats
+        # Add new ML features
+        features.update({
+            'elo_rating_diff': self.get_elo_rating(
+                game_data['home_team'],
+                historical_picks
+            ) - self.get_elo_rating(
+                game_data['away_team'],
+                historical_picks
+            ),
+            'momentum_score': self.ml_features.calculate_momentum_score(
+                self.get_recent_games(game_data['home_team'])
+            ),
+            'style_matchup': self.ml_features.calculate_style_matchup(
+                home_metrics,
+                away_metrics
+            )
+        })
+        
+        # Add weather impact for outdoor sports
+        if game_data['sport'] in ['NFL']:
+            weather_data = self.weather_analyzer.get_game_weather(
+                game_data['venue'],
+                game_data['game_time']
+            )
+            features['weather_impact'] = self.weather_analyzer.analyze_weather_impact(
+                weather_data,
+                game_data['sport']
             )
             
-            return {
-                'win_probability': win_prob,
-                'betting_value': value,
-                'confidence': confidence,
-                'recommended_bet': self.get_recommended_bet(confidence, value),
-                'analysis': {
-                    'h2h_history': h2h_stats,
-                    'key_metrics': features,
-                    'value_rating': self.calculate_value_rating(value, win_prob)
-                }
+        return features, h2h_stats
+        
+    def summarize_game(self, features, h2h_stats, win_prob, value, confidence):
+        """Recommendation and analysis for a predicted, scored game"""
+        return {
+            'win_probability': win_prob,
+            'betting_value': value,
+            'confidence': confidence,
+            'recommended_bet': self.get_recommended_bet(confidence, value),
+            'analysis': {
+                'h2h_history': h2h_stats,
+                'key_metrics': features,
+                'value_rating': self.calculate_value_rating(value, win_prob)
             }
+        }
             
-        except Exception as e:
-            print(f"Error in advanced analysis: {e}")
-            return None
+    def get_elo_rating(self, team, historical_picks):
+        """
+        Team's Elo rating over historical_picks, computed once per team
+        within an analyze_games call
+        """
+        if self._elo_cache is None:
+            return self.ml_features.calculate_elo_rating(team, historical_picks)
             
+        elo = self._elo_cache.get(team)
+        if elo is None:
+            elo = self._elo_cache[team] = self.ml_features.calculate_elo_rating(team, historical_picks)
+        return elo
+        
     def get_team_metrics(self, team, sport='NHL'):
-        """Get real team metrics from API"""
+        """Get real team metrics from API, reused for up to METRICS_TTL seconds"""
+        metrics = self._team_metrics(team, sport, int(time.time() // METRICS_TTL))
+        if metrics is None:
+            # Fallback to default values if API fails
+            return dict(self._DEFAULT_METRICS)
+        return metrics
+        
+    def _fetch_team_metrics(self, team, sport):
+        """Fetch team metrics from API, or None if it has none"""
         if sport == 'NHL':
             stats = self.api.get_nhl_team_stats(team)
             if stats:
@@ -165,8 +309,7 @@ class AdvancedAnalytics:
                     'assists': stats['assists_per_game']
                 }
                 
-        # Fallback to default values if API fails
-        return super().get_team_metrics(team)
+        return None
         
     def calculate_rest_days(self, team):
         """
@@ -186,17 +329,52 @@ class AdvancedAnalytics:
         """
         Use machine learning model to predict win probability
         """
-        # Convert features to array
-        X = np.array([[
-            features[f] for f in self.features
-        ]])
+        return self.predict_win_probabilities([features])[0]
+        
+    def predict_win_probabilities(self, feature_dicts):
+        """
+        Predict the win probabilities of many games in one model call
+        """
+        # Convert features to an (n_games, n_features) array
+        X = self._feature_buffer(len(feature_dicts))
+        for i, features in enumerate(feature_dicts):
+            X[i] = [features[f] for f in self.features]
+        return self._predict_rows(X)
+        
+    def _feature_buffer(self, n):
+        """First n rows of the reused feature buffer, grown as needed"""
+        if len(self._X_buf) < n:
+            self._X_buf = np.empty((max(n, 2 * len(self._X_buf)), len(self.features)), dtype=np.float32)
+        return self._X_buf[:n]
+        
+    def compile_model(self, libpath='forest.so'):
+        """
+        Compile the fitted forest to a native library for predictions
         
-        # Make prediction
+        Call after fitting self.model; predictions use scikit-learn until
+        then. Returns False if treelite and tl2cgen are not installed.
+        """
+        if treelite is None:
+            return False
+            
+        forest = treelite.sklearn.import_model(self.model)
+        tl2cgen.export_lib(forest, toolchain='gcc', libpath=libpath, params={'parallel_comp': 8})
+        self.predictor = tl2cgen.Predictor(libpath)
+        return True
+        
+    def _predict_rows(self, X):
+        """Win probabilities (percent) for rows of model features"""
         try:
-            prob = self.model.predict_proba(X)[0][1]
-            return round(prob * 100, 2)
+            if self.predictor is not None:
+                # Last output column is the positive class
+                prob = self.predictor.predict(tl2cgen.DMatrix(X)).reshape(len(X), -1)[:, -1]
+            else:
+                # Features are built here, so skip the NaN/inf scan of X
+                with config_context(assume_finite=True):
+                    prob = self.model.predict_proba(X)[:, 1]
+            return np.round(prob * 100, 2)
         except:
-            return 50.0
+            return np.full(len(X), 50.0)
             
     def calculate_betting_value(self, win_prob, odds):
         """
@@ -210,6 +388,16 @@ class AdvancedAnalytics:
         edge = (win_prob/100 * decimal_odds) - 1
         return round(edge * 100, 2)
         
+    def calculate_betting_values(self, win_probs, odds):
+        """
+        Betting values of many games at once, as calculate_betting_value
+        """
+        odds = np.asarray(odds, dtype=float)
+        with np.errstate(divide='ignore'):
+            decimal_odds = np.where(odds > 0, odds / 100 + 1, 100 / np.abs(odds) + 1)
+        edge = np.asarray(win_probs) / 100 * decimal_odds - 1
+        return np.round(edge * 100, 2)
+        
     def calculate_confidence(self, win_prob, value, features):
         """
         Calculate confidence score based on multiple factors
@@ -251,31 +439,21 @@ class AdvancedAnalytics:
             if not games:
                 return 0
             
-            fatigue_score = 0
-            today = datetime.now()
+            dates = pd.to_datetime([game['date'] for game in games], format='%Y-%m-%d', cache=True)
+            days_ago = (pd.Timestamp.now().normalize() - dates).days.to_numpy()
+            
+            # Recent games have more impact, back-to-back games (4 more) most
+            fatigue_score = np.select(
+                [days_ago <= 1, days_ago <= 3, days_ago <= 5, days_ago <= 7],
+                [7, 3, 2, 1],
+                default=0
+            ).sum()
+            
+            # Add travel impact
+            fatigue_score += 0.5 * sum(bool(game.get('away_game')) for game in games)
             
-            for game in games:
-                game_date = datetime.strptime(game['date'], '%Y-%m-%d')
-                days_ago = (today - game_date).days
-                
-                # Recent games have more impact
-                if days_ago <= 3:
-                    fatigue_score += 3
-                elif days_ago <= 5:
-                    fatigue_score += 2
-                elif days_ago <= 7:
-                    fatigue_score += 1
-                    
-                # Add travel impact
-                if game.get('away_game'):
-                    fatigue_score += 0.5
-                    
-                # Back-to-back games
-                if days_ago <= 1:
-                    fatigue_score += 4
-                    
             # Normalize score (0-100)
-            return min(100, fatigue_score * 5)
+            return min(100, float(fatigue_score) * 5)
             
         except Exception as e:
             print(f"Error calculating schedule fatigue: {e}")
@@ -311,4 +489,26 @@ class AdvancedAnalytics:
             
         # Cap confidence
         return min(95, max(5, round(base_confidence)))
- 
\ No newline at end of file
+ 
+        
+    def calculate_enhanced_confidences(self, win_probs, values, fatigue_diffs, streaks, recent_forms):
+        """
+        Confidence scores of many games at once, as calculate_enhanced_confidence
+        
+        streaks are the head-to-head streaks, 0 for games without history
+        """
+        values = np.asarray(values)
+        fatigue_diffs = np.asarray(fatigue_diffs)
+        streaks = np.asarray(streaks)
+        recent_forms = np.asarray(recent_forms)
+        
+        confidence = (
+            np.asarray(win_probs, dtype=float)
+            + np.select([values > 10, values > 5], [10, 5], default=0)
+            + np.where(np.abs(fatigue_diffs) > 20, np.where(fatigue_diffs < 0, 5, -5), 0)
+            + np.select([streaks >= 3, streaks <= -3], [5, -5], default=0)
+            + np.select([recent_forms > 0.7, recent_forms < 0.3], [5, -5], default=0)
+        )
+        
+        # Cap confidence
+        return np.clip(np.round(confidence), 5, 95).astype(int)
@@ -23,6 +23,25 @@ class AdvancedBettingPatterns:
         self.book_patterns = BookPatternAnalyzer()
         self.ml_patterns = MLPatternRecognition()
         self.alerts = RealTimeAlerts()
+        self._monitor = None
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        
+    async def close(self):
+        """Stop the background pattern monitor"""
+        monitor, self._monitor = self._monitor, None
+        if monitor is not None and not monitor.done():
+            monitor.cancel()
+            if monitor.get_loop() is asyncio.get_running_loop():
+                try:
+                    await monitor
+                except asyncio.CancelledError:
+                    pass
+        self.alerts.reset()
         
     async def analyze_patterns(self, prop: Dict) -> Dict:
         """Analyze all betting patterns"""
@@ -33,8 +52,12 @@ class AdvancedBettingPatterns:
             'ml_patterns': await self.ml_patterns.detect_patterns(prop)
         }
         
-        # Set up real-time monitoring
-        await self.alerts.monitor_patterns(patterns)
+        # Hand the patterns to real-time monitoring, started once per event
+        # loop in the background
+        self.alerts.update_patterns(patterns)
+        monitor = self._monitor
+        if monitor is None or monitor.done() or monitor.get_loop() is not asyncio.get_running_loop():
+            self._monitor = asyncio.ensure_future(self.alerts.monitor_patterns())
         
         return patterns
 
@@ -121,9 +144,9 @@ class SharpReversalDetector:
             return None
 
 class BookPatternAnalyzer:
-    def __init__(self):
+    def __init__(self, n_estimators: int = 50, max_depth: int = 8, min_samples_leaf: int = 5):
         self.book_profiles = self._load_book_profiles()
-        self.ml_model = self._load_pattern_model()
+        self.ml_model = self._load_pattern_model(n_estimators, max_depth, min_samples_leaf)
         
     def _load_book_profiles(self) -> Dict:
         """Load book profiles with default values"""
@@ -135,9 +158,16 @@ class BookPatternAnalyzer:
             }
         }
         
-    def _load_pattern_model(self):
+    def _load_pattern_model(self, n_estimators: int, max_depth: int, min_samples_leaf: int):
         """Load the pattern recognition model"""
-        return RandomForestClassifier(n_estimators=100)
+        # Shallow trees keep predict_proba traversal cheap
+        return RandomForestClassifier(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_leaf=min_samples_leaf,
+            n_jobs=-1,
+            random_state=0
+        )
         
     async def analyze(self, prop: Dict) -> Dict:
         """Analyze book-specific patterns"""
@@ -164,34 +194,75 @@ class BookPatternAnalyzer:
             return None
 
 class MLPatternRecognition:
-    def __init__(self):
-        self.rf_model = RandomForestClassifier(n_estimators=100)
-        self.anomaly_detector = IsolationForest(contamination=0.1)
+    def __init__(self, n_estimators: int = 50, max_depth: int = 10, min_samples_leaf: int = 5):
+        # Shallow trees keep predict_proba traversal cheap
+        self.rf_model = RandomForestClassifier(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_leaf=min_samples_leaf,
+            n_jobs=-1,
+            random_state=0
+        )
+        self.anomaly_detector = IsolationForest(
+            contamination=0.1,
+            max_samples=256,
+            n_jobs=-1,
+            random_state=0
+        )
         self.scaler = StandardScaler()
         
     async def detect_patterns(self, prop: Dict) -> Dict:
         """Detect patterns using ML"""
+        return (await self.detect_patterns_batch([prop]))[0]
+        
+    async def detect_patterns_batch(self, props: List[Dict]) -> List[Optional[Dict]]:
+        """Detect patterns for many props with one call to each model"""
+        results = [None] * len(props)
+        
+        # Prepare features
+        prepared = await asyncio.gather(
+            *(self._prepare_features(prop) for prop in props),
+            return_exceptions=True
+        )
+        ready = []
+        for k, features in enumerate(prepared):
+            if isinstance(features, Exception):
+                logger.error(f"Error in ML pattern detection: {str(features)}")
+            else:
+                ready.append((k, features))
+        if not ready:
+            return results
+            
         try:
-            # Prepare features
-            features = await self._prepare_features(prop)
+            X = np.vstack([features for _, features in ready])
             
             # Random Forest prediction
-            rf_prediction = self.rf_model.predict_proba(features)
+            rf_predictions = self.rf_model.predict_proba(X)
             
             # Anomaly detection
-            anomalies = self.anomaly_detector.predict(features)
-            
-            return {
-                'rf_confidence': rf_prediction,
-                'anomalies': anomalies,
-                'combined_score': self._combine_predictions(
-                    rf_prediction, anomalies
-                )
-            }
+            all_anomalies = self.anomaly_detector.predict(X)
             
         except Exception as e:
             logger.error(f"Error in ML pattern detection: {str(e)}")
-            return None
+            return results
+            
+        # Split the predictions back into each prop's rows
+        bounds = np.cumsum([len(features) for _, features in ready])[:-1]
+        for (k, _), rf_prediction, anomalies in zip(
+            ready, np.split(rf_predictions, bounds), np.split(all_anomalies, bounds)
+        ):
+            try:
+                results[k] = {
+                    'rf_confidence': rf_prediction,
+                    'anomalies': anomalies,
+                    'combined_score': self._combine_predictions(
+                        rf_prediction, anomalies
+                    )
+                }
+            except Exception as e:
+                logger.error(f"Error in ML pattern detection: {str(e)}")
+                
+        return results
 
 class RealTimeAlerts:
     def __init__(self):
@@ -201,31 +272,59 @@ class RealTimeAlerts:
             'pattern': 0.75
         }
         self.alert_channels = ['email', 'telegram', 'app']
+        # Latest patterns, and (loop, event) with the event set whenever they
+        # change; an event only works in the loop it was created in
+        self._patterns = None
+        self._pattern_changed = None
+        
+    def _changed_event(self) -> asyncio.Event:
+        """Change event for the running loop, carrying over an unseen change"""
+        loop = asyncio.get_running_loop()
+        if self._pattern_changed is None or self._pattern_changed[0] is not loop:
+            pending = self._pattern_changed is not None and self._pattern_changed[1].is_set()
+            self._pattern_changed = (loop, asyncio.Event())
+            if pending:
+                self._pattern_changed[1].set()
+        return self._pattern_changed[1]
+        
+    def reset(self):
+        """Drop the change event, e.g. once its monitor has been stopped"""
+        self._pattern_changed = None
+        
+    def update_patterns(self, patterns: Dict):
+        """Publish new patterns to the monitor"""
+        self._patterns = patterns
+        self._changed_event().set()
+        
+    async def monitor_patterns(self, patterns: Optional[Dict] = None):
+        """Monitor patterns and send alerts whenever they change"""
+        if patterns is not None:
+            self.update_patterns(patterns)
+        changed = self._changed_event()
         
-    async def monitor_patterns(self, patterns: Dict):
-        """Monitor patterns and send alerts"""
         try:
             while True:
+                # Sleep until a producer publishes new patterns
+                await changed.wait()
+                changed.clear()
+                
                 # Check for significant patterns
-                alerts = self._check_alert_conditions(patterns)
+                alerts = self._check_alert_conditions(self._patterns)
                 
                 if alerts:
                     # Send alerts through all channels
                     await self._send_alerts(alerts)
                     
-                # Update patterns
-                patterns = await self._update_patterns(patterns)
-                
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
         except Exception as e:
             logger.error(f"Error in pattern monitoring: {str(e)}")
             
     async def _send_alerts(self, alerts: List[Dict]):
-        """Send alerts through configured channels"""
-        for alert in alerts:
-            for channel in self.alert_channels:
-                try:
-                    await self._send_alert_to_channel(alert, channel)
-                except Exception as e:
-                    logger.error(f"Error sending alert to {channel}: {str(e)}") 
\ No newline at end of file
+        """Send alerts through configured channels, all at once"""
+        sends = [(alert, channel) for alert in alerts for channel in self.alert_channels]
+        results = await asyncio.gather(
+            *(self._send_alert_to_channel(alert, channel) for alert, channel in sends),
+            return_exceptions=True
+        )
+        for (_, channel), result in zip(sends, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending alert to {channel}: {str(result)}") 
\ No newline at end of file
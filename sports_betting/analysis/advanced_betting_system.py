@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from loguru import logger
 import pandas as pd
 import numpy as np
@@ -6,7 +6,6 @@ from datetime import datetime
 import asyncio
 import aiohttp
 from dataclasses import dataclass
-from itertools import combinations
 
 @dataclass
 class OddsData:
@@ -15,35 +14,52 @@ class OddsData:
     line: float
     timestamp: datetime
     vig: float
+    side: str  # 'over' or 'under'
+
+@dataclass
+class OddsArray:
+    """Quotes for one prop as parallel arrays, one entry per quote"""
+    odds: np.ndarray  # American odds
+    side_over: np.ndarray  # True for over quotes, False for under
+    sportsbook: np.ndarray
+    
+    @classmethod
+    def from_odds(cls, odds: List[OddsData]) -> 'OddsArray':
+        """Convert a list of quotes into parallel arrays"""
+        return cls(
+            odds=np.array([quote.odds for quote in odds], dtype=float),
+            side_over=np.array([quote.side == 'over' for quote in odds], dtype=bool),
+            sportsbook=np.array([quote.sportsbook for quote in odds], dtype=object)
+        )
 
 class DraftKingsIntegration:
-    async def get_odds(self) -> List[Dict]:
+    async def get_odds(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Get odds from DraftKings"""
         # Implement real API integration here
         return []
 
 class FanduelIntegration:
-    async def get_odds(self) -> List[Dict]:
+    async def get_odds(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Get odds from FanDuel"""
         return []
 
 class PrizePicksIntegration:
-    async def get_odds(self) -> List[Dict]:
+    async def get_odds(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Get odds from PrizePicks"""
         return []
 
 class UnderdogIntegration:
-    async def get_odds(self) -> List[Dict]:
+    async def get_odds(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Get odds from Underdog"""
         return []
 
 class BetMGMIntegration:
-    async def get_odds(self) -> List[Dict]:
+    async def get_odds(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Get odds from BetMGM"""
         return []
 
 class CaesarsIntegration:
-    async def get_odds(self) -> List[Dict]:
+    async def get_odds(self, session: aiohttp.ClientSession) -> List[Dict]:
         """Get odds from Caesars"""
         return []
 
@@ -61,32 +77,49 @@ class AdvancedBettingSystem:
         self.odds_monitor = RealTimeOddsMonitor()
         self.arbitrage_finder = ArbitrageFinder()
         self.parlay_analyzer = ParlayAnalyzer()
+        self.session = None
+        
+    async def __aenter__(self):
+        self._get_session()
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.session:
+            await self.session.close()
+            
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Session shared by every sportsbook integration, created on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
         
     async def scan_all_opportunities(self) -> Dict:
         """Scan for all betting opportunities"""
-        async with aiohttp.ClientSession() as session:
-            # Parallel odds fetching
-            odds_tasks = [
-                book.get_odds() for book in self.sportsbooks.values()
-            ]
-            all_odds = await asyncio.gather(*odds_tasks)
-            
-            # Find opportunities
-            opportunities = {
-                'straight_bets': await self._find_straight_bet_opportunities(all_odds),
-                'arbitrage': await self.arbitrage_finder.find_opportunities(all_odds),
-                'parlays': await self.parlay_analyzer.find_opportunities(all_odds),
-                'best_lines': self._find_best_lines(all_odds)
-            }
-            
-            # Get bankroll recommendations
-            bet_sizes = self.bankroll_manager.get_bet_sizes(opportunities)
-            
-            return {
-                'opportunities': opportunities,
-                'bet_sizes': bet_sizes,
-                'timestamp': datetime.now()
-            }
+        session = self._get_session()
+        
+        # Parallel odds fetching over the shared connection pool
+        odds_tasks = [
+            book.get_odds(session) for book in self.sportsbooks.values()
+        ]
+        all_odds = await asyncio.gather(*odds_tasks)
+        
+        # Find opportunities
+        opportunities = {
+            'straight_bets': await self._find_straight_bet_opportunities(all_odds),
+            'arbitrage': await self.arbitrage_finder.find_opportunities(all_odds),
+            'parlays': await self.parlay_analyzer.find_opportunities(all_odds),
+            'best_lines': self._find_best_lines(all_odds)
+        }
+        
+        # Get bankroll recommendations
+        bet_sizes = self.bankroll_manager.get_bet_sizes(opportunities)
+        
+        return {
+            'opportunities': opportunities,
+            'bet_sizes': bet_sizes,
+            'timestamp': datetime.now()
+        }
 
 class BankrollManager:
     def __init__(self):
@@ -101,31 +134,59 @@ class BankrollManager:
         }
         
     def get_bet_sizes(self, opportunities: Dict) -> Dict:
-        """Calculate optimal bet sizes"""
-        recommendations = {}
+        """
+        Calculate optimal bet sizes for all opportunities in one pass
+        
+        Each bet gets the confidence-weighted Kelly fraction for its decimal
+        odds, capped at max_bet_size (max_parlay_risk for parlays). Each
+        opportunity type is then scaled down to max_prop_exposure, and all
+        bets together to the daily risk still available.
+        """
+        flat = [(opp_type, opp) for opp_type, opps in opportunities.items() for opp in opps]
+        if not flat:
+            return {}
         daily_risk = self._calculate_daily_risk()
         
-        for opp_type, opps in opportunities.items():
-            for opp in opps:
-                size = self._calculate_kelly_size(
-                    edge=opp['edge'],
-                    odds=opp['odds'],
-                    confidence=opp['confidence']
-                )
-                
-                # Apply risk limits
-                size = self._apply_risk_limits(
-                    size=size,
-                    opp_type=opp_type,
-                    daily_risk=daily_risk
-                )
-                
-                recommendations[opp['id']] = {
-                    'size': size,
-                    'amount': size * self.current_bankroll
-                }
-                
-        return recommendations
+        edges = np.array([opp['edge'] for _, opp in flat], dtype=float)
+        odds = np.array([opp['odds'] for _, opp in flat], dtype=float)
+        confidences = np.array([opp['confidence'] for _, opp in flat], dtype=float)
+        types, type_idx = np.unique([opp_type for opp_type, _ in flat], return_inverse=True)
+        
+        # Kelly sizes; odds of 1 or less pay nothing and get no stake
+        payout = odds - 1
+        sizes = np.divide(edges * confidences, payout, out=np.zeros_like(payout), where=payout > 0)
+        caps = np.where(types == 'parlays', self.risk_settings['max_parlay_risk'], self.risk_settings['max_bet_size'])
+        sizes = np.clip(sizes, 0, caps[type_idx])
+        
+        # Apply risk limits
+        exposure = np.bincount(type_idx, weights=sizes, minlength=len(types))
+        with np.errstate(divide='ignore'):
+            type_scale = np.minimum(1.0, self.risk_settings['max_prop_exposure'] / exposure)
+        sizes *= type_scale[type_idx]
+        available = max(0.0, self.risk_settings['max_daily_risk'] - daily_risk)
+        total = sizes.sum()
+        if total > available:
+            sizes *= available / total
+            
+        return {
+            opp['id']: {
+                'size': size,
+                'amount': size * self.current_bankroll
+            }
+            for (_, opp), size in zip(flat, sizes.tolist())
+        }
+        
+    def _calculate_daily_risk(self) -> float:
+        """Fraction of the bankroll already staked today
+        
+        Bets in bet_history are dicts with a 'timestamp' and their 'size' as
+        a fraction of the bankroll; bets without a timestamp are skipped.
+        """
+        today = datetime.now().date()
+        return float(sum(
+            bet.get('size', 0.0) for bet in self.bet_history
+            if bet.get('timestamp') is not None and bet['timestamp'].date() == today
+        ))
 
 class RealTimeOddsMonitor:
     def __init__(self):
@@ -171,14 +232,17 @@ class ArbitrageFinder:
                 
         return opportunities
         
-    def _calculate_arbitrage(self, odds: List[OddsData]) -> Dict:
+    def _calculate_arbitrage(self, odds: Union[List[OddsData], OddsArray]) -> Dict:
         """Calculate arbitrage opportunity"""
-        best_over = max(odds, key=lambda x: x.odds if x.side == 'over' else -float('inf'))
-        best_under = max(odds, key=lambda x: x.odds if x.side == 'under' else -float('inf'))
+        if not isinstance(odds, OddsArray):
+            odds = OddsArray.from_odds(odds)
+            
+        # Best quote on each side
+        over = int(np.argmax(np.where(odds.side_over, odds.odds, -np.inf)))
+        under = int(np.argmax(np.where(odds.side_over, -np.inf, odds.odds)))
         
         # Calculate arbitrage
-        over_decimal = self._american_to_decimal(best_over.odds)
-        under_decimal = self._american_to_decimal(best_under.odds)
+        over_decimal, under_decimal = self._american_to_decimal(odds.odds[[over, under]]).tolist()
         
         total_pct = (1 / over_decimal) + (1 / under_decimal)
         
@@ -190,17 +254,22 @@ class ArbitrageFinder:
             return {
                 'profit_pct': profit_pct,
                 'over': {
-                    'sportsbook': best_over.sportsbook,
-                    'odds': best_over.odds,
+                    'sportsbook': odds.sportsbook[over],
+                    'odds': float(odds.odds[over]),
                     'amount': over_amount
                 },
                 'under': {
-                    'sportsbook': best_under.sportsbook,
-                    'odds': best_under.odds,
+                    'sportsbook': odds.sportsbook[under],
+                    'odds': float(odds.odds[under]),
                     'amount': under_amount
                 }
             }
         return None
+        
+    def _american_to_decimal(self, odds: np.ndarray) -> np.ndarray:
+        """Convert American odds to decimal odds, elementwise"""
+        odds = np.asarray(odds, dtype=float)
+        return np.where(odds > 0, odds / 100 + 1, 100 / np.abs(odds) + 1)
 
 class ParlayAnalyzer:
     def __init__(self):
@@ -227,13 +296,25 @@ class ParlayAnalyzer:
         return opportunities
         
     def _find_correlated_props(self, props: List[Dict]) -> List[List[Dict]]:
-        """Find sets of correlated props"""
-        correlated_sets = []
+        """Find sets of props whose every pair of legs is correlated"""
+        if len(props) < 2:
+            return []
+            
+        # Pairwise correlations of the props' histories, computed once
+        history = np.array([prop['history'] for prop in props], dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlated = np.corrcoef(history) > self.min_leg_correlation
         
-        for i in range(2, self.max_legs + 1):
-            for prop_combo in combinations(props, i):
-                correlation = self._calculate_correlation(prop_combo)
-                if correlation > self.min_leg_correlation:
-                    correlated_sets.append(list(prop_combo))
-                    
+        # Grow sets one leg at a time, only with props correlated to every
+        # leg so far, so uncorrelated combinations are never enumerated
+        correlated_sets = []
+        combos = [(i,) for i in range(len(props))]
+        for _ in range(2, self.max_legs + 1):
+            combos = [
+                combo + (j,)
+                for combo in combos
+                for j in combo[-1] + 1 + np.flatnonzero(correlated[list(combo), combo[-1] + 1:].all(axis=0))
+            ]
+            correlated_sets.extend([props[i] for i in combo] for combo in combos)
+            
         return correlated_sets 
\ No newline at end of file
@@ -2,11 +2,10 @@ from sports_betting.analysis.advanced_betting_system import AdvancedBettingSyste
 import asyncio
 
 async def main():
-    # Initialize system
-    betting_system = AdvancedBettingSystem()
-
-    # Scan for opportunities
-    opportunities = await betting_system.scan_all_opportunities()
+    # Initialize system; its sportsbook session closes on exit
+    async with AdvancedBettingSystem() as betting_system:
+        # Scan for opportunities
+        opportunities = await betting_system.scan_all_opportunities()
 
     # Print results
     print("\nStraight Bet Opportunities:")
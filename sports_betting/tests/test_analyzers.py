@@ -0,0 +1,198 @@
+import itertools
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from sports_betting.analysis import advanced_analytics
+from sports_betting.analysis.advanced_betting_system import BankrollManager, ParlayAnalyzer
+
+def _brute_force_sets(analyzer, props):
+    """Every combination of 2 to max_legs props whose pairs are all correlated"""
+    history = np.array([prop['history'] for prop in props], dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.corrcoef(history)
+    
+    sets = []
+    for size in range(2, analyzer.max_legs + 1):
+        for combo in itertools.combinations(range(len(props)), size):
+            if all(corr[i, j] > analyzer.min_leg_correlation
+                   for i, j in itertools.combinations(combo, 2)):
+                sets.append([props[i] for i in combo])
+    return sets
+
+@pytest.mark.parametrize('seed', range(5))
+def test_find_correlated_props_matches_brute_force(seed):
+    """Test that pruned leg sets match enumerating every combination"""
+    rng = np.random.default_rng(seed)
+    # A shared factor makes some props correlate, the noise keeps others apart
+    factor = rng.normal(size=20)
+    props = [
+        {'id': i, 'history': (rng.uniform(-1, 1) * factor + rng.normal(size=20)).tolist()}
+        for i in range(8)
+    ]
+    # A constant history has no defined correlation and joins no set
+    props.append({'id': 8, 'history': [1.0] * 20})
+    
+    analyzer = ParlayAnalyzer()
+    result = analyzer._find_correlated_props(props)
+    expected = _brute_force_sets(analyzer, props)
+    
+    assert expected
+    assert [[p['id'] for p in s] for s in result] == [[p['id'] for p in s] for s in expected]
+
+def test_find_correlated_props_too_few():
+    """Test that fewer than two props give no sets"""
+    analyzer = ParlayAnalyzer()
+    assert analyzer._find_correlated_props([]) == []
+    assert analyzer._find_correlated_props([{'history': [1.0, 2.0, 3.0]}]) == []
+
+def _bet(bet_id, edge, odds, confidence=1.0):
+    """A bet opportunity for the bankroll manager"""
+    return {'id': bet_id, 'edge': edge, 'odds': odds, 'confidence': confidence}
+
+def test_bet_sizes_kelly_and_caps():
+    """Test Kelly sizing with the per-bet and parlay caps"""
+    manager = BankrollManager()
+    manager.current_bankroll = 1000
+    sizes = manager.get_bet_sizes({
+        'straight_bets': [_bet(1, 0.05, 2.0, 0.8), _bet(2, 0.5, 2.0), _bet(3, 0.1, 1.0)],
+        'parlays': [_bet(4, 0.3, 4.0)],
+    })
+    
+    # 0.05 * 0.8 / (2.0 - 1) is under the 5% cap
+    assert sizes[1]['size'] == pytest.approx(0.04)
+    assert sizes[1]['amount'] == pytest.approx(40.0)
+    assert sizes[2]['size'] == pytest.approx(0.05)
+    # Odds of 1 pay nothing
+    assert sizes[3]['size'] == 0.0
+    assert sizes[4]['size'] == pytest.approx(0.02)
+
+def test_bet_sizes_type_exposure():
+    """Test that each opportunity type is scaled to max_prop_exposure"""
+    manager = BankrollManager()
+    sizes = manager.get_bet_sizes({
+        'straight_bets': [_bet(i, 0.5, 2.0) for i in range(4)],
+        'best_lines': [_bet(10, 0.03, 2.0)],
+    })
+    
+    # Four capped 5% bets are 20% of the bankroll, scaled down to 15%
+    assert [sizes[i]['size'] for i in range(4)] == pytest.approx([0.0375] * 4)
+    assert sizes[10]['size'] == pytest.approx(0.03)
+
+def test_bet_sizes_daily_risk():
+    """Test that bets placed today shrink the risk still available"""
+    manager = BankrollManager()
+    now = datetime.now()
+    manager.bet_history = [
+        {'id': 'a', 'size': 0.05, 'timestamp': now},
+        {'id': 'b', 'size': 0.05, 'timestamp': now},
+        {'id': 'c', 'size': 0.10, 'timestamp': now - timedelta(days=1)},
+    ]
+    assert manager._calculate_daily_risk() == pytest.approx(0.10)
+    
+    sizes = manager.get_bet_sizes({
+        'straight_bets': [_bet(1, 0.5, 2.0), _bet(2, 0.5, 2.0)],
+        'best_lines': [_bet(3, 0.5, 2.0), _bet(4, 0.5, 2.0)],
+    })
+    
+    # 20% of new bets fit in the 10% left today
+    assert [sizes[i]['size'] for i in range(1, 5)] == pytest.approx([0.025] * 4)
+    
+    manager.bet_history.append({'id': 'd', 'size': 0.10, 'timestamp': now})
+    sizes = manager.get_bet_sizes({'straight_bets': [_bet(1, 0.5, 2.0)]})
+    assert sizes[1]['size'] == 0.0
+    assert BankrollManager().get_bet_sizes({}) == {}
+
+class _StubSportsAPI:
+    """SportsDataAPI with fixed NHL stats and no network calls"""
+    STATS = {
+        'Bruins': (0.70, 3.6, 2.4), 'Rangers': (0.55, 3.1, 2.9),
+        'Kings': (0.45, 2.8, 3.1), 'Sharks': (0.30, 2.4, 3.6),
+    }
+    
+    def get_nhl_team_stats(self, team):
+        win_rate, goals_for, goals_against = self.STATS[team]
+        return {'win_rate': win_rate, 'goals_per_game': goals_for, 'goals_against': goals_against,
+                'power_play_pct': 20.0, 'penalty_kill_pct': 80.0}
+    
+    def get_head_to_head(self, team1, team2, sport):
+        return {'streak': len(team1) - len(team2)}
+    
+    def get_recent_games(self, team, sport, limit=10):
+        return []
+
+class _StubMLFeatures:
+    """AdvancedMLFeatures without the model dependencies"""
+    def calculate_elo_rating(self, team, historical_games):
+        return 1500 + 10 * sum(game['team'] == team for game in historical_games)
+    
+    def calculate_momentum_score(self, recent_games):
+        return 0.0
+    
+    def calculate_style_matchup(self, team1_stats, team2_stats):
+        return 0.0
+
+def _stub_analytics(monkeypatch):
+    """AdvancedAnalytics on stubbed data sources, with a fitted forest"""
+    monkeypatch.setattr(advanced_analytics, 'SportsDataAPI', _StubSportsAPI)
+    monkeypatch.setattr(advanced_analytics, 'AdvancedMLFeatures', _StubMLFeatures)
+    monkeypatch.setattr(advanced_analytics, 'WeatherAnalysis', object)
+    analytics = advanced_analytics.AdvancedAnalytics(n_estimators=10, max_depth=4, min_samples_leaf=1)
+    
+    # Feature helpers the tree doesn't implement yet
+    monkeypatch.setattr(analytics, 'calculate_h2h_advantage', lambda h2h: h2h['streak'] / 10, raising=False)
+    monkeypatch.setattr(analytics, 'calculate_recent_form', lambda home, away: len(home) / 10, raising=False)
+    monkeypatch.setattr(analytics, 'calculate_injury_impact', lambda home, away: 0.0, raising=False)
+    monkeypatch.setattr(analytics, 'get_recent_games', lambda team: [], raising=False)
+    monkeypatch.setattr(analytics, 'calculate_value_rating', lambda value, win_prob: value * win_prob, raising=False)
+    
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.uniform(0.2, 0.8, 200), rng.uniform(0.2, 0.8, 200),
+        rng.uniform(2, 4, 200), rng.uniform(2, 4, 200),
+        rng.uniform(60, 80, 200), rng.uniform(60, 80, 200),
+        np.full(200, 2), np.full(200, 2), rng.uniform(-0.3, 0.3, 200)
+    ])
+    analytics.model.fit(X, X[:, 0] - X[:, 1] + X[:, 8] > 0)
+    return analytics
+
+def test_analyze_games_matches_single(monkeypatch):
+    """Test that a slate scores each game like analyzing it alone"""
+    analytics = _stub_analytics(monkeypatch)
+    games = [
+        {'home_team': 'Bruins', 'away_team': 'Sharks', 'sport': 'NHL', 'odds': -150},
+        {'home_team': 'Kings', 'away_team': 'Rangers', 'sport': 'NHL', 'odds': 130},
+        {'home_team': 'Sharks', 'away_team': 'Bruins', 'sport': 'NHL', 'odds': 240},
+        {'home_team': 'Rangers', 'away_team': 'Kings', 'sport': 'NHL'},
+    ]
+    picks = [{'team': 'Bruins'}, {'team': 'Bruins'}, {'team': 'Kings'}]
+    
+    results = analytics.analyze_games(games, picks)
+    
+    # The game without odds fails on its own
+    assert results[3] is None
+    for game, result in zip(games[:3], results):
+        assert result is not None
+        features = result['analysis']['key_metrics']
+        h2h_stats = result['analysis']['h2h_history']
+        assert features['elo_rating_diff'] == (
+            _StubMLFeatures().calculate_elo_rating(game['home_team'], picks)
+            - _StubMLFeatures().calculate_elo_rating(game['away_team'], picks)
+        )
+        
+        # The forest sees the float32 feature row
+        row = np.array([[features[f] for f in analytics.features]], dtype=np.float32)
+        win_prob = round(analytics.model.predict_proba(row)[0, 1] * 100, 2)
+        value = analytics.calculate_betting_value(win_prob, game['odds'])
+        assert result['win_probability'] == pytest.approx(win_prob)
+        assert result['betting_value'] == pytest.approx(value)
+        assert result['confidence'] == analytics.calculate_enhanced_confidence(win_prob, value, features, h2h_stats)
+        assert result['recommended_bet'] == analytics.get_recommended_bet(result['confidence'], value)
+        
+        single = analytics.analyze_game(game, picks)
+        assert single['win_probability'] == pytest.approx(result['win_probability'])
+        assert single['betting_value'] == pytest.approx(result['betting_value'])
+        assert single['confidence'] == result['confidence']
+    
+    # Probabilities come from the fitted forest, not the 50% fallback
+    assert len({result['win_probability'] for result in results[:3]}) > 1
+    assert analytics._X_buf.dtype == np.float32
@@ -144,5 +144,84 @@ def main():
             print(f"{prob:>10.3f}", end="")
         print()
 
+def _regression_games():
+    """Fixed five-team schedule shared by the regression tests."""
+    teams = ["Ants", "Bees", "Cats", "Dogs", "Eels"]
+    scores = [
+        (0, 1, 24, 17, True), (2, 3, 10, 13, False), (4, 0, 31, 28, True),
+        (1, 2, 20, 20, True), (3, 4, 14, 35, True), (0, 2, 27, 3, False),
+        (1, 3, 17, 21, True), (2, 4, 24, 23, True), (3, 0, 9, 16, False),
+        (4, 1, 13, 10, True), (0, 1, 21, 24, True), (2, 3, 30, 7, True),
+        (4, 2, 17, 20, False), (1, 0, 28, 14, True)
+    ]
+    base_date = datetime(2024, 1, 1)
+    return [
+        GameResult(teams[a], teams[b], score_a, score_b,
+                   (base_date + timedelta(days=3 * k)).timestamp(), is_home_a)
+        for k, (a, b, score_a, score_b, is_home_a) in enumerate(scores)
+    ]
+
+REGRESSION_RATINGS = {"Ants": 1.32, "Bees": 0.92, "Cats": 0.86, "Dogs": 1.10, "Eels": 1.05}
+
+def test_analyzer_regression():
+    """Analyses match values from the original (pre-GameArray) implementation."""
+    analyzer = RatingAnalyzer(MasseyFormulas())
+    games = _regression_games()
+    now = datetime(2024, 3, 1).timestamp()
+    
+    expected_teams = {
+        "Ants": dict(rating=1.32, power=0.7441251914081594, offense=21.666666666666668,
+                     defense=-18.666666666666668, schedule_strength=0.9616666666666668,
+                     expected_wins=3.0060650305084486, win_probability=0.5007616554750838,
+                     variance=139.0, trend=-0.5758748085918407,
+                     confidence_interval=(-8.113825664419853, 10.753825664419853)),
+        "Cats": dict(rating=0.86, power=4.016691043510876, offense=17.833333333333332,
+                     defense=-17.833333333333332, schedule_strength=1.09,
+                     expected_wins=2.9961070951391866, win_probability=0.4994640200568703,
+                     variance=187.33333333333334, trend=3.1566910435108757,
+                     confidence_interval=(-10.091862347970272, 11.811862347970271))
+    }
+    for team, expected in expected_teams.items():
+        analysis = analyzer.analyze_team(team, REGRESSION_RATINGS, games, now)
+        for field, value in expected.items():
+            assert np.allclose(getattr(analysis, field), value, rtol=1e-9, atol=1e-12), (team, field)
+    
+    matchup = analyzer.analyze_matchup("Ants", "Bees", REGRESSION_RATINGS, games)
+    assert np.isclose(matchup.win_probability, 0.5011283776625918, rtol=1e-9)
+    assert np.isclose(matchup.expected_margin, 1.4, rtol=1e-9)
+    assert np.isclose(matchup.upset_probability, 0.4833333333333333, rtol=1e-9)
+    assert np.isclose(matchup.confidence, 0.00084, rtol=1e-9)
+    assert matchup.key_factors == ["Significant advantage for Ants offense"]
+    assert [(r["winner"], r["margin"]) for r in matchup.historical_results] == [
+        ("Ants", 7), ("Bees", 3), ("Bees", 14)]
+    
+    factors = analyzer.get_decision_factors("Ants", "Cats", REGRESSION_RATINGS, games)
+    assert np.isclose(factors["prediction"]["win_probability"], 0.5012976337539986, rtol=1e-9)
+    assert np.isclose(factors["prediction"]["expected_margin"], 1.61, rtol=1e-9)
+    assert np.isclose(factors["prediction"]["confidence"], 0.000322, rtol=1e-9)
+    assert factors["advantages"] == ["Ants offense vs Cats defense"]
+    assert factors["risks"] == ["High variance in Ants performance"]
+    assert factors["key_factors"] == ["Significant advantage for Ants offense"]
+
+def test_game_array_tracks_games_list():
+    """The cached GameArray must follow new games and invalidations."""
+    analyzer = RatingAnalyzer(MasseyFormulas())
+    ts = datetime(2024, 1, 1).timestamp()
+    games = [GameResult("A", "B", 3, 1, ts, True), GameResult("B", "C", 2, 2, ts + 1, True)]
+    
+    assert analyzer._get_game_array(games) is analyzer._get_game_array(games)
+    
+    games.append(GameResult("C", "D", 5, 0, ts + 2, True))
+    assert "D" in analyzer._get_game_array(games).team_to_idx
+    
+    # In-place edits are only picked up after an invalidation
+    games[0].score_a = 7
+    assert analyzer._get_game_array(games).score_a[0] == 3
+    analyzer.invalidate_games()
+    assert analyzer._get_game_array(games).score_a[0] == 7
+    
+    other = [GameResult("E", "F", 1, 0, ts, True), GameResult("F", "G", 0, 1, ts, True)]
+    assert analyzer._get_game_array(other).teams == ["E", "F", "G"]
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
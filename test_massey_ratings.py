@@ -109,5 +109,102 @@ def test_massey_rankings_format():
     assert all(col in rankings.columns for col in ['team', 'rating', 'games_played'])
     assert all(rankings['games_played'] >= 2)
 
+def test_massey_games_batch():
+    """Test that a batch of games matches adding them one at a time."""
+    # TeamD plays once, so it stays inactive and the team order matters
+    teams = ['TeamA', 'TeamB', 'TeamC', 'TeamD']
+    games = [('TeamC', 'TeamB', 100, 90, 1.0), ('TeamB', 'TeamA', 95, 85, 2.0),
+             ('TeamA', 'TeamC', 80, 70, 1.0), ('TeamC', 'TeamB', 99, 101, 1.0),
+             ('TeamA', 'TeamB', 88, 84, 1.0), ('TeamC', 'TeamA', 90, 80, 1.0),
+             ('TeamD', 'TeamA', 70, 75, 1.0)]
+    
+    single = MasseyRatings(teams, min_games=2)
+    for game in games:
+        single.add_game(*game)
+    
+    batch = MasseyRatings(teams, min_games=2)
+    batch.add_games_batch([batch.teams[g[0]] for g in games],
+                          [batch.teams[g[1]] for g in games],
+                          [g[2] - g[3] for g in games],
+                          [g[4] for g in games])
+    
+    assert list(batch.games_played.items()) == list(single.games_played.items())
+    expected = single.calculate_ratings()
+    ratings = batch.calculate_ratings()
+    assert ratings.keys() == expected.keys()
+    assert all(abs(ratings[team] - expected[team]) < 1e-10 for team in expected)
+
+def test_massey_games_after_factorization():
+    """Test that games added after a calculation match rating from scratch."""
+    teams = ['TeamA', 'TeamB', 'TeamC', 'TeamD']
+    first = [('TeamA', 'TeamB', 100, 90), ('TeamB', 'TeamC', 95, 85),
+             ('TeamC', 'TeamA', 80, 78), ('TeamD', 'TeamA', 70, 75)]
+    later = [('TeamB', 'TeamA', 99, 92), ('TeamC', 'TeamB', 88, 90),
+             ('TeamA', 'TeamC', 101, 94), ('TeamD', 'TeamB', 81, 79)]
+    
+    massey = MasseyRatings(teams, min_games=2)
+    for game in first:
+        massey.add_game(*game)
+    massey.calculate_ratings()
+    
+    # Games among the rated teams are applied to the cached factorization
+    massey.add_game(*later[0])
+    massey.add_games_batch([massey.teams[g[0]] for g in later[1:3]],
+                           [massey.teams[g[1]] for g in later[1:3]],
+                           [g[2] - g[3] for g in later[1:3]])
+    ratings = massey.calculate_ratings()
+    assert massey._update_w.size == 3
+    
+    expected = MasseyRatings(teams, min_games=2)
+    for game in first + later[:3]:
+        expected.add_game(*game)
+    expected = expected.calculate_ratings()
+    assert ratings.keys() == expected.keys()
+    assert all(abs(ratings[team] - expected[team]) < 1e-10 for team in expected)
+    
+    # TeamD's second game makes it active, which refactorizes the system
+    massey.add_game(*later[3])
+    ratings = massey.calculate_ratings()
+    
+    expected = MasseyRatings(teams, min_games=2)
+    for game in first + later:
+        expected.add_game(*game)
+    expected = expected.calculate_ratings()
+    assert ratings.keys() == expected.keys()
+    assert all(abs(ratings[team] - expected[team]) < 1e-10 for team in expected)
+
+def test_massey_predict_games():
+    """Test that slate predictions match single-game predictions."""
+    teams = ['Warriors', 'Lakers', 'Celtics', 'Nets']
+    massey = MasseyRatings(teams, min_games=2)
+    massey.add_game('Warriors', 'Lakers', 120, 100)
+    massey.add_game('Warriors', 'Celtics', 115, 100)
+    massey.add_game('Lakers', 'Celtics', 105, 100)
+    
+    pairs = [('Warriors', 'Lakers'), ('Celtics', 'Warriors'), ('Nets', 'Lakers')]
+    win_probs, point_diffs = massey.predict_games(pairs)
+    
+    for (team1, team2), win_prob, point_diff in zip(pairs, win_probs, point_diffs):
+        expected_prob, expected_diff = massey.predict_game(team1, team2)
+        assert abs(win_prob - expected_prob) < 1e-12
+        assert abs(point_diff - expected_diff) < 1e-12
+
+def test_massey_save_load(tmp_path):
+    """Test that a saved system loads with the same games and ratings."""
+    teams = ['TeamA', 'TeamB', 'TeamC']
+    massey = MasseyRatings(teams, min_games=1)
+    massey.add_game('TeamA', 'TeamB', 100, 90)
+    massey.add_game('TeamB', 'TeamC', 95, 85)
+    massey.save(str(tmp_path))
+    
+    loaded = MasseyRatings.load(str(tmp_path), min_games=1)
+    assert loaded.games_played == massey.games_played
+    assert loaded.calculate_ratings() == pytest.approx(massey.calculate_ratings())
+    
+    # Games added after loading do not change the saved state
+    loaded.add_game('TeamC', 'TeamA', 80, 70)
+    loaded.calculate_ratings()
+    assert MasseyRatings.load(str(tmp_path), min_games=1).games_played == massey.games_played
+
 if __name__ == '__main__':
     pytest.main(['-v', 'test_massey_ratings.py']) 
\ No newline at end of file
@@ -1,7 +1,10 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from massey_ratings_base import Game
 from elos_ratings import ElosRatings
+from rating_statistics import RatingStatistics
+from massey_formulas import GameResult
+from sauceda_ratings import SaucedaRatings
 
 class TestRatingMethods(unittest.TestCase):
     def setUp(self):
@@ -201,5 +204,154 @@ class TestRatingMethods(unittest.TestCase):
         spread = self.elos.predict_spread("Likelihood Loggers", "Linear Aggressors")
         self.assertAlmostEqual(abs(spread), 0, places=1)
     
+class TestRatingStatistics(unittest.TestCase):
+    def setUp(self):
+        """Setup a five-team league with a fixed schedule."""
+        self.teams = ["Ants", "Bees", "Cats", "Dogs", "Eels"]
+        self.elos = ElosRatings(self.teams)
+        
+        # (team_a, team_b, score_a, score_b, is_home_a) by team index
+        games = [
+            (0, 1, 24, 17, True), (2, 3, 10, 13, False), (4, 0, 31, 28, True),
+            (1, 2, 20, 20, True), (3, 4, 14, 35, True), (0, 2, 27, 3, False),
+            (1, 3, 17, 21, True), (2, 4, 24, 23, True), (3, 0, 9, 16, False),
+            (4, 1, 13, 10, True), (0, 1, 21, 24, True), (2, 3, 30, 7, True),
+            (4, 2, 17, 20, False), (1, 0, 28, 14, True)
+        ]
+        base_date = datetime(2024, 1, 1)
+        for k, (a, b, score_a, score_b, is_home_a) in enumerate(games):
+            self.elos.add_game(Game(
+                team_a=self.teams[a],
+                team_b=self.teams[b],
+                score_a=score_a,
+                score_b=score_b,
+                is_home_a=is_home_a,
+                date=base_date + timedelta(days=3 * k)
+            ))
+        self.stats = RatingStatistics(self.elos)
+    
+    def test_complete_team_stats_regression(self):
+        """Test the complete team stats against values from the original implementation."""
+        fields = ["rating", "power", "offense", "defense", "home_advantage",
+                  "schedule_strength", "expected_wins", "expected_losses",
+                  "std_dev", "parity_index"]
+        expected = {
+            "Ants": (5000, 4496.687507, 24.59305459, -16.27209309, 50, 1524.622899,
+                     2.823297489, 3.176702511, 1226.697956, 0.4987412415),
+            "Bees": (3333.333333, 3292.125143, 13.2320619, 4.689858586, 50, 2126.904081,
+                     2.813633819, 3.186366181, 1455.656728, 0.5612605196),
+            "Cats": (370.3703704, -490.0108005, 7.609656515, 3.668132779, 50, 1201.926363,
+                     3.640104784, 2.359895216, 1664.625553, 0.4626655501),
+            "Dogs": (3518.518519, 2567.174074, -19.04436193, -2.318613622, 50, 790.597948,
+                     2.271734483, 2.728265517, 1478.932025, 0.5159840084),
+            "Eels": (-4722.222222, -2955.801309, 13.84046561, -29.99816135, 50, 1895.193025,
+                     2.451229424, 2.548770576, 823.9455005, 0.3230120687)
+        }
+        
+        stats = self.stats.get_complete_team_stats()
+        self.assertEqual(set(stats), set(self.teams))
+        for team, values in expected.items():
+            for field, value in zip(fields, values):
+                actual = getattr(stats[team], field)
+                self.assertAlmostEqual(actual, value, delta=1e-8 * max(1.0, abs(value)),
+                                       msg=f"{team} {field}")
+    
+    def test_games_cache_tracks_changes(self):
+        """Test that the cached game arrays follow added games and invalidations."""
+        score_a = self.stats._games_soa()[2]
+        self.assertIs(self.stats._games_soa()[2], score_a)
+        
+        game = self.elos.games[0]
+        self.elos.add_game(Game(team_a=game.team_b, team_b=game.team_a,
+                                score_a=game.score_b, score_b=game.score_a,
+                                is_home_a=not game.is_home_a, date=game.date))
+        a_idx, b_idx, score_a = self.stats._games_soa()[:3]
+        self.assertEqual((a_idx[-1], b_idx[-1], score_a[-1]), (1, 0, 17))
+        
+        # In-place edits are only picked up after an invalidation
+        self.elos.games[1].score_a = 40
+        self.assertNotEqual(self.stats._games_soa()[2][1], 40)
+        self.stats.invalidate_games()
+        self.assertEqual(self.stats._games_soa()[2][1], 40)
+    
+class TestSaucedaRatings(unittest.TestCase):
+    def setUp(self):
+        """Setup the same five-team schedule as Sauceda game results."""
+        self.teams = ["Ants", "Bees", "Cats", "Dogs", "Eels"]
+        games = [
+            (0, 1, 24, 17, True), (2, 3, 10, 13, False), (4, 0, 31, 28, True),
+            (1, 2, 20, 20, True), (3, 4, 14, 35, True), (0, 2, 27, 3, False),
+            (1, 3, 17, 21, True), (2, 4, 24, 23, True), (3, 0, 9, 16, False),
+            (4, 1, 13, 10, True), (0, 1, 21, 24, True), (2, 3, 30, 7, True),
+            (4, 2, 17, 20, False), (1, 0, 28, 14, True)
+        ]
+        base_date = datetime(2024, 1, 1)
+        self.games = [
+            GameResult(self.teams[a], self.teams[b], score_a, score_b,
+                       (base_date + timedelta(days=3 * k)).timestamp(), is_home_a)
+            for k, (a, b, score_a, score_b, is_home_a) in enumerate(games)
+        ]
+    
+    def test_ratings_regression(self):
+        """Test ratings and predictions against values from the original implementation."""
+        sauceda = SaucedaRatings()
+        for game in self.games:
+            new_a, new_b = sauceda.update_ratings(game)
+            self.assertEqual((new_a, new_b),
+                             (sauceda.ratings[game.team_a], sauceda.ratings[game.team_b]))
+        
+        expected = {
+            "Ants": 846.6232904,
+            "Bees": 1181.310637,
+            "Cats": 1218.900029,
+            "Dogs": 756.7651039,
+            "Eels": 996.4009391
+        }
+        self.assertEqual(set(sauceda.ratings), set(expected))
+        for team, rating in expected.items():
+            self.assertAlmostEqual(sauceda.ratings[team], rating, places=5)
+        
+        prediction = sauceda.predict_game("Ants", "Bees", True)
+        self.assertAlmostEqual(prediction.win_probability, 0.03434504968040029, places=10)
+        self.assertAlmostEqual(prediction.loser_points, 0.9656549503195997, places=10)
+        
+        distribution = sauceda.analyze_rating_distribution()
+        self.assertEqual(distribution, {
+            "ELITE": ["Cats"],
+            "STRONG": ["Bees"],
+            "AVERAGE": [],
+            "WEAK": ["Eels"],
+            "POOR": ["Ants", "Dogs"]
+        })
+        self.assertEqual([sauceda.get_rating_tier(r) for r in (500, 900, 1000, 1100, 1200, 1500)],
+                         ["POOR", "WEAK", "AVERAGE", "STRONG", "ELITE", "ELITE"])
+    
+    def test_bulk_update_matches_single(self):
+        """Test that a bulk update matches updating one game at a time."""
+        single = SaucedaRatings()
+        for game in self.games:
+            single.update_ratings(game)
+        
+        bulk = SaucedaRatings()
+        ratings = bulk.update_ratings_bulk(self.games)
+        self.assertEqual(set(ratings), set(single.ratings))
+        for team, rating in single.ratings.items():
+            self.assertAlmostEqual(ratings[team], rating, places=9)
+    
+    def test_ratings_read_only(self):
+        """Test that ratings are seeded through the setter, not item writes."""
+        sauceda = SaucedaRatings()
+        sauceda.ratings = {"Ants": 1600.0, "Bees": 1400.0}
+        with self.assertRaises(TypeError):
+            sauceda.ratings["Ants"] = 1000.0
+        
+        self.assertEqual(sauceda.snapshot(), {"Ants": 1600.0, "Bees": 1400.0})
+        prediction = sauceda.predict_game("Ants", "Bees", True)
+        self.assertGreater(prediction.win_probability, 0.5)
+        
+        sauceda.update_ratings(self.games[0])
+        self.assertNotEqual(sauceda.ratings["Ants"], 1600.0)
+        self.assertEqual(sauceda.snapshot()["Ants"], sauceda.ratings["Ants"])
+    
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+import sport_analytics
+from sport_analytics import NBAAnalytics, UFCAnalytics
+
+def _fight(fighter_a, fighter_b, **history):
+    """A fight between two fighters with the given history rows."""
+    return dict(fighter_a=fighter_a, fighter_b=fighter_b, **history)
+
+def test_ufc_batch_matches_single():
+    """Test that a batch of fights scores like analyzing each one alone."""
+    strikes = [{"fighter": "Ali", "landed": 40, "attempted": 90},
+               {"fighter": "Bo", "landed": 25, "attempted": 40},
+               {"fighter": "Cy", "landed": 10, "attempted": 30}]
+    injuries = [{"fighter": "Bo", "injured": 1}, {"fighter": "Bo", "injured": 0},
+                {"fighter": "Ali", "injured": 0}]
+    weights = [{"fighter": "Ali", "missed_weight": 1}, {"fighter": "Cy", "missed_weight": 0}]
+    fights = [
+        _fight("Ali", "Bo", strike_history=strikes, injury_history=injuries),
+        _fight("Bo", "Cy", strike_history=strikes, weight_history=weights),
+        {},
+        _fight("Cy", "Ali", weight_history=weights, injury_history=injuries),
+    ]
+    
+    model = UFCAnalytics(cache=False)
+    batch = model.analyze_batch(fights)
+    
+    assert len(batch) == len(fights)
+    for fight, result in zip(fights, batch):
+        single = model.analyze(fight)
+        assert result["edge"] == pytest.approx(single.edge)
+        assert result["confidence"] == pytest.approx(single.confidence)
+    
+    # Ali lands 44% against Bo's 62.5%, and Bo was hurt in one of two bouts
+    single = model.analyze(fights[0])
+    assert single.key_metrics["striking_accuracy"] == pytest.approx(40 / 90 - 25 / 40)
+    assert single.hidden_factors["injury_history"] == pytest.approx(0.5)
+
+def test_nba_batch_matches_single(monkeypatch):
+    """Test that venue lookups agree between analyze and analyze_batch."""
+    features = np.zeros(3, dtype=sport_analytics.VENUE_DTYPE)
+    features["shooting_effect"][:2] = [0.4, -0.2]
+    monkeypatch.setattr(sport_analytics, "VENUE_INDEX", {"Garden": 0, "Arena": 1})
+    monkeypatch.setattr(sport_analytics, "VENUE_FEATURES", features)
+    
+    games = [{"venue": "Garden"}, {"venue": "Arena"}, {"venue": "Unknown"}, {}]
+    model = NBAAnalytics(cache=False)
+    batch = model.analyze_batch(games)
+    
+    expected = [0.4, -0.2, 0.0, 0.0]
+    for game, result, effect in zip(games, batch, expected):
+        single = model.analyze(game)
+        assert single.key_metrics["arena_shooting_effect"] == pytest.approx(effect)
+        assert result["edge"] == pytest.approx(single.edge)
+        assert result["confidence"] == pytest.approx(single.confidence)